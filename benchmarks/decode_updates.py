@@ -0,0 +1,58 @@
+"""
+Benchmark of getUpdates decoding.
+
+Compares the previous decode path (string replace of the `from` key, json.loads and
+keyword construction of the pydantic dataclasses) against pedro.utils.update_decoder
+on the recorded update batches in benchmarks/fixtures.
+
+Usage:
+    python -m benchmarks.decode_updates [--number N]
+"""
+
+# Internal
+import argparse
+import glob
+import json
+import os
+import timeit
+
+# Project
+from pedro.data_structures.telegram_message import MessagesResults
+from pedro.utils.update_decoder import decode_updates
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def legacy_decode_updates(payload: str) -> MessagesResults:
+    return MessagesResults(**json.loads(payload.replace('"from":{"', '"from_":{"')))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=200, help="Decodes per measurement")
+    args = parser.parse_args()
+
+    print(f"{'batch':<32}{'updates':>8}{'legacy us':>12}{'decoder us':>12}{'speedup':>9}")
+
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "get_updates_*.json"))):
+        with open(path, "rb") as f:
+            raw = f.read()
+        text = raw.decode("utf-8")
+
+        assert legacy_decode_updates(text) == decode_updates(raw)
+
+        legacy = min(timeit.repeat(lambda: legacy_decode_updates(text), number=args.number, repeat=5))
+        decoder = min(timeit.repeat(lambda: decode_updates(raw), number=args.number, repeat=5))
+
+        updates = len(decode_updates(raw).result)
+        legacy_us = legacy / args.number * 1e6
+        decoder_us = decoder / args.number * 1e6
+
+        print(
+            f"{os.path.basename(path):<32}{updates:>8}{legacy_us:>12.1f}{decoder_us:>12.1f}"
+            f"{legacy_us / decoder_us:>8.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
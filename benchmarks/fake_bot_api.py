@@ -0,0 +1,333 @@
+"""
+Fake Telegram Bot API server for load and latency testing.
+
+Serves the subset of the Bot API the bot uses (getUpdates, getFile, file downloads,
+sendMessage, sendChatAction, setMessageReaction, sendDocument, sendVideo, sendPhoto,
+sendVoice, editMessageText, deleteMessage and leaveChat) from a local aiohttp app.
+It adds configurable latency, injects 429 and 502 answers, and feeds updates from a scripted
+batch at a fixed rate. Point the bot at it with `"telegram_api_url"` in bot_configs.json.
+
+Usage:
+    python -m benchmarks.fake_bot_api --script benchmarks/fixtures/get_updates_group_batch.json \\
+        --chat-id -100123 --rate 5 --latency 0.05 --rate-limit 0.02
+"""
+
+# Internal
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import time
+import typing as T
+from collections import Counter
+
+# External
+from aiohttp import web
+
+MEDIA_FIELDS = {
+    "sendPhoto": "photo", "sendVideo": "video", "sendVoice": "voice", "sendDocument": "document",
+}
+SEND_METHODS = {
+    "sendMessage", "sendPhoto", "sendVideo", "sendVoice", "sendDocument", "editMessageText",
+}
+OK_METHODS = {
+    "sendChatAction", "setMessageReaction", "deleteMessage", "leaveChat", "setChatTitle",
+    "setWebhook", "deleteWebhook",
+}
+
+
+class FakeBotApi:
+    """
+    In-memory stand-in for the Telegram Bot API.
+
+    Updates are queued with `feed`, served through getUpdates with offset and long
+    polling semantics, and every outbound call is counted. Replies carrying a
+    reply_to_message_id are matched to the update they answer to measure the bot's
+    end-to-end reply latency.
+    """
+    def __init__(
+            self,
+            latency: float = 0.0,
+            jitter: float = 0.0,
+            rate_limit_probability: float = 0.0,
+            retry_after: int = 1,
+            file_size: int = 64 * 1024,
+            error_probability: float = 0.0,
+    ):
+        """
+        Initialize the fake server.
+
+        Args:
+            latency (float, optional): Seconds added to every answer. Defaults to 0.
+            jitter (float, optional): Random extra seconds, up to this value, added to every answer. Defaults to 0.
+            rate_limit_probability (float, optional): Chance of answering a send or action call with 429.
+                Defaults to 0.
+            retry_after (int, optional): retry_after reported in injected 429 answers. Defaults to 1.
+            file_size (int, optional): Size of the files served for downloads. Defaults to 64 KB.
+            error_probability (float, optional): Chance of answering any call but getUpdates, file downloads
+                included, with 502. Defaults to 0.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_probability = rate_limit_probability
+        self.retry_after = retry_after
+        self.file_size = file_size
+        self.error_probability = error_probability
+
+        self.calls: T.Counter[str] = Counter()
+        self.rate_limited: T.Counter[str] = Counter()
+        self.errors: T.Counter[str] = Counter()
+        self.reply_latencies: T.List[float] = []
+
+        self._updates: T.List[dict] = []
+        self._next_update_id = 1
+        self._next_message_id = 1_000_000
+        self._delivered_at: T.Dict[T.Tuple[int, int], float] = {}
+        self._new_update = asyncio.Condition()
+
+    def app(self) -> web.Application:
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_route("*", "/bot{token}/{method}", self._handle_method)
+        app.router.add_get("/file/bot{token}/{path:.+}", self._handle_file)
+        return app
+
+    async def feed(self, update: dict) -> None:
+        """
+        Queue an update, renumbering its update_id and refreshing its date.
+
+        Args:
+            update (dict): The update, as Telegram would send it.
+        """
+        update = json.loads(json.dumps(update))
+        update["update_id"] = self._next_update_id
+        self._next_update_id += 1
+
+        for key in ("message", "edited_message"):
+            if key in update:
+                update[key]["date"] = int(time.time())
+
+        async with self._new_update:
+            self._updates.append(update)
+            self._new_update.notify_all()
+
+    def stats(self) -> dict:
+        latencies = sorted(self.reply_latencies)
+
+        def percentile(value: float) -> T.Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * value))] * 1000, 1)
+
+        return {
+            "calls": dict(self.calls),
+            "rate_limited": dict(self.rate_limited),
+            "errors": dict(self.errors),
+            "pending_updates": len(self._updates),
+            "replies": len(latencies),
+            "reply_latency_ms": {
+                "mean": round(statistics.mean(latencies) * 1000, 1) if latencies else None,
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "max": round(latencies[-1] * 1000, 1) if latencies else None,
+            },
+        }
+
+    async def _delay(self) -> None:
+        delay = self.latency + random.random() * self.jitter
+        if delay:
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    async def _read_params(request: web.Request) -> dict:
+        params = dict(request.query)
+
+        if request.method == "POST":
+            if request.content_type == "application/json":
+                params.update(await request.json())
+            elif request.content_type in ("multipart/form-data", "application/x-www-form-urlencoded"):
+                for key, value in (await request.post()).items():
+                    params[key] = value if isinstance(value, str) else None
+
+        return params
+
+    async def _handle_method(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        params = await self._read_params(request)
+        self.calls[method] += 1
+
+        if method == "getUpdates":
+            return await self._get_updates(params)
+
+        await self._delay()
+
+        if random.random() < self.error_probability:
+            self.errors[method] += 1
+            return web.json_response({"ok": False, "error_code": 502, "description": "Bad Gateway"}, status=502)
+
+        if method in SEND_METHODS | {"sendChatAction", "setMessageReaction"} \
+                and random.random() < self.rate_limit_probability:
+            self.rate_limited[method] += 1
+            return web.json_response(
+                {
+                    "ok": False,
+                    "error_code": 429,
+                    "description": f"Too Many Requests: retry after {self.retry_after}",
+                    "parameters": {"retry_after": self.retry_after},
+                },
+                status=429,
+            )
+
+        if method == "getFile":
+            file_id = params.get("file_id", "file")
+            return web.json_response({"ok": True, "result": {"file_id": file_id, "file_path": f"files/{file_id}"}})
+
+        if method in SEND_METHODS:
+            return web.json_response({"ok": True, "result": self._sent_message(method, params)})
+
+        if method in OK_METHODS:
+            return web.json_response({"ok": True, "result": True})
+
+        return web.json_response({"ok": False, "error_code": 404, "description": "Not Found"}, status=404)
+
+    async def _get_updates(self, params: dict) -> web.Response:
+        offset = int(params.get("offset", 0) or 0)
+        timeout = float(params.get("timeout", 0) or 0)
+
+        if offset < 0:
+            self._updates = self._updates[offset:]
+        elif offset:
+            self._updates = [update for update in self._updates if update["update_id"] >= offset]
+
+        if not self._updates and timeout:
+            async with self._new_update:
+                try:
+                    await asyncio.wait_for(self._new_update.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+        await self._delay()
+
+        now = time.monotonic()
+        for update in self._updates:
+            message = update.get("message") or update.get("edited_message") or {}
+            key = (message.get("chat", {}).get("id"), message.get("message_id"))
+            self._delivered_at.setdefault(key, now)
+
+        return web.json_response({"ok": True, "result": self._updates[:100]})
+
+    def _sent_message(self, method: str, params: dict) -> dict:
+        chat_id = int(params.get("chat_id") or 0)
+        reply_to = params.get("reply_to_message_id")
+
+        if reply_to:
+            delivered_at = self._delivered_at.pop((chat_id, int(reply_to)), None)
+            if delivered_at is not None:
+                self.reply_latencies.append(time.monotonic() - delivered_at)
+
+        if method == "editMessageText":
+            message_id = int(params.get("message_id") or 0)
+        else:
+            message_id = self._next_message_id
+            self._next_message_id += 1
+
+        message = {
+            "message_id": message_id,
+            "from": {"id": 1, "is_bot": True, "first_name": "Pedro"},
+            "chat": {"id": chat_id},
+            "date": int(time.time()),
+            "text": params.get("text", ""),
+        }
+
+        if method in MEDIA_FIELDS:
+            field = MEDIA_FIELDS[method]
+            if params.get(field):
+                self.calls[f"{method}:file_id"] += 1
+            else:
+                self.calls[f"{method}:upload"] += 1
+
+            media = {"file_id": params.get(field) or f"{field}-{message_id}", "file_unique_id": f"u{message_id}"}
+            message[field] = [media] if field == "photo" else media
+
+        return message
+
+    async def _handle_file(self, request: web.Request) -> web.Response:
+        self.calls["fileDownload"] += 1
+        await self._delay()
+
+        if random.random() < self.error_probability:
+            self.errors["fileDownload"] += 1
+            return web.Response(status=502)
+
+        return web.Response(body=os.urandom(self.file_size), content_type="application/octet-stream")
+
+
+async def _feed_script(api: FakeBotApi, updates: T.List[dict], rate: float, chat_id: T.Optional[int]) -> None:
+    for update in updates:
+        if chat_id is not None:
+            for key in ("message", "edited_message"):
+                if key in update:
+                    update[key]["chat"]["id"] = chat_id
+
+        await api.feed(update)
+        await asyncio.sleep(1 / rate if rate else 0)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    api = FakeBotApi(
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limit_probability=args.rate_limit,
+        retry_after=args.retry_after,
+        file_size=args.file_size,
+        error_probability=args.error_rate,
+    )
+
+    runner = web.AppRunner(api.app())
+    await runner.setup()
+    await web.TCPSite(runner, args.host, args.port).start()
+    logging.info(f"Fake Bot API listening on http://{args.host}:{args.port}")
+
+    if args.script:
+        with open(args.script, encoding="utf-8") as f:
+            updates = json.load(f)["result"]
+
+        asyncio.create_task(_feed_script(api, updates * args.repeat, args.rate, args.chat_id))
+
+    try:
+        while True:
+            await asyncio.sleep(args.report_every)
+            print(json.dumps(api.stats()), flush=True)
+    finally:
+        await runner.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake Telegram Bot API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every answer")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra seconds per answer")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Probability of a 429 answer")
+    parser.add_argument("--retry-after", type=int, default=1, help="retry_after of injected 429 answers")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of a 502 answer")
+    parser.add_argument("--file-size", type=int, default=64 * 1024, help="Bytes served per file download")
+    parser.add_argument("--script", help="getUpdates response whose updates are fed to the bot")
+    parser.add_argument("--repeat", type=int, default=1, help="How many times the script is fed")
+    parser.add_argument("--rate", type=float, default=5.0, help="Scripted updates per second")
+    parser.add_argument("--chat-id", type=int, help="Rewrite scripted updates to this chat")
+    parser.add_argument("--report-every", type=float, default=10.0, help="Seconds between stats reports")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Training and report of the local tone classifier.
+
+Reads the tone verdicts the LLM gave (logged by the ToneBatcher to
+`tone_batch.labels_file`), evaluates the classifier on a held-out share of them and
+reports its accuracy, how many messages it would answer locally at the configured
+neutral threshold and how often those answers agree with the LLM, and its latency.
+The model is then trained on every verdict and saved for `tone_classifier.model_file`.
+Needs NumPy.
+
+Usage:
+    python -m benchmarks.train_tone_classifier [--labels database/tone_labels.jsonl] \\
+        [--output database/tone_classifier.npz] [--threshold 0.9]
+"""
+
+# Internal
+import argparse
+import random
+import time
+from collections import Counter
+
+# Project
+from pedro.brain.modules.tone_classifier import NEUTRAL, TONES, ToneClassifier, load_labels
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--labels", default="database/tone_labels.jsonl", help="Logged LLM verdicts")
+    parser.add_argument("--output", default="database/tone_classifier.npz", help="Where the model is saved")
+    parser.add_argument("--buckets", type=int, default=2 ** 18, help="Hash buckets of the n-gram features")
+    parser.add_argument("--alpha", type=float, default=0.5, help="Additive smoothing")
+    parser.add_argument("--threshold", type=float, default=0.9, help="Neutral probability answered locally")
+    parser.add_argument("--test-share", type=float, default=0.2, help="Share of verdicts held out for the report")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dry-run", action="store_true", help="Only report, do not save the model")
+    args = parser.parse_args()
+
+    samples = load_labels(args.labels)
+    if not samples:
+        raise SystemExit(f"No verdicts in {args.labels}")
+
+    random.Random(args.seed).shuffle(samples)
+    test_size = int(len(samples) * args.test_share)
+    test, train = samples[:test_size], samples[test_size:]
+
+    tones = Counter(tone for _, tone in samples)
+    print(f"verdicts: {len(samples)} ({', '.join(f'{tone}: {tones[tone]}' for tone in range(TONES))})")
+
+    if test:
+        started = time.perf_counter()
+        classifier = ToneClassifier.train(train, buckets=args.buckets, alpha=args.alpha)
+        train_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        predictions = [classifier.predict(text) for text, _ in test]
+        predict_us = (time.perf_counter() - started) / len(test) * 1e6
+
+        correct = sum(tone == predicted for (_, tone), (predicted, _) in zip(test, predictions))
+        local = [
+            tone for (_, tone), (predicted, probability) in zip(test, predictions)
+            if predicted == NEUTRAL and probability >= args.threshold
+        ]
+        majority = tones.most_common(1)[0][1] / len(samples)
+
+        print(f"held out: {len(test)}, trained on {len(train)} in {train_ms:.0f} ms")
+        print(f"accuracy: {correct / len(test):.3f} (majority class {majority:.3f})")
+        print(f"answered locally at {args.threshold}: {len(local) / len(test):.3f} of messages")
+        if local:
+            print(f"local answers agreeing with the LLM: {sum(tone == NEUTRAL for tone in local) / len(local):.3f}")
+        print(f"latency: {predict_us:.0f} us per message")
+    else:
+        print("too few verdicts for a held-out report")
+
+    if not args.dry_run:
+        ToneClassifier.train(samples, buckets=args.buckets, alpha=args.alpha).save(args.output)
+        print(f"saved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
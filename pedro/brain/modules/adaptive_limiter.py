@@ -0,0 +1,132 @@
+"""
+Adaptive limiter module for concurrent LLM requests.
+
+A fixed number of request slots is either too few while the API is healthy or too
+many while it is rate limiting us. This module adjusts the limit the way TCP
+adjusts its window (AIMD): every window of fast, successful requests adds one
+slot, and a rate limit answer or a timeout halves the limit.
+"""
+
+# Internal
+import asyncio
+import logging
+import typing as T
+from collections import deque
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit with additive increase and multiplicative decrease.
+
+    Each request completed within `latency_target` seconds adds 1/limit to the limit,
+    so a whole window of them adds one slot. An overloaded request (429, server error
+    or timeout) multiplies the limit by `backoff`, at most once per window, so a burst
+    of failures from requests started together only counts once. Requests wait in
+    FIFO order while every slot is taken.
+    """
+    def __init__(
+            self,
+            name: str,
+            initial: int = 2,
+            min_limit: int = 1,
+            max_limit: int = 16,
+            latency_target: float = 10.0,
+            backoff: float = 0.5,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            name (str): Name reported in the stats, e.g. the model.
+            initial (int, optional): Starting limit. Defaults to 2.
+            min_limit (int, optional): Lowest limit. Defaults to 1.
+            max_limit (int, optional): Highest limit. Defaults to 16.
+            latency_target (float, optional): Seconds under which a completed request counts as fast.
+                Defaults to 10.
+            backoff (float, optional): Factor applied to the limit on overload. Defaults to 0.5.
+        """
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff = backoff
+
+        self._limit = float(min(max(initial, min_limit), max_limit))
+        self._in_flight = 0
+        self._waiters: T.Deque[asyncio.Future] = deque()
+        self._since_decrease = self.limit
+        self._completed = 0
+        self._overloaded = 0
+        self._latency: T.Optional[float] = None
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    async def acquire(self) -> None:
+        """
+        Take a slot, waiting for one while the limit is reached.
+        """
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over right before the cancellation, give it back
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self, latency: T.Optional[float] = None, overloaded: bool = False) -> None:
+        """
+        Give a slot back and adjust the limit with the outcome of its request.
+
+        Args:
+            latency (Optional[float], optional): Seconds the request took, None when it failed or
+                its latency says nothing about the API's health. Defaults to None.
+            overloaded (bool, optional): Whether the API answered with a rate limit or server error,
+                or timed out. Defaults to False.
+        """
+        self._in_flight -= 1
+        self._since_decrease += 1
+        previous_limit = self.limit
+
+        if overloaded:
+            self._overloaded += 1
+
+            if self._since_decrease >= self.limit:
+                self._limit = max(self.min_limit, self._limit * self.backoff)
+                self._since_decrease = 0
+        elif latency is not None:
+            self._completed += 1
+            self._latency = latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+
+            if latency <= self.latency_target:
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+        if self.limit != previous_limit:
+            logging.info(f"{self.name} concurrency limit {previous_limit} -> {self.limit} ({len(self._waiters)} queued)")
+
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "queued": len(self._waiters),
+            "completed": self._completed,
+            "overloaded": self._overloaded,
+            "latency_ms": round(self._latency * 1000, 1) if self._latency is not None else None,
+        }
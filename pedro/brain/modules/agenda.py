@@ -6,6 +6,7 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 
 from pedro.brain.modules.telegram import Telegram
+from pedro.brain.modules.leader_election import LeaderElection
 # Project
 from pedro.data_structures.agenda import Agenda
 from pedro.brain.modules.database import Database
@@ -17,15 +18,24 @@ class AgendaManager:
     Provides methods to create, read, update, and delete agenda items.
     """
 
-    def __init__(self, telegram: Telegram, db_path: str = "database/pedro_database.json"):
+    def __init__(
+            self,
+            telegram: Telegram,
+            db_path: str = "database/pedro_database.json",
+            shared_db: bool = False,
+            leader: Optional[LeaderElection] = None,
+    ):
         """
         Initialize the AgendaManager with a database connection.
 
         Args:
             db_path: Path to the database file
+            shared_db: Whether other processes use the same database file
+            leader: Optional leader election, due agenda items are only announced while it is leader
         """
-        self.db = Database(db_path)
+        self.db = Database(db_path, shared=shared_db)
         self.table_name = "agenda"
+        self.leader = leader
 
         asyncio.create_task(self.check_agenda(telegram))
 
@@ -237,7 +247,8 @@ class AgendaManager:
         This method runs in an infinite loop checking for monthly events (including those
         scheduled for the 31st which trigger on the last day of months with fewer days) 
         and annual/one-time events. When an event is due, it sends the appropriate message
-        via Telegram and marks the event as celebrated.
+        via Telegram and marks the event as celebrated. Instances that are not the leader
+        skip the checks.
 
         Args:
             telegram: Telegram instance used to send messages to chats
@@ -246,6 +257,10 @@ class AgendaManager:
             None. Method runs indefinitely until the program is terminated.
         """
         while True:
+            if self.leader and not self.leader.is_leader:
+                await asyncio.sleep(10)
+                continue
+
             try:
                 datetime_manager = DatetimeManager()
                 today = datetime_manager.now()
@@ -314,7 +329,7 @@ class AgendaManager:
                                         )
 
                                         await telegram.send_video(
-                                            video=open(f'gifs/birthday0.mp4', 'rb').read(),
+                                            video='gifs/birthday0.mp4',
                                             chat_id=entry.for_chat
                                         )
                                     else:
@@ -0,0 +1,112 @@
+"""
+Album aggregator module for photo albums.
+
+Telegram delivers an album as one message per photo, all sharing a media_group_id,
+with the caption on only one of them. Handled separately, every photo would be
+described by its own LLM call and stored as its own history entry. This module
+holds album parts for a short window and merges them into a single message.
+"""
+
+# Internal
+import asyncio
+import dataclasses
+import logging
+import time
+import typing as T
+
+# Project
+from pedro.data_structures.telegram_message import Message
+
+
+class _PendingAlbum:
+    def __init__(self):
+        self.parts: T.List[Message] = []
+        self.started_at = time.monotonic()
+        self.last_part_at = self.started_at
+        self.task: T.Optional[asyncio.Task] = None
+
+
+class AlbumAggregator:
+    """
+    Collects the photos of an album into one logical message.
+
+    Parts are keyed by chat and media_group_id. An album is complete once no new part
+    arrived for `window` seconds, or `max_wait` seconds after its first part, and is
+    then passed to `on_album` as the first part carrying every photo in `album`.
+    """
+    def __init__(
+            self,
+            on_album: T.Callable[[Message], T.Awaitable[None]],
+            window: float = 1.0,
+            max_wait: float = 5.0,
+    ):
+        """
+        Initialize the aggregator.
+
+        Args:
+            on_album (Callable[[Message], Awaitable[None]]): Handles the merged album message.
+            window (float, optional): Seconds without a new part after which an album is complete. Defaults to 1.
+            max_wait (float, optional): Maximum seconds an album is held after its first part. Defaults to 5.
+        """
+        self._on_album = on_album
+        self._window = window
+        self._max_wait = max_wait
+        self._albums: T.Dict[T.Tuple[int, str], _PendingAlbum] = {}
+
+    @staticmethod
+    def is_album_part(message: Message) -> bool:
+        return bool(message.media_group_id and message.photo and message.chat)
+
+    def add(self, message: Message) -> None:
+        """
+        Hold an album part until its album is complete.
+
+        Args:
+            message (Message): A photo message with a media_group_id.
+        """
+        key = (message.chat.id, message.media_group_id)
+        album = self._albums.get(key)
+
+        if album is None:
+            album = self._albums[key] = _PendingAlbum()
+            album.task = asyncio.create_task(self._flush_when_complete(key, album))
+
+        album.parts.append(message)
+        album.last_part_at = time.monotonic()
+
+    async def _flush_when_complete(self, key: T.Tuple[int, str], album: _PendingAlbum) -> None:
+        while True:
+            delay = min(album.last_part_at + self._window, album.started_at + self._max_wait) - time.monotonic()
+
+            if delay <= 0:
+                break
+
+            await asyncio.sleep(delay)
+
+        del self._albums[key]
+
+        try:
+            await self._on_album(self.merge(album.parts))
+        except Exception as exc:
+            logging.exception(exc)
+
+    @staticmethod
+    def merge(parts: T.List[Message]) -> Message:
+        """
+        Merge album parts into one message.
+
+        Args:
+            parts (List[Message]): The photo messages of one album.
+
+        Returns:
+            Message: The first part, with the largest size of every photo in `album` and the
+                album caption.
+        """
+        parts = sorted(parts, key=lambda part: part.message_id or 0)
+        caption = next((part.caption for part in parts if part.caption), None)
+
+        return dataclasses.replace(
+            parts[0],
+            caption=caption,
+            album=[part.photo[-1] for part in parts],
+        )
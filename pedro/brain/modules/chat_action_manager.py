@@ -0,0 +1,106 @@
+"""
+Chat action module for typing indicators.
+
+Telegram shows a chat action like "typing..." for about five seconds, so long
+replies need it resent periodically. Several reactions can work on the same
+message at once, and this module makes them share one indicator per chat.
+"""
+
+# Internal
+import asyncio
+import logging
+import typing as T
+from contextlib import contextmanager
+
+ChatAction = T.Union[T.Literal['typing'], T.Literal['upload_photo'], T.Literal['find_location']]
+
+
+class _ChatActionState:
+    def __init__(self):
+        self.actions: T.List[ChatAction] = []
+        self.task: T.Optional[asyncio.Task] = None
+
+
+class ChatActionManager:
+    """
+    Reference-counted chat actions, one sender loop per chat.
+
+    Every active scope holds a reference on its chat. The first scope starts a loop that
+    sends the action every `interval` seconds, later scopes only join it, and the loop
+    stops when the last scope exits. When scopes ask for different actions the most
+    recent one is shown.
+    """
+    def __init__(
+            self,
+            send: T.Callable[[int, ChatAction], T.Awaitable[None]],
+            interval: float = 5.0,
+    ):
+        """
+        Initialize the manager.
+
+        Args:
+            send (Callable[[int, ChatAction], Awaitable[None]]): Sends a single chat action to a chat.
+            interval (float, optional): Seconds between two actions sent to the same chat. Defaults to 5.
+        """
+        self._send = send
+        self._interval = interval
+        self._chats: T.Dict[int, _ChatActionState] = {}
+
+    def acquire(self, chat_id: int, action: ChatAction = 'typing') -> None:
+        """
+        Start showing an action in a chat, or join the indicator already running there.
+
+        Args:
+            chat_id (int): The chat to show the action in.
+            action (ChatAction, optional): The action to show. Defaults to 'typing'.
+        """
+        state = self._chats.setdefault(chat_id, _ChatActionState())
+        state.actions.append(action)
+
+        if state.task is None:
+            state.task = asyncio.create_task(self._action_loop(chat_id, state))
+
+    def release(self, chat_id: int, action: ChatAction = 'typing') -> None:
+        """
+        Drop a reference taken by `acquire`, stopping the indicator with the last one.
+
+        Args:
+            chat_id (int): The chat the action was shown in.
+            action (ChatAction, optional): The action that was acquired. Defaults to 'typing'.
+        """
+        state = self._chats.get(chat_id)
+
+        if state is None or action not in state.actions:
+            return
+
+        del state.actions[len(state.actions) - 1 - state.actions[::-1].index(action)]
+
+        if not state.actions:
+            state.task.cancel()
+            del self._chats[chat_id]
+
+    @contextmanager
+    def scope(self, chat_id: int, action: ChatAction = 'typing') -> T.Iterator[None]:
+        """
+        Show an action in a chat while the block runs.
+
+        Args:
+            chat_id (int): The chat to show the action in.
+            action (ChatAction, optional): The action to show. Defaults to 'typing'.
+        """
+        self.acquire(chat_id, action)
+        try:
+            yield
+        finally:
+            self.release(chat_id, action)
+
+    async def _action_loop(self, chat_id: int, state: _ChatActionState) -> None:
+        while state.actions:
+            try:
+                await self._send(chat_id, state.actions[-1])
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logging.exception(exc)
+
+            await asyncio.sleep(self._interval)
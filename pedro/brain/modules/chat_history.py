@@ -5,9 +5,6 @@ from datetime import datetime, timedelta, timezone
 import os
 from typing import List
 
-# External
-import aiohttp
-
 # Project
 from pedro.brain.constants.constants import DATE_FULL_FORMAT, DATE_FORMAT
 from pedro.brain.modules.datetime_manager import DatetimeManager
@@ -41,7 +38,6 @@ class ChatHistory:
         datetime (DatetimeManager): Instance of DatetimeManager for date/time operations
         telegram (Telegram): Optional Telegram bot instance for image processing
         llm (LLM): Optional LLM instance for image description generation
-        session (aiohttp.ClientSession): HTTP client session
 
     Args:
         telegram (Telegram, optional): Telegram bot instance. Defaults to None.
@@ -63,11 +59,11 @@ class ChatHistory:
         self.telegram = telegram
         self.llm = llm
 
-        self.session = aiohttp.ClientSession()
-
     async def _process_image(self, message: Message) -> str:
         """
-        Process an image message and generate a short description using LLM.
+        Process an image message, or a whole album, and generate a short description using LLM.
+
+        All photos of an album are described by a single request.
 
         Args:
             message (Message): The Telegram message containing an image.
@@ -87,28 +83,36 @@ class ChatHistory:
             return message.text or message.caption or ""
 
         try:
-            image = await self.telegram.image_downloader(message)
-            if not image:
+            images = await self.telegram.images_downloader(message)
+            if not images:
                 logger.warning("Failed to download image")
                 return message.text or message.caption or ""
 
             model = "gpt-4.1-nano"
-            prompt = "Faça uma curta descrição da imagem, máximo 10 palavras."
             bot_in_prompt = message.caption and "pedro" in message.caption.lower()
 
-            if bot_in_prompt:
-                prompt = f"Descreva a imagem e responda: '{message.caption}'"
-                model = "gpt-4.1-mini"
+            if len(images) > 1:
+                prompt = f"Faça uma curta descrição do álbum de {len(images)} imagens, máximo 20 palavras."
+                if bot_in_prompt:
+                    prompt = f"Descreva as {len(images)} imagens do álbum e responda: '{message.caption}'"
+                    model = "gpt-4.1-mini"
+                attachment = f"ÁLBUM DE {len(images)} IMAGENS ANEXADO"
+            else:
+                prompt = "Faça uma curta descrição da imagem, máximo 10 palavras."
+                if bot_in_prompt:
+                    prompt = f"Descreva a imagem e responda: '{message.caption}'"
+                    model = "gpt-4.1-mini"
+                attachment = "IMAGEM ANEXADA"
 
-            description = await self.llm.generate_text(prompt=prompt, model=model, image=image)
+            description = await self.llm.generate_text(prompt=prompt, model=model, images=images, cache=True)
 
             if not bot_in_prompt:
                 description = (f"{description} "
                                f"[[Caso seja perguntado a Pedro algo sobre a imagem. "
                                f"Peça para sinalizá-la para mais detalhes]]")
-                formatted_text = f"[[CURTA DESCRIÇÃO DE IMAGEM ANEXADA: {description} ]]"
+                formatted_text = f"[[CURTA DESCRIÇÃO DE {attachment}: {description} ]]"
             else:
-                formatted_text = f"[[IMAGEM ANEXADA: {description} ]]"
+                formatted_text = f"[[{attachment}: {description} ]]"
 
             if message.caption:
                 formatted_text = f"{message.caption}\n\n{formatted_text}"
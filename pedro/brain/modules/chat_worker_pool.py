@@ -0,0 +1,103 @@
+"""
+Chat worker pool module for processing messages in per-chat order.
+
+Messages of one chat must be handled in the order they arrived, while a slow
+message in one chat, like a photo waiting for its description, should not hold
+back any other chat. This module keeps one queue per chat and a fixed number of
+workers that each take the next message of a chat nobody is working on.
+"""
+
+# Internal
+import asyncio
+import logging
+import typing as T
+from collections import deque
+
+Item = T.TypeVar("Item")
+
+
+class ChatWorkerPool(T.Generic[Item]):
+    """
+    Bounded pool of workers, ordered within a chat and concurrent across chats.
+
+    Every chat has its own FIFO and is worked on by at most one worker at a time, so
+    items of a chat are handled one after the other in submission order. Up to `workers`
+    chats are handled in parallel. At most `max_pending` items wait or run at once and
+    `put` blocks while the pool is full, pushing back on whoever feeds it.
+    """
+    def __init__(
+            self,
+            name: str,
+            handler: T.Callable[[Item], T.Awaitable[None]],
+            workers: int = 8,
+            max_pending: int = 200,
+    ):
+        """
+        Initialize the pool and start its workers.
+
+        Args:
+            name (str): Name of the stage, used in logs and stats.
+            handler (Callable[[Item], Awaitable[None]]): Handles one item. Exceptions are logged and the
+                chat moves on to its next item.
+            workers (int, optional): Number of chats handled in parallel. Defaults to 8.
+            max_pending (int, optional): Items queued or running before `put` blocks. Defaults to 200.
+        """
+        self.name = name
+        self._handler = handler
+        self._capacity = asyncio.Semaphore(max_pending)
+        self._chats: T.Dict[int, T.Deque[Item]] = {}
+        self._ready: asyncio.Queue[int] = asyncio.Queue()
+        self._pending = 0
+        self._handled = 0
+        self._failed = 0
+
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(workers)]
+
+    async def put(self, chat_id: int, item: Item) -> None:
+        """
+        Queue an item behind the other items of its chat, waiting while the pool is full.
+
+        Args:
+            chat_id (int): The chat the item belongs to.
+            item (Item): The item to handle.
+        """
+        await self._capacity.acquire()
+        self._pending += 1
+
+        queue = self._chats.get(chat_id)
+
+        if queue is None:
+            self._chats[chat_id] = deque([item])
+            self._ready.put_nowait(chat_id)
+        else:
+            queue.append(item)
+
+    async def _worker(self) -> None:
+        while True:
+            chat_id = await self._ready.get()
+            queue = self._chats[chat_id]
+
+            try:
+                await self._handler(queue[0])
+                self._handled += 1
+            except Exception as exc:
+                self._failed += 1
+                logging.exception(exc)
+            finally:
+                queue.popleft()
+                self._pending -= 1
+                self._capacity.release()
+
+                if queue:
+                    self._ready.put_nowait(chat_id)
+                else:
+                    del self._chats[chat_id]
+
+    def stats(self) -> dict:
+        return {
+            "stage": self.name,
+            "pending": self._pending,
+            "chats": len(self._chats),
+            "handled": self._handled,
+            "failed": self._failed,
+        }
@@ -1,20 +1,66 @@
 # Internal
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 import os
 import shutil
 import glob
+from contextlib import contextmanager
 from datetime import datetime
 
 # External
 from tinydb import TinyDB, Query
 
+# Project
+from pedro.utils.file_lock import file_lock
+
 
 class Database:
-    def __init__(self, db_path: str = "pedro_database.json"):
+    def __init__(self, db_path: str = "pedro_database.json", shared: bool = False):
+        """
+        Open a TinyDB database file.
+
+        Args:
+            db_path (str, optional): Path of the database file. Defaults to "pedro_database.json".
+            shared (bool, optional): Whether other processes use the same file, e.g. shard workers. Every
+                operation then holds an inter-process lock and works on a fresh table, without the query
+                cache nor the next document ID another process may have used already. Defaults to False.
+        """
         self.db_path = db_path
         self.db = TinyDB(db_path, indent=4, encoding='utf-8')
         self.query = Query()
         self.default_db_name = "pedro_database.json"
+        self.shared = shared
+
+        self._lock_depth = 0
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Hold the inter-process lock across several operations, e.g. a search and the update depending
+        on it, so no other process writes in between. Operations inside take the lock again freely.
+        Does nothing when the database is not shared.
+        """
+        if not self.shared or self._lock_depth:
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+
+        with file_lock(f"{self.db_path}.lock"):
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+
+    def _table(self, table_name: str):
+        if not self.shared:
+            return self.db.table(table_name)
+
+        # TinyDB keeps table instances, and each one remembers the next document ID it hands out
+        self.db._tables.pop(table_name, None)
+        return self.db.table(table_name, cache_size=0)
 
     def _create_backup(self):
         if self.default_db_name in self.db_path and os.path.exists(self.db_path):
@@ -31,17 +77,16 @@ class Database:
                     os.remove(old_backup)
 
     def insert(self, table_name: str, data: Dict[str, Any]) -> int:
-        table = self.db.table(table_name)
-        result = table.insert(data)
-        self._create_backup()
+        with self.transaction():
+            result = self._table(table_name).insert(data)
+            self._create_backup()
         return result
 
     def get_all(self, table_name: str) -> List[Dict[str, Any]]:
-        table = self.db.table(table_name)
-        return table.all()
+        with self.transaction():
+            return self._table(table_name).all()
 
     def search(self, table_name: str, condition: Dict[str, Any]) -> List[Dict[str, Any]]:
-        table = self.db.table(table_name)
         query = self.query
 
         query_obj = None
@@ -51,10 +96,10 @@ class Database:
             else:
                 query_obj &= (query[key] == value)
 
-        return table.search(query_obj) if query_obj else []
+        with self.transaction():
+            return self._table(table_name).search(query_obj) if query_obj else []
 
     def update(self, table_name: str, data: Dict[str, Any], condition: Dict[str, Any]) -> List[int]:
-        table = self.db.table(table_name)
         query = self.query
 
         query_obj = None
@@ -64,12 +109,12 @@ class Database:
             else:
                 query_obj &= (query[key] == value)
 
-        result = table.update(data, query_obj) if query_obj else []
-        self._create_backup()
+        with self.transaction():
+            result = self._table(table_name).update(data, query_obj) if query_obj else []
+            self._create_backup()
         return result
 
     def remove(self, table_name: str, condition: Dict[str, Any]) -> List[int]:
-        table = self.db.table(table_name)
         query = self.query
 
         # Build query dynamically based on condition
@@ -80,7 +125,8 @@ class Database:
             else:
                 query_obj &= (query[key] == value)
 
-        return table.remove(query_obj) if query_obj else []
+        with self.transaction():
+            return self._table(table_name).remove(query_obj) if query_obj else []
 
     def close(self) -> None:
         self.db.close()
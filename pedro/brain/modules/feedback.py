@@ -1,7 +1,9 @@
 # Internal
 from contextlib import contextmanager
 import asyncio
+import logging
 import random
+import time
 import typing as T
 
 # External
@@ -9,6 +11,7 @@ import typing as T
 # Project
 from pedro.brain.modules.chat_history import ChatHistory
 from pedro.brain.modules.telegram import Telegram
+from pedro.utils.text_utils import adjust_pedro_casing, split_message
 
 
 async def _is_taking_too_long(telegram: Telegram, chat_id: int, user="", max_loops=5, timeout=5, memory: T.Optional[ChatHistory] = None):
@@ -43,10 +46,116 @@ def sending_action(
         action: T.Union[T.Literal['typing'], T.Literal['upload_photo'], T.Literal['find_location']] = 'typing',
         memory=None
 ):
-    sending = asyncio.create_task(telegram.send_action(chat_id, action, True))
     timer = asyncio.create_task(_is_taking_too_long(telegram=telegram, chat_id=chat_id, user=user, memory=memory))
+    with telegram.chat_actions.scope(chat_id, action):
+        try:
+            yield
+        finally:
+            timer.cancel()
+
+
+async def stream_reply(
+        telegram: Telegram,
+        chat_id: int,
+        text_stream: T.AsyncIterator[str],
+        reply_to: T.Optional[int] = None,
+        finalize: T.Optional[T.Callable[[str], T.Awaitable[str]]] = adjust_pedro_casing,
+        placeholder: str = "...",
+        edit_interval: T.Optional[float] = None,
+        disable_web_page_preview=False,
+) -> str:
+    """
+    Reply with text that is still being generated.
+
+    A placeholder message is sent right away and edited with the text received so far,
+    at most once per `edit_interval`. When the stream ends, `finalize` is applied to the
+    whole text and the message is edited one last time with the result. A result over
+    Telegram's length limit keeps its first part in the message and sends the rest after it.
+
+    Args:
+        telegram (Telegram): Telegram client.
+        chat_id (int): The chat to reply in.
+        text_stream (AsyncIterator[str]): Text deltas, e.g. from LLM.generate_text_stream.
+        reply_to (Optional[int], optional): Message ID to reply to. Defaults to None.
+        finalize (Optional[Callable[[str], Awaitable[str]]], optional): Transformation of the complete text.
+            Defaults to adjust_pedro_casing.
+        placeholder (str, optional): Text shown before the first delta. Defaults to "...".
+        edit_interval (Optional[float], optional): Seconds between edits. Defaults to 1 in private chats
+            and 3 in groups, which Telegram rate limits harder.
+        disable_web_page_preview (bool, optional): Whether to disable link previews. Defaults to False.
+
+    Returns:
+        str: The final text of the reply.
+    """
+    if edit_interval is None:
+        edit_interval = 1.0 if chat_id > 0 else 3.0
+
+    sending = asyncio.create_task(
+        telegram.send_message(message_text=placeholder, chat_id=chat_id, reply_to=reply_to, parse_mode="")
+    )
+    editing: T.Optional[asyncio.Task] = None
+    last_edit = time.monotonic()
+    shown = ""
+    text = ""
+
+    async for delta in text_stream:
+        text += delta
+
+        if not sending.done() or (editing and not editing.done()):
+            continue
+
+        if time.monotonic() - last_edit < edit_interval or text.strip() == shown:
+            continue
+
+        sent = None if sending.exception() else sending.result()
+
+        if sent:
+            shown = text.strip()
+            last_edit = time.monotonic()
+            editing = asyncio.create_task(
+                telegram.edit_message_text(
+                    message_text=f"{shown[:4000]} ...",
+                    chat_id=chat_id,
+                    message_id=sent["message_id"],
+                    parse_mode="",
+                    disable_web_page_preview=disable_web_page_preview,
+                    max_retries=1,
+                )
+            )
+
+    final_text = (await finalize(text) if finalize else text) or "ué"
+
     try:
-        yield
-    finally:
-        sending.cancel()
-        timer.cancel()
+        sent = await sending
+    except Exception as exc:
+        logging.exception(exc)
+        sent = None
+
+    if editing:
+        await asyncio.gather(editing, return_exceptions=True)
+
+    if sent:
+        first_part, *other_parts = split_message(final_text)
+
+        await telegram.edit_message_text(
+            message_text=first_part,
+            chat_id=chat_id,
+            message_id=sent["message_id"],
+            disable_web_page_preview=disable_web_page_preview,
+        )
+
+        if other_parts:
+            await telegram.send_message(
+                message_text="\n\n".join(other_parts),
+                chat_id=chat_id,
+                disable_web_page_preview=disable_web_page_preview,
+            )
+    else:
+        await telegram.send_message(
+            message_text=final_text,
+            chat_id=chat_id,
+            reply_to=reply_to,
+            disable_web_page_preview=disable_web_page_preview,
+        )
+
+    return final_text
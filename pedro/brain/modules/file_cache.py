@@ -0,0 +1,188 @@
+"""
+File cache module for Telegram downloads.
+
+Telegram identifies the content of a file by its `file_unique_id`, which stays the
+same across chats, bots and time. This module keeps downloaded files keyed by that id
+in a memory LRU with a byte budget, optionally backed by a directory on disk, so the
+same photo is only downloaded once no matter how many reactions look at it. With a
+disk tier, files bigger than the spool size skip the memory tier and are only kept
+on disk; without one, the memory tier keeps files of any size within its budget.
+"""
+
+# Internal
+import logging
+import os
+import re
+import typing as T
+from collections import OrderedDict
+
+# Project
+from pedro.data_structures.downloaded_file import DownloadedFile
+
+
+class FileCache:
+    """
+    Two-tier LRU cache of file contents keyed by Telegram's file_unique_id.
+
+    The memory tier evicts the least recently used files once `max_memory_bytes` is
+    exceeded. When `disk_dir` is set, every stored file is also written there and
+    files evicted from memory can be read back without touching the network. The disk
+    tier is scanned once at startup, and its usage is tracked as files are written and
+    evicted from then on.
+    """
+    def __init__(
+            self,
+            max_memory_bytes: int = 64 * 1024 * 1024,
+            disk_dir: T.Optional[str] = None,
+            max_disk_bytes: int = 512 * 1024 * 1024,
+            spool_bytes: int = 1024 * 1024,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_memory_bytes (int, optional): Memory budget of the cache. Defaults to 64 MB.
+            disk_dir (Optional[str], optional): Directory of the disk tier, None disables it. Defaults to None.
+            max_disk_bytes (int, optional): Disk budget of the cache. Defaults to 512 MB.
+            spool_bytes (int, optional): Largest file kept in memory when there is a disk tier, also the size
+                above which returned files spill to a temporary file. Defaults to 1 MB.
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.spool_bytes = spool_bytes
+
+        self._memory: T.OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+
+        # Disk files by path, least recently used first, with their sizes
+        self._disk: T.OrderedDict[str, int] = OrderedDict()
+        self._disk_bytes = 0
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            self._scan_disk()
+
+    def get(self, key: str) -> T.Optional[DownloadedFile]:
+        """
+        Get a cached file.
+
+        Args:
+            key (str): The file_unique_id of the file.
+
+        Returns:
+            Optional[DownloadedFile]: A fresh handle to the file contents, or None on a miss.
+        """
+        data = self._memory.get(key)
+
+        if data is not None:
+            self._memory.move_to_end(key)
+            return DownloadedFile.from_bytes(data, spool_bytes=self.spool_bytes)
+
+        return self._read_disk(key)
+
+    def put(self, key: str, file: DownloadedFile) -> None:
+        """
+        Store a file in the cache.
+
+        Args:
+            key (str): The file_unique_id of the file.
+            file (DownloadedFile): The file contents.
+        """
+        if file.size <= self.spool_bytes or not self.disk_dir:
+            self._put_memory(key, file.read())
+
+        self._write_disk(key, file)
+
+    def _put_memory(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_memory_bytes:
+            return
+
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, re.sub(r"[^A-Za-z0-9_-]", "_", key))
+
+    def _read_disk(self, key: str) -> T.Optional[DownloadedFile]:
+        if not self.disk_dir:
+            return None
+
+        path = self._disk_path(key)
+
+        try:
+            file = DownloadedFile.from_path(path, spool_bytes=self.spool_bytes)
+            os.utime(path)
+        except FileNotFoundError:
+            self._forget_disk(path)
+            return None
+        except OSError as exc:
+            logging.warning(f"File cache read failed for {key}: {exc}")
+            return None
+
+        if path in self._disk:
+            self._disk.move_to_end(path)
+
+        if file.size <= self.spool_bytes:
+            self._put_memory(key, file.read())
+
+        return file
+
+    def _write_disk(self, key: str, file: DownloadedFile) -> None:
+        if not self.disk_dir or file.size > self.max_disk_bytes:
+            return
+
+        path = self._disk_path(key)
+        tmp_path = f"{path}.tmp"
+
+        try:
+            file.save(tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            logging.warning(f"File cache write failed for {key}: {exc}")
+            return
+
+        self._forget_disk(path)
+        self._disk[path] = file.size
+        self._disk_bytes += file.size
+        self._trim_disk()
+
+    def _scan_disk(self) -> None:
+        entries = []
+
+        for entry in os.scandir(self.disk_dir):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        for _, size, path in sorted(entries):
+            self._disk[path] = size
+            self._disk_bytes += size
+
+        self._trim_disk()
+
+    def _forget_disk(self, path: str) -> None:
+        size = self._disk.pop(path, None)
+
+        if size is not None:
+            self._disk_bytes -= size
+
+    def _trim_disk(self) -> None:
+        while self._disk_bytes > self.max_disk_bytes and self._disk:
+            path, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as exc:
+                logging.warning(f"File cache eviction failed for {path}: {exc}")
@@ -0,0 +1,131 @@
+"""
+HTTP client module shared by every outbound call of the bot.
+
+Telegram, OpenAI, link previews, weather and roleta lookups all go through one
+aiohttp session, so connections are pooled per host and kept alive between
+messages instead of paying a TCP and TLS handshake on every call.
+"""
+
+# Internal
+import asyncio
+import logging
+import typing as T
+from urllib.parse import urlsplit
+
+# External
+import aiohttp
+
+
+class HttpClient:
+    """
+    Shared aiohttp session with a tuned connection pool.
+
+    The session is created on first use, so the client can be built before the event
+    loop runs. Connections are limited per host, idle ones are kept alive for reuse
+    and DNS answers are cached.
+    """
+    def __init__(
+            self,
+            limit: int = 100,
+            limit_per_host: int = 10,
+            keepalive_timeout: float = 75.0,
+            dns_cache_ttl: int = 300,
+            connect_timeout: float = 10.0,
+            total_timeout: float = 300.0,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            limit (int, optional): Maximum number of open connections. Defaults to 100.
+            limit_per_host (int, optional): Maximum number of open connections to a single host. Defaults to 10.
+            keepalive_timeout (float, optional): Seconds an idle connection is kept for reuse. Defaults to 75.
+            dns_cache_ttl (int, optional): Seconds a DNS answer is cached. Defaults to 300.
+            connect_timeout (float, optional): Seconds allowed to open a connection. Defaults to 10.
+            total_timeout (float, optional): Default seconds allowed for a whole request, requests may
+                override it. Defaults to 300.
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.connect_timeout = connect_timeout
+        self.total_timeout = total_timeout
+
+        self._session: T.Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+                use_dns_cache=True,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.total_timeout, connect=self.connect_timeout),
+            )
+
+        return self._session
+
+    async def warm_up(self, urls: T.Iterable[str]) -> None:
+        """
+        Open pooled connections ahead of the first real request.
+
+        Resolves each host and completes the TCP and TLS handshakes with a HEAD request,
+        leaving the connection in the keep-alive pool. Failures are only logged.
+
+        Args:
+            urls (Iterable[str]): URLs whose hosts should be warmed up.
+        """
+        async def _warm(url: str) -> None:
+            parts = urlsplit(url)
+
+            try:
+                async with self.session.head(
+                        f"{parts.scheme}://{parts.netloc}/",
+                        allow_redirects=False,
+                        timeout=aiohttp.ClientTimeout(total=self.connect_timeout * 2),
+                ) as resp:
+                    await resp.read()
+            except Exception as exc:
+                logging.warning(f"HTTP warm-up failed for {parts.netloc}: {exc}")
+
+        await asyncio.gather(*(_warm(url) for url in urls))
+
+    async def close(self) -> None:
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+
+_shared_client: T.Optional[HttpClient] = None
+
+
+def get_http_client() -> HttpClient:
+    """
+    Get the HTTP client shared by the bot, creating a default one if none was set.
+
+    Returns:
+        HttpClient: The shared client.
+    """
+    global _shared_client
+
+    if _shared_client is None:
+        _shared_client = HttpClient()
+
+    return _shared_client
+
+
+def set_http_client(client: HttpClient) -> None:
+    """
+    Replace the HTTP client shared by the bot.
+
+    Args:
+        client (HttpClient): The client to share.
+    """
+    global _shared_client
+
+    _shared_client = client
@@ -0,0 +1,140 @@
+"""
+Leader election module for periodic jobs.
+
+When several bot instances or shard workers run side by side, jobs acting on all
+chats (agenda announcements, opinion updates, sentiment decay, backups) must run in
+only one of them. Instances compete for a lease stored in a local SQLite database:
+the holder renews it on every heartbeat, and once it stops renewing, because the
+process died or hung, the lease expires and a standby takes it over.
+"""
+
+# Internal
+import asyncio
+import logging
+import os
+import socket
+import sqlite3
+import time
+import uuid
+
+
+class LeaderElection:
+    """
+    Lease-based leader election backed by SQLite.
+
+    Every instance tries to take or renew the lease each `heartbeat` seconds, in a thread
+    so waiting for the SQLite write lock never blocks the event loop. Taking it
+    only succeeds when it is free, expired or already held by this instance, inside a
+    write transaction, so two instances never hold it at once. An instance that could
+    not renew in time stops considering itself leader when its lease runs out.
+    """
+    def __init__(
+            self,
+            lease_file: str = "database/leader_lease.sqlite",
+            name: str = "periodic_jobs",
+            lease_seconds: float = 10.0,
+            heartbeat: float = 3.0,
+    ):
+        """
+        Initialize the election, try to take the lease and start the heartbeat loop.
+
+        Args:
+            lease_file (str, optional): SQLite file holding the lease, shared by every instance.
+                Defaults to "database/leader_lease.sqlite".
+            name (str, optional): Name of the lease, instances only compete for the same name.
+                Defaults to "periodic_jobs".
+            lease_seconds (float, optional): Seconds a lease lasts without renewal, the longest a
+                dead leader goes unnoticed. Defaults to 10.
+            heartbeat (float, optional): Seconds between two renewals, must be well below
+                `lease_seconds`. Defaults to 3.
+        """
+        self.lease_file = lease_file
+        self.name = name
+        self.lease_seconds = lease_seconds
+        self.heartbeat = heartbeat
+        self.node_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        self._lease_expires = 0.0
+        self._was_leader = False
+
+        directory = os.path.dirname(lease_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS leases (name TEXT PRIMARY KEY, holder TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+        self._try_acquire()
+        asyncio.create_task(self._heartbeat_loop())
+
+    @property
+    def is_leader(self) -> bool:
+        return time.time() < self._lease_expires
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.lease_file, timeout=self.heartbeat, isolation_level=None)
+
+    def _try_acquire(self) -> bool:
+        """
+        Take the lease if it is free, expired or ours, and extend it.
+
+        Returns:
+            bool: Whether this instance holds the lease now.
+        """
+        connection = self._connect()
+
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            now = time.time()
+
+            row = connection.execute("SELECT holder, expires_at FROM leases WHERE name = ?", (self.name,)).fetchone()
+
+            if row is None or row[0] == self.node_id or row[1] < now:
+                expires_at = now + self.lease_seconds
+                connection.execute(
+                    "INSERT OR REPLACE INTO leases (name, holder, expires_at) VALUES (?, ?, ?)",
+                    (self.name, self.node_id, expires_at),
+                )
+                connection.execute("COMMIT")
+                self._lease_expires = expires_at
+            else:
+                connection.execute("ROLLBACK")
+        except sqlite3.Error as exc:
+            logging.warning(f"Leader lease not renewed: {exc}")
+        finally:
+            connection.close()
+
+        leader = self.is_leader
+
+        if leader != self._was_leader:
+            logging.info(f"{self.node_id} {'is now' if leader else 'is no longer'} the {self.name} leader")
+            self._was_leader = leader
+
+        return leader
+
+    def release(self) -> None:
+        """
+        Give up the lease, so a standby takes over without waiting for it to expire.
+        """
+        self._lease_expires = 0.0
+
+        try:
+            with self._connect() as connection:
+                connection.execute("DELETE FROM leases WHERE name = ? AND holder = ?", (self.name, self.node_id))
+        except sqlite3.Error as exc:
+            logging.warning(f"Leader lease not released: {exc}")
+
+    async def _heartbeat_loop(self) -> None:
+        try:
+            while True:
+                await asyncio.sleep(self.heartbeat)
+
+                try:
+                    # Waits up to a heartbeat while another instance holds the write lock
+                    await asyncio.to_thread(self._try_acquire)
+                except Exception as exc:
+                    logging.exception(exc)
+        finally:
+            self.release()
@@ -4,14 +4,21 @@ import logging
 import asyncio
 import random
 import json
-from asyncio import Semaphore
-from typing import Optional, Dict, Any, Tuple
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from typing import Optional, Dict, Any, Tuple, AsyncIterator, List, Union
 
 # External
 import aiohttp
 
 # Project
+from pedro.brain.modules.adaptive_limiter import AdaptiveLimiter
+from pedro.brain.modules.http_client import HttpClient, get_http_client
+from pedro.brain.modules.llm_cache import LLMCache
+from pedro.brain.modules.retry_policy import RetryableStatus, is_retryable_status
 from pedro.data_structures.images import MessageImage, MessageDocument
+from pedro.data_structures.llm_usage import LLMUsage
 
 
 class LLM:
@@ -26,6 +33,9 @@ class LLM:
             self,
             api_key: str,
             default_model: str = "gpt-4.1-nano",
+            http_client: Optional[HttpClient] = None,
+            cache: Optional[LLMCache] = None,
+            concurrency: Optional[Dict[str, Any]] = None,
     ):
         """
         Initialize the LLM client.
@@ -33,18 +43,26 @@ class LLM:
         Args:
             api_key: OpenAI API key for authentication
             default_model: Default model to use if none is specified
+            http_client: HTTP client used for API calls, defaults to the client shared by the bot
+            cache: Cache of responses for calls made with `cache=True`, None disables caching
+            concurrency: Keyword arguments of the AdaptiveLimiter created for each model, e.g. its
+                initial and maximum number of concurrent requests
         """
         self.api_key = api_key
         self.default_model = default_model
+        self.cache = cache
 
-        self.session = aiohttp.ClientSession()
+        self.http = http_client or get_http_client()
 
         self.headers = {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.api_key}"
         }
 
-        self.semaphore: Semaphore = Semaphore(2)
+        self.concurrency = concurrency or {}
+
+        self._limiters: Dict[str, AdaptiveLimiter] = {}
+        self._usage: Dict[str, LLMUsage] = {}
 
     async def generate_text(
             self,
@@ -54,6 +72,8 @@ class LLM:
             image: 'MessageImage' = None,
             document: 'MessageDocument' = None,
             web_search: bool = False,
+            images: Optional[List['MessageImage']] = None,
+            cache: bool = False,
     ) -> str:
         """
         Generate text using OpenAI's API.
@@ -65,6 +85,9 @@ class LLM:
             image: Optional image to include with the prompt for multimodal models
             document: Optional PDF document to include with the prompt for multimodal models
             web_search: Whether to use web search capabilities
+            images: Optional images, e.g. the photos of an album, sent together with the prompt in one request
+            cache: Whether the response only depends on the input and may be answered from the cache.
+                Ignored for web searches and when the client has no cache
 
         Returns:
             The generated text response
@@ -72,47 +95,220 @@ class LLM:
         Note:
             Will retry up to 3 times in case of failure
         """
+        model = model or self.default_model
+        cache_key = None
+
+        if cache and self.cache and not web_search:
+            attachments = ([image] if image else []) + list(images or []) + ([document] if document else [])
+            cache_key = self.cache.key(model, prompt, temperature, [attachment.file for attachment in attachments])
+
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        endpoint, request_data, is_chat_model = self._prepare_request(
+            prompt, model, temperature, image, document, web_search, images
+        )
+
         for i in range(3):
             retry_sleep = int(2.0 + random.random() * 5.0)
 
             try:
-                async with self.semaphore:
-                    model = model or self.default_model
-                    is_chat_model = model != "gpt-3.5-turbo-instruct"
-                    file_id = None
-
-                    if web_search:
-                        endpoint, request_data = self._prepare_web_search_request(
-                            prompt, model, temperature
-                        )
-                    elif is_chat_model:
-                        # PDF upload is not yet supported, so we skip it
-                        # If there's a document, we'll just include a note about it in the prompt
-                        if document:
-                            prompt += f"\n\n[Documento anexado: {document.file_name}. Processamento de PDF ainda não é suportado.]"
-
-                        endpoint, request_data = self._prepare_chat_model_request(
-                            prompt, model, temperature, image, file_id
-                        )
-                    else:
-                        endpoint, request_data = self._prepare_completion_model_request(
-                            prompt, model, temperature
-                        )
-
+                async with self._request_slot(model):
                     response_text = await self._make_api_request(
                         endpoint=endpoint,
                         request_data=request_data,
                         is_chat_model=is_chat_model,
                         web_search=web_search
                     )
+
+                    if cache_key:
+                        self.cache.put(cache_key, response_text)
+
                     return response_text
 
             except Exception as exc:
                 logging.exception(exc)
+
+                if isinstance(exc, RetryableStatus) and exc.retry_after:
+                    retry_sleep = max(retry_sleep, exc.retry_after)
+
                 await asyncio.sleep(retry_sleep)
 
         return "ué"
 
+    def generate_text_stream(
+            self,
+            prompt: str,
+            model: str = "gpt-4.1-nano",
+            temperature: float = 1.0,
+            image: 'MessageImage' = None,
+            document: 'MessageDocument' = None,
+            web_search: bool = False,
+            images: Optional[List['MessageImage']] = None,
+    ) -> 'TextStream':
+        """
+        Generate text using OpenAI's API, yielding it as it is produced.
+
+        Takes the same arguments as `generate_text` and takes a request slot of the model
+        until the stream ends, so streamed and plain requests share the same limit.
+
+        Args:
+            prompt: The input text prompt
+            model: The model to use for generation
+            temperature: Controls randomness in the response (0.0-2.0)
+            image: Optional image to include with the prompt for multimodal models
+            document: Optional PDF document to include with the prompt for multimodal models
+            web_search: Whether to use web search capabilities
+            images: Optional images sent together with the prompt in one request
+
+        Returns:
+            Async iterator of the text deltas of the response. Its `usage` holds the token
+            totals of the request once the iteration is over.
+
+        Note:
+            Will retry up to 3 times while nothing was yielded yet, and yields "ué" if all attempts fail
+        """
+        model = model or self.default_model
+
+        endpoint, request_data, is_chat_model = self._prepare_request(
+            prompt, model, temperature, image, document, web_search, images
+        )
+
+        request_data["stream"] = True
+        if not web_search:
+            request_data["stream_options"] = {"include_usage": True}
+
+        return TextStream(self._stream_with_retries(endpoint, request_data, model, web_search))
+
+    async def _stream_with_retries(
+            self,
+            endpoint: str,
+            request_data: Dict[str, Any],
+            model: str,
+            web_search: bool
+    ) -> AsyncIterator[Union[str, LLMUsage]]:
+        for i in range(3):
+            retry_sleep = int(2.0 + random.random() * 5.0)
+            started = False
+
+            try:
+                async with self._request_slot(model):
+                    async for event in self._stream_api_request(endpoint, request_data, web_search):
+                        if isinstance(event, LLMUsage):
+                            self._record_usage(model, event)
+                        else:
+                            started = True
+
+                        yield event
+
+                return
+
+            except Exception as exc:
+                logging.exception(exc)
+
+                if started:
+                    return
+
+                if isinstance(exc, RetryableStatus) and exc.retry_after:
+                    retry_sleep = max(retry_sleep, exc.retry_after)
+
+                await asyncio.sleep(retry_sleep)
+
+        yield "ué"
+
+    def _prepare_request(
+            self,
+            prompt: str,
+            model: str,
+            temperature: float,
+            image: Optional['MessageImage'] = None,
+            document: Optional['MessageDocument'] = None,
+            web_search: bool = False,
+            images: Optional[List['MessageImage']] = None,
+    ) -> Tuple[str, Dict[str, Any], bool]:
+        """
+        Pick the endpoint of a request and prepare its data.
+
+        Args:
+            prompt: The input text prompt
+            model: The model to use
+            temperature: Controls randomness in the response
+            image: Optional image to include with the prompt for multimodal models
+            document: Optional PDF document to include with the prompt for multimodal models
+            web_search: Whether to use web search capabilities
+            images: Optional images to include with the prompt
+
+        Returns:
+            Tuple containing the endpoint URL, the request data dictionary and whether the model is a chat model
+        """
+        is_chat_model = model != "gpt-3.5-turbo-instruct"
+        file_id = None
+
+        if web_search:
+            endpoint, request_data = self._prepare_web_search_request(prompt, model, temperature)
+        elif is_chat_model:
+            # PDF upload is not yet supported, so we skip it
+            # If there's a document, we'll just include a note about it in the prompt
+            if document:
+                prompt += f"\n\n[Documento anexado: {document.file_name}. Processamento de PDF ainda não é suportado.]"
+
+            endpoint, request_data = self._prepare_chat_model_request(
+                prompt, model, temperature, image, file_id, images
+            )
+        else:
+            endpoint, request_data = self._prepare_completion_model_request(prompt, model, temperature)
+
+        return endpoint, request_data, is_chat_model
+
+    @asynccontextmanager
+    async def _request_slot(self, model: str) -> AsyncIterator[None]:
+        """
+        Hold one of the model's request slots while the block runs, and adapt its limit to how it went.
+
+        Args:
+            model: The model of the request
+        """
+        limiter = self._limiters.get(model)
+        if limiter is None:
+            limiter = self._limiters[model] = AdaptiveLimiter(model, **self.concurrency)
+
+        await limiter.acquire()
+        started = time.monotonic()
+
+        try:
+            yield
+        except (RetryableStatus, asyncio.TimeoutError):
+            limiter.release(overloaded=True)
+            raise
+        except BaseException:
+            limiter.release()
+            raise
+        else:
+            limiter.release(latency=time.monotonic() - started)
+
+    def concurrency_stats(self) -> Dict[str, dict]:
+        """
+        Report the request limit of every model used so far.
+
+        Returns:
+            Per model, the current limit, the requests running and queued, and the requests completed
+            and overloaded with their smoothed latency in milliseconds
+        """
+        return {model: limiter.stats() for model, limiter in sorted(self._limiters.items())}
+
+    def _record_usage(self, model: str, usage: LLMUsage) -> None:
+        self._usage.setdefault(model, LLMUsage()).add(usage)
+
+    def usage_stats(self) -> Dict[str, dict]:
+        """
+        Report the tokens used since the client was created.
+
+        Returns:
+            Per model, the input, output and total tokens of every request, streamed or not.
+        """
+        return {model: asdict(usage) for model, usage in sorted(self._usage.items())}
+
     @staticmethod
     def _prepare_web_search_request(
             prompt: str,
@@ -145,7 +341,8 @@ class LLM:
             model: str, 
             temperature: float, 
             image: Optional['MessageImage'] = None,
-            file_id: Optional[str] = None
+            file_id: Optional[str] = None,
+            images: Optional[List['MessageImage']] = None,
     ) -> Tuple[str, Dict[str, Any]]:
         """
         Prepare request data for chat models.
@@ -156,23 +353,27 @@ class LLM:
             temperature: Controls randomness in the response
             image: Optional image to include with the prompt for multimodal models
             file_id: Optional uploaded Doc ID to include with the prompt for multimodal models
+            images: Optional list of images to include with the prompt, after `image`
 
         Returns:
             Tuple containing the endpoint URL and request data dictionary
         """
         endpoint = "https://api.openai.com/v1/chat/completions"
 
-        if image:
-            # For multimodal models, include the image in the content
-            content = [
-                {"type": "text", "text": prompt},
+        images = ([image] if image else []) + list(images or [])
+
+        if images:
+            # For multimodal models, include the images in the content
+            content = [{"type": "text", "text": prompt}]
+            content.extend(
                 {
-                    "type": "image_url", 
+                    "type": "image_url",
                     "image_url": {
                         "url": image.url
                     }
                 }
-            ]
+                for image in images
+            )
         elif file_id:
             # For multimodal models, include the document in the content
             content = [
@@ -237,14 +438,20 @@ class LLM:
         Returns:
             The processed response text
         """
-        async with self.session.post(
+        async with self.http.session.post(
                 endpoint,
                 headers=self.headers,
                 json=request_data
         ) as openai_request:
+            if is_retryable_status(openai_request.status):
+                raise RetryableStatus(openai_request.status, _retry_after(openai_request))
+
             response = await openai_request.text()
             response_json = json.loads(response)
 
+            if response_json.get("usage"):
+                self._record_usage(request_data["model"], LLMUsage.from_payload(response_json["usage"]))
+
             if web_search:
                 output = response_json["output"]
                 if len(output) > 1:
@@ -258,6 +465,121 @@ class LLM:
 
             return response_text
 
+    async def _stream_api_request(
+            self,
+            endpoint: str,
+            request_data: Dict[str, Any],
+            web_search: bool
+    ) -> AsyncIterator[Union[str, LLMUsage]]:
+        """
+        Make a streaming API request and yield the text deltas of its server-sent events.
+
+        Args:
+            endpoint: API endpoint URL
+            request_data: Request data dictionary, with streaming enabled
+            web_search: Whether this is a responses endpoint request
+
+        Yields:
+            Text deltas of the response, then its token usage when the endpoint reports it
+        """
+        async with self.http.session.post(
+                endpoint,
+                headers=self.headers,
+                json=request_data
+        ) as openai_request:
+            if is_retryable_status(openai_request.status):
+                raise RetryableStatus(openai_request.status, _retry_after(openai_request))
+
+            if openai_request.status != 200:
+                raise RuntimeError(f"OpenAI stream failed: {openai_request.status} {await openai_request.text()}")
+
+            async for data in _iter_sse_data(openai_request.content):
+                if data == "[DONE]":
+                    break
+
+                event = json.loads(data)
+
+                if web_search:
+                    event_type = event.get("type")
+
+                    if event_type == "response.output_text.delta" and event.get("delta"):
+                        yield event["delta"]
+                    elif event_type == "response.completed":
+                        if event.get("response", {}).get("usage"):
+                            yield LLMUsage.from_payload(event["response"]["usage"])
+                        break
+                    elif event_type in ("error", "response.failed"):
+                        raise RuntimeError(f"OpenAI stream failed: {data}")
+                else:
+                    if event.get("error"):
+                        raise RuntimeError(f"OpenAI stream failed: {data}")
+
+                    if event.get("choices"):
+                        choice = event["choices"][0]
+                        # Chat models stream message deltas, completion models plain text
+                        delta = choice.get("delta", {}).get("content") if "delta" in choice else choice.get("text")
+                        if delta:
+                            yield delta
+
+                    if event.get("usage"):
+                        yield LLMUsage.from_payload(event["usage"])
+
+
+def _retry_after(response: aiohttp.ClientResponse) -> Optional[int]:
+    retry_after = response.headers.get("Retry-After", "")
+
+    return int(retry_after) if retry_after.isdigit() else None
+
+
+class TextStream:
+    """
+    Text deltas of a streamed generation, with the token usage of the request once it ended.
+    """
+    def __init__(self, events: AsyncIterator[Union[str, LLMUsage]]):
+        self._events = events
+        self.usage: Optional[LLMUsage] = None
+
+    def __aiter__(self) -> "TextStream":
+        return self
+
+    async def __anext__(self) -> str:
+        while True:
+            event = await self._events.__anext__()
+
+            if isinstance(event, LLMUsage):
+                self.usage = event
+            else:
+                return event
+
+    async def aclose(self) -> None:
+        await self._events.aclose()
+
+
+async def _iter_sse_data(stream: aiohttp.StreamReader) -> AsyncIterator[str]:
+    """
+    Read the data fields of server-sent events.
+
+    Args:
+        stream: Body of an event-stream response
+
+    Yields:
+        The data of each event, multi-line data joined with newlines
+    """
+    data_lines = []
+
+    async for raw_line in stream:
+        line = raw_line.decode("utf-8").rstrip("\r\n")
+
+        if not line:
+            if data_lines:
+                yield "\n".join(data_lines)
+                data_lines = []
+        elif line.startswith("data:"):
+            data_lines.append(line[6:] if line.startswith("data: ") else line[5:])
+
+    if data_lines:
+        yield "\n".join(data_lines)
+
 
 async def upload_pdf(pdf_bytes: bytes, filename="document.pdf", api_key: str="") -> str:
     """
@@ -284,10 +606,13 @@ async def upload_pdf(pdf_bytes: bytes, filename="document.pdf", api_key: str="")
         content_type="application/pdf"
     )
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post("https://api.openai.com/v1/files", headers=headers, data=form) as request:
-            data = await request.json()
-            if request.status != 200:
-                raise RuntimeError(f"Failed upload: {data}")
+    async with get_http_client().session.post(
+            "https://api.openai.com/v1/files",
+            headers=headers,
+            data=form
+    ) as request:
+        data = await request.json()
+        if request.status != 200:
+            raise RuntimeError(f"Failed upload: {data}")
 
-            return data["id"]
+        return data["id"]
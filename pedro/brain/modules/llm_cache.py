@@ -0,0 +1,160 @@
+"""
+LLM cache module for deterministic generation calls.
+
+Some LLM calls are pure functions of their input: classifying the tone of a
+message, checking whether an image is political or captioning it. When the same
+text is asked again or the same meme is forwarded to several chats, this module
+answers from memory instead of making another API round-trip. Entries are keyed by
+the model, a hash of the prompt, a hash of the attached file contents and the
+temperature class, expire after a TTL and are evicted least recently used first.
+"""
+
+# Internal
+import hashlib
+import time
+import typing as T
+from collections import OrderedDict
+
+# Project
+from pedro.data_structures.downloaded_file import DownloadedFile
+
+_HASH_CHUNK = 64 * 1024
+
+
+def temperature_class(temperature: float) -> str:
+    """
+    Group temperatures that produce interchangeable answers.
+
+    Args:
+        temperature (float): The sampling temperature of the call.
+
+    Returns:
+        str: "greedy" up to 0.3, "balanced" up to 1.0 and "creative" above.
+    """
+    if temperature <= 0.3:
+        return "greedy"
+    if temperature <= 1.0:
+        return "balanced"
+    return "creative"
+
+
+def file_digest(file: DownloadedFile) -> str:
+    """
+    Hash the contents of a downloaded file without loading it whole in memory.
+
+    Args:
+        file (DownloadedFile): The file to hash.
+
+    Returns:
+        str: Hex SHA-256 digest of the contents.
+    """
+    digest = hashlib.sha256()
+    handle = file.open()
+
+    for chunk in iter(lambda: handle.read(_HASH_CHUNK), b""):
+        digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+class LLMCache:
+    """
+    In-memory LRU cache of LLM responses with a TTL.
+
+    Holds at most `max_entries` responses; reading an entry moves it to the end and
+    storing past the limit evicts the least recently used one. Entries older than
+    `ttl` seconds are dropped when read. Hits, misses and evictions are counted and
+    reported by `stats`.
+    """
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600.0):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int, optional): Responses kept at most. Defaults to 1024.
+            ttl (float, optional): Seconds a response stays valid. Defaults to 3600.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._entries: T.OrderedDict[str, T.Tuple[float, str]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def key(
+            model: str,
+            prompt: str,
+            temperature: float,
+            files: T.Iterable[DownloadedFile] = (),
+    ) -> str:
+        """
+        Build the cache key of a call.
+
+        Args:
+            model (str): The model of the call.
+            prompt (str): The prompt of the call.
+            temperature (float): The sampling temperature, only its class is part of the key.
+            files (Iterable[DownloadedFile], optional): Images or documents attached, in order. Defaults to ().
+
+        Returns:
+            str: The key, identical for calls with the same model, prompt, attachments and temperature class.
+        """
+        digest = hashlib.sha256(prompt.encode("utf-8"))
+
+        for file in files:
+            digest.update(file_digest(file).encode("ascii"))
+
+        return f"{model}:{temperature_class(temperature)}:{digest.hexdigest()}"
+
+    def get(self, key: str) -> T.Optional[str]:
+        """
+        Get a cached response.
+
+        Args:
+            key (str): Key built with `key`.
+
+        Returns:
+            Optional[str]: The response, or None when missing or expired.
+        """
+        entry = self._entries.get(key)
+
+        if entry is not None and time.monotonic() - entry[0] > self.ttl:
+            del self._entries[key]
+            entry = None
+
+        if entry is None:
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+
+        return entry[1]
+
+    def put(self, key: str, response: str) -> None:
+        """
+        Store a response, evicting the least recently used ones past `max_entries`.
+
+        Args:
+            key (str): Key built with `key`.
+            response (str): The response to store.
+        """
+        self._entries[key] = (time.monotonic(), response)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self._hits + self._misses
+
+        return {
+            "entries": len(self._entries),
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "hit_rate": round(self._hits / lookups, 3) if lookups else None,
+        }
@@ -0,0 +1,230 @@
+"""
+Media registry module for reusing uploaded Telegram files.
+
+Every file uploaded to Telegram gets a `file_id` that the same bot can send again
+without uploading the content. This module remembers those ids by the SHA-256 of
+the content, and remembers the hash of local files by their size and modification
+time, so sending the same media twice reads and uploads it only once. Both maps
+keep only the most recently used entries, and changes reach the disk in batches
+written off the event loop.
+"""
+
+# Internal
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import typing as T
+from collections import OrderedDict
+
+# Project
+from pedro.utils.file_lock import file_lock
+
+
+class MediaRegistry:
+    """
+    Persistent map from media content to the Telegram file_id it was uploaded as.
+
+    Each map holds at most `max_entries`, evicting the least recently used. Changes
+    are saved `save_delay` seconds after the first unsaved one, all in one write. Shard
+    workers share the registry file, so each write merges this instance's entries
+    into what is on disk under a file lock instead of replacing it.
+    """
+    def __init__(
+            self,
+            registry_file: T.Optional[str] = "database/media_registry.json",
+            max_entries: int = 1000,
+            save_delay: float = 5.0,
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            registry_file (Optional[str], optional): File the registry is persisted to, None keeps it in memory
+                only. Defaults to "database/media_registry.json".
+            max_entries (int, optional): Entries kept per map. Defaults to 1000.
+            save_delay (float, optional): Seconds changes are collected before they are written. Defaults to 5.
+        """
+        self._registry_file = registry_file
+        self.max_entries = max_entries
+        self.save_delay = save_delay
+        self._file_ids: T.OrderedDict[str, str] = OrderedDict()
+        self._paths: T.OrderedDict[str, T.Dict[str, T.Any]] = OrderedDict()
+        self._save_timer: T.Optional[asyncio.TimerHandle] = None
+        self._save_tasks: T.Set[asyncio.Task] = set()
+        self._forgotten: T.Set[str] = set()
+
+        self._load()
+
+    @staticmethod
+    def digest(content: bytes) -> str:
+        return hashlib.sha256(content).hexdigest()
+
+    def digest_path(self, path: str) -> str:
+        """
+        Hash a local file, reading it only when it changed since it was last hashed.
+
+        Args:
+            path (str): Path of the file.
+
+        Returns:
+            str: The SHA-256 hex digest of the file content.
+        """
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        known = self._paths.get(key)
+
+        if known and known["size"] == stat.st_size and known["mtime"] == stat.st_mtime:
+            self._paths.move_to_end(key)
+            return known["sha256"]
+
+        sha256 = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                sha256.update(chunk)
+
+        self._paths[key] = {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": sha256.hexdigest()}
+        self._paths.move_to_end(key)
+        self._evict(self._paths)
+        self._schedule_save()
+
+        return self._paths[key]["sha256"]
+
+    def get(self, kind: str, digest: str) -> T.Optional[str]:
+        """
+        Get the file_id of already uploaded media.
+
+        Args:
+            kind (str): Media kind, e.g. "photo", "video", "document" or "voice".
+            digest (str): SHA-256 hex digest of the content.
+
+        Returns:
+            Optional[str]: The file_id, or None if the content was never uploaded as this kind.
+        """
+        key = f"{kind}:{digest}"
+        file_id = self._file_ids.get(key)
+
+        if file_id:
+            self._file_ids.move_to_end(key)
+
+        return file_id
+
+    def set(self, kind: str, digest: str, file_id: str) -> None:
+        key = f"{kind}:{digest}"
+        self._file_ids[key] = file_id
+        self._file_ids.move_to_end(key)
+        self._forgotten.discard(key)
+        self._evict(self._file_ids)
+        self._schedule_save()
+
+    def forget(self, kind: str, digest: str) -> None:
+        if self._file_ids.pop(f"{kind}:{digest}", None):
+            # Dropped from the file on the next save too, not merged back in from another shard
+            self._forgotten.add(f"{kind}:{digest}")
+            self._schedule_save()
+
+    def flush(self) -> None:
+        """
+        Write pending changes now instead of waiting for the scheduled save.
+        """
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
+
+        self._write(*self._snapshot())
+
+    def _evict(self, entries: T.OrderedDict) -> None:
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def _schedule_save(self) -> None:
+        if not self._registry_file or self._save_timer is not None:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write(*self._snapshot())
+            return
+
+        self._save_timer = loop.call_later(self.save_delay, self._save)
+
+    def _load(self) -> None:
+        if not self._registry_file or not os.path.exists(self._registry_file):
+            return
+
+        try:
+            with open(self._registry_file, encoding="utf-8") as registry_file:
+                data = json.load(registry_file)
+
+            self._file_ids = OrderedDict(data.get("file_ids", {}))
+            self._paths = OrderedDict(data.get("paths", {}))
+            self._evict(self._file_ids)
+            self._evict(self._paths)
+        except Exception as exc:
+            logging.exception(exc)
+
+    def _save(self) -> None:
+        self._save_timer = None
+        # Copied on the loop so the snapshot is consistent, merged and written in a thread
+        task = asyncio.create_task(asyncio.to_thread(self._write, *self._snapshot()))
+
+        # The loop only keeps weak references to tasks, this one must outlive the call
+        self._save_tasks.add(task)
+        task.add_done_callback(self._save_tasks.discard)
+
+    def _snapshot(self) -> T.Tuple[T.Dict[str, str], T.Dict[str, T.Dict[str, T.Any]], T.Set[str]]:
+        forgotten, self._forgotten = self._forgotten, set()
+
+        return dict(self._file_ids), dict(self._paths), forgotten
+
+    def _write(
+            self,
+            file_ids: T.Dict[str, str],
+            paths: T.Dict[str, T.Dict[str, T.Any]],
+            forgotten: T.Set[str],
+    ) -> None:
+        """
+        Merge entries into the registry file, keeping those other processes wrote meanwhile.
+
+        Args:
+            file_ids (Dict[str, str]): This instance's file_ids, least recently used first.
+            paths (Dict[str, Dict[str, Any]]): This instance's path hashes, least recently used first.
+            forgotten (Set[str]): file_ids dropped since the last save, removed from the file too.
+        """
+        if not self._registry_file:
+            return
+
+        try:
+            with file_lock(f"{self._registry_file}.lock"):
+                stored = {}
+
+                if os.path.exists(self._registry_file):
+                    try:
+                        with open(self._registry_file, encoding="utf-8") as registry_file:
+                            stored = json.load(registry_file)
+                    except ValueError as exc:
+                        logging.warning(f"Media registry unreadable, rewriting it: {exc}")
+
+                # Ours are the most recent, so they come last and survive the eviction
+                merged_file_ids = OrderedDict(
+                    (key, value) for key, value in stored.get("file_ids", {}).items()
+                    if key not in forgotten and key not in file_ids
+                )
+                merged_file_ids.update(file_ids)
+                merged_paths = OrderedDict(
+                    (key, value) for key, value in stored.get("paths", {}).items() if key not in paths
+                )
+                merged_paths.update(paths)
+
+                self._evict(merged_file_ids)
+                self._evict(merged_paths)
+
+                tmp_file = f"{self._registry_file}.{os.getpid()}.tmp"
+                with open(tmp_file, "w", encoding="utf-8") as registry_file:
+                    json.dump({"file_ids": merged_file_ids, "paths": merged_paths}, registry_file)
+
+                os.replace(tmp_file, self._registry_file)
+        except Exception as exc:
+            logging.exception(exc)
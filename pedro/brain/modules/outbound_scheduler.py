@@ -0,0 +1,292 @@
+"""
+Outbound scheduler module for rate limiting requests sent to the Telegram Bot API.
+
+Telegram limits bots to about 30 messages per second overall, one message per second
+in a private chat and 20 messages per minute in a group, answering HTTP 429 with a
+`retry_after` when those limits are exceeded. This module queues outbound calls and
+only releases them when both the global and the chat token buckets allow it, serving
+user-facing replies before reactions and before background traffic like logs and backups.
+"""
+
+# Internal
+import asyncio
+import logging
+import time
+import typing as T
+from collections import deque
+from enum import IntEnum
+
+# Project
+from pedro.data_structures.api_response import ApiResponse
+from pedro.data_structures.token_bucket import TokenBucket
+
+
+class Priority(IntEnum):
+    """
+    Outbound traffic classes, served in increasing order.
+    """
+    REPLY = 0
+    REACTION = 1
+    BACKGROUND = 2
+
+
+class _OutboundJob:
+    def __init__(
+            self,
+            chat_id: T.Optional[int],
+            request: T.Callable[[], T.Awaitable[ApiResponse]],
+            limited: bool,
+            priority: Priority,
+            future: asyncio.Future,
+    ):
+        self.chat_id = chat_id
+        self.request = request
+        self.limited = limited
+        self.priority = priority
+        self.future = future
+        self.created_at = time.monotonic()
+        self.rate_limited_attempts = 0
+
+
+class OutboundScheduler:
+    """
+    Queue of outbound Telegram API calls, released according to Telegram's rate limits.
+
+    Calls to the same chat are sent one at a time and in submission order, calls to
+    different chats run concurrently up to `concurrency`. A 429 answer pauses the chat
+    (or every chat, when the call is not bound to one) for the `retry_after` reported
+    by Telegram and the call is retried without being resolved.
+
+    Ready calls are taken by priority. Background calls never take the last free
+    concurrency slot, so a reply does not wait behind a log upload, and they are dropped
+    when they pile up or wait too long.
+    """
+    def __init__(
+            self,
+            concurrency: int = 3,
+            global_rate: float = 30.0,
+            private_chat_rate: float = 1.0,
+            group_chat_rate: float = 20 / 60,
+            chat_burst: int = 3,
+            max_rate_limited_attempts: int = 5,
+            max_background_jobs: int = 100,
+            background_max_delay: float = 120.0,
+    ):
+        """
+        Initialize the scheduler and start its dispatch loop.
+
+        Args:
+            concurrency (int, optional): Maximum number of requests in flight. Defaults to 3.
+            global_rate (float, optional): Rate-limited requests per second for the whole bot. Defaults to 30.
+            private_chat_rate (float, optional): Rate-limited requests per second for a private chat.
+                Defaults to 1.
+            group_chat_rate (float, optional): Rate-limited requests per second for a group. Defaults to 20/60.
+            chat_burst (int, optional): Requests a chat may send back to back before its rate applies.
+                Defaults to 3.
+            max_rate_limited_attempts (int, optional): How many 429 answers a call may get before its
+                last response is returned to the caller. Defaults to 5.
+            max_background_jobs (int, optional): Queued background calls kept before the oldest is dropped.
+                Defaults to 100.
+            background_max_delay (float, optional): Seconds a background call may wait before being dropped.
+                Defaults to 120.
+        """
+        self._slots = asyncio.Semaphore(concurrency)
+        self._background_slots = max(1, concurrency - 1)
+        self._running_background = 0
+        self._global_bucket = TokenBucket(rate=global_rate, capacity=global_rate)
+        self._private_chat_rate = private_chat_rate
+        self._group_chat_rate = group_chat_rate
+        self._chat_burst = chat_burst
+        self._max_rate_limited_attempts = max_rate_limited_attempts
+        self._max_background_jobs = max_background_jobs
+        self._background_max_delay = background_max_delay
+
+        self._chat_buckets: T.Dict[int, TokenBucket] = {}
+        self._busy_chats: T.Set[int] = set()
+        self._lanes: T.Dict[Priority, T.Deque[_OutboundJob]] = {priority: deque() for priority in Priority}
+        self._wakeup = asyncio.Event()
+
+        asyncio.create_task(self._dispatch_loop())
+
+    def submit(
+            self,
+            chat_id: T.Optional[int],
+            request: T.Callable[[], T.Awaitable[ApiResponse]],
+            limited: bool = True,
+            priority: Priority = Priority.REPLY,
+    ) -> asyncio.Future:
+        """
+        Queue an API call.
+
+        Args:
+            chat_id (Optional[int]): Chat the call is addressed to, None for calls not bound to a chat.
+            request (Callable[[], Awaitable[ApiResponse]]): Factory performing a single HTTP attempt.
+                Called again for every retry, so it must build a fresh request body each time.
+            limited (bool, optional): Whether the call counts against the message rate limits. Chat actions,
+                reactions and deletions only go through the queue. Defaults to True.
+            priority (Priority, optional): Traffic class of the call. Defaults to Priority.REPLY.
+
+        Returns:
+            asyncio.Future: Resolves with the final ApiResponse once the call was delivered (or with a
+                dropped response for discarded background calls), or with the exception raised by the request.
+        """
+        future = asyncio.get_running_loop().create_future()
+        lane = self._lanes[priority]
+
+        lane.append(
+            _OutboundJob(chat_id=chat_id, request=request, limited=limited, priority=priority, future=future)
+        )
+
+        if priority == Priority.BACKGROUND and len(lane) > self._max_background_jobs:
+            self._drop(lane.popleft())
+
+        self._wakeup.set()
+
+        return future
+
+    @staticmethod
+    def _drop(job: _OutboundJob) -> None:
+        logging.warning(f"Dropping background Telegram call for chat {job.chat_id}")
+
+        if not job.future.done():
+            job.future.set_result(ApiResponse.dropped())
+
+    def _expire_background_jobs(self) -> None:
+        lane = self._lanes[Priority.BACKGROUND]
+        deadline = time.monotonic() - self._background_max_delay
+
+        while lane and lane[0].created_at < deadline:
+            self._drop(lane.popleft())
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+
+        if bucket is None:
+            if len(self._chat_buckets) > 1000:
+                self._chat_buckets = {
+                    key: value for key, value in self._chat_buckets.items() if not value.is_full
+                }
+
+            rate = self._private_chat_rate if chat_id > 0 else self._group_chat_rate
+            bucket = self._chat_buckets[chat_id] = TokenBucket(rate=rate, capacity=self._chat_burst)
+
+        return bucket
+
+    def _pop_ready_job(self) -> T.Tuple[T.Optional[_OutboundJob], T.Optional[float]]:
+        """
+        Take the highest priority, oldest job allowed to run now.
+
+        Returns:
+            Tuple[Optional[_OutboundJob], Optional[float]]: The job, or None and how long to wait before
+                something may become ready (None when only a running request can unblock the queue).
+        """
+        self._expire_background_jobs()
+
+        skipped_chats = set()
+        min_wait = None
+
+        for priority, lane in self._lanes.items():
+            if priority == Priority.BACKGROUND and self._running_background >= self._background_slots:
+                break
+
+            for index, job in enumerate(lane):
+                buckets = [self._global_bucket]
+
+                if job.chat_id is not None:
+                    if job.chat_id in skipped_chats or job.chat_id in self._busy_chats:
+                        skipped_chats.add(job.chat_id)
+                        continue
+
+                    buckets.append(self._chat_bucket(job.chat_id))
+
+                wait = max(
+                    bucket.time_until_available() if job.limited else bucket.blocked_for()
+                    for bucket in buckets
+                )
+
+                if wait > 0:
+                    if job.chat_id is not None:
+                        skipped_chats.add(job.chat_id)
+                    min_wait = wait if min_wait is None else min(min_wait, wait)
+                    continue
+
+                del lane[index]
+
+                if job.limited:
+                    self._global_bucket.consume()
+                    if job.chat_id is not None:
+                        self._chat_bucket(job.chat_id).consume()
+
+                if job.chat_id is not None:
+                    self._busy_chats.add(job.chat_id)
+
+                if job.priority == Priority.BACKGROUND:
+                    self._running_background += 1
+
+                return job, None
+
+        if self._lanes[Priority.BACKGROUND]:
+            expires_in = self._lanes[Priority.BACKGROUND][0].created_at + self._background_max_delay - time.monotonic()
+            min_wait = expires_in if min_wait is None else min(min_wait, expires_in)
+
+        return None, None if min_wait is None else max(min_wait, 0.0)
+
+    async def _dispatch_loop(self) -> None:
+        """
+        Release queued jobs as concurrency slots and rate limits allow.
+        """
+        while True:
+            try:
+                await self._slots.acquire()
+
+                job = None
+                while job is None:
+                    job, wait = self._pop_ready_job()
+
+                    if job is None:
+                        self._wakeup.clear()
+                        try:
+                            await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                        except asyncio.TimeoutError:
+                            pass
+
+                asyncio.create_task(self._run(job))
+            except Exception as exc:
+                logging.exception(exc)
+                self._slots.release()
+                await asyncio.sleep(1)
+
+    async def _run(self, job: _OutboundJob) -> None:
+        """
+        Perform one attempt of a job, requeueing it when Telegram answers 429.
+
+        Args:
+            job (_OutboundJob): The job to run.
+        """
+        try:
+            response = await job.request()
+
+            if response.status == 429 and job.rate_limited_attempts < self._max_rate_limited_attempts:
+                job.rate_limited_attempts += 1
+                retry_after = response.retry_after or 1
+
+                logging.warning(f"Telegram rate limit hit for chat {job.chat_id}, retrying in {retry_after}s")
+
+                if job.chat_id is not None:
+                    self._chat_bucket(job.chat_id).block(retry_after)
+                else:
+                    self._global_bucket.block(retry_after)
+
+                self._lanes[job.priority].appendleft(job)
+            elif not job.future.done():
+                job.future.set_result(response)
+        except Exception as exc:
+            if not job.future.done():
+                job.future.set_exception(exc)
+        finally:
+            if job.priority == Priority.BACKGROUND:
+                self._running_background -= 1
+
+            self._busy_chats.discard(job.chat_id)
+            self._slots.release()
+            self._wakeup.set()
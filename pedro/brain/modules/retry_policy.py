@@ -0,0 +1,196 @@
+"""
+Retry policy module for Telegram Bot API calls.
+
+Every call to Telegram goes through one RetryPolicy, so transient failures are
+retried the same way everywhere: server errors, rate limit answers, timeouts and
+dropped connections are attempted again with exponential backoff and full jitter,
+until the call succeeds, runs out of attempts or would pass its deadline. Client
+errors like a rejected parse mode are returned right away for the caller to handle.
+"""
+
+# Internal
+import asyncio
+import logging
+import random
+import time
+import typing as T
+
+# External
+import aiohttp
+
+# Project
+from pedro.data_structures.api_response import ApiResponse
+
+RETRYABLE_EXCEPTIONS = (asyncio.TimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)
+
+
+class RetryableStatus(Exception):
+    """
+    Raised by attempts that do not answer with an ApiResponse, e.g. file downloads,
+    to report an HTTP status worth retrying.
+    """
+    def __init__(self, status: int, retry_after: T.Optional[int] = None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+def is_retryable_status(status: int) -> bool:
+    return status == 429 or status >= 500
+
+
+class _CallStats:
+    def __init__(self):
+        self.calls = 0
+        self.attempts = 0
+        self.failures = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "attempts": self.attempts,
+            "retries": self.attempts - self.calls,
+            "failures": self.failures,
+            "mean_latency_ms": round(self.total_latency / self.calls * 1000, 1) if self.calls else None,
+            "max_latency_ms": round(self.max_latency * 1000, 1),
+        }
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter, bounded by attempts and by a deadline.
+
+    The delay before retry n is drawn uniformly from [0, min(max_delay, base_delay * 2^n)],
+    or is the `retry_after` reported by Telegram when that is longer. A retry that would
+    start after the call's deadline is not made. Attempts and latency are recorded per
+    call name and reported by `stats`.
+    """
+    def __init__(
+            self,
+            max_attempts: int = 5,
+            base_delay: float = 0.5,
+            max_delay: float = 30.0,
+            deadline: float = 60.0,
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            max_attempts (int, optional): Attempts made at most, including the first one. Defaults to 5.
+            base_delay (float, optional): Upper bound in seconds of the delay before the first retry. Defaults to 0.5.
+            max_delay (float, optional): Upper bound in seconds of any delay. Defaults to 30.
+            deadline (float, optional): Seconds after the first attempt past which no retry starts. Defaults to 60.
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+
+        self._stats: T.Dict[str, _CallStats] = {}
+
+    def backoff(self, retry: int) -> float:
+        """
+        Draw the delay before a retry.
+
+        Args:
+            retry (int): How many attempts already failed, starting at 1.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (retry - 1)))
+
+    async def run(
+            self,
+            name: str,
+            attempt: T.Callable[[], T.Awaitable[T.Any]],
+            max_attempts: T.Optional[int] = None,
+            deadline: T.Optional[float] = None,
+            retry_rate_limited: bool = True,
+    ) -> T.Any:
+        """
+        Run a call, retrying it while it fails in a retryable way.
+
+        Args:
+            name (str): Name the call is reported under, e.g. the Bot API method.
+            attempt (Callable[[], Awaitable[Any]]): Performs one attempt. An ApiResponse result with a
+                retryable status, a RetryableStatus or a connection or timeout error is retried.
+            max_attempts (Optional[int], optional): Overrides the policy's maximum attempts. Defaults to None.
+            deadline (Optional[float], optional): Overrides the policy's deadline in seconds. Defaults to None.
+            retry_rate_limited (bool, optional): Whether 429 answers are retried. Disabled for attempts
+                going through the outbound scheduler, which already retries them honoring `retry_after`,
+                so a 429 it gives up on is not retried again here. Defaults to True.
+
+        Returns:
+            Any: The result of the last attempt. The exception of the last attempt is raised instead
+                when it failed with one.
+        """
+        max_attempts = max(1, max_attempts or self.max_attempts)
+        started = time.monotonic()
+        expires = started + (self.deadline if deadline is None else deadline)
+        stats = self._stats.setdefault(name, _CallStats())
+        stats.calls += 1
+        attempts = 0
+
+        try:
+            while True:
+                attempts += 1
+                stats.attempts += 1
+                error = None
+                retry_after = None
+
+                try:
+                    result = await attempt()
+                except RETRYABLE_EXCEPTIONS as exc:
+                    error = exc
+                    reason = repr(exc)
+                except RetryableStatus as exc:
+                    error = exc
+                    reason = f"status {exc.status}"
+                    retry_after = exc.retry_after
+                else:
+                    if (
+                            not isinstance(result, ApiResponse)
+                            or not is_retryable_status(result.status)
+                            or (result.status == 429 and not retry_rate_limited)
+                    ):
+                        if isinstance(result, ApiResponse) and not result.ok:
+                            stats.failures += 1
+                        return result
+
+                    reason = f"status {result.status}"
+                    retry_after = result.retry_after
+
+                delay = max(self.backoff(attempts), retry_after or 0)
+
+                if attempts >= max_attempts or time.monotonic() + delay > expires:
+                    stats.failures += 1
+                    logging.warning(
+                        f"{name} failed after {attempts} attempts in {time.monotonic() - started:.1f}s: {reason}"
+                    )
+
+                    if error:
+                        raise error
+                    return result
+
+                logging.info(f"{name} attempt {attempts} failed ({reason}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+        finally:
+            latency = time.monotonic() - started
+            stats.total_latency += latency
+            stats.max_latency = max(stats.max_latency, latency)
+
+            if attempts > 1:
+                logging.info(f"{name} took {attempts} attempts and {latency:.1f}s")
+
+    def stats(self) -> T.Dict[str, dict]:
+        """
+        Report attempts and latency of every call made through the policy.
+
+        Returns:
+            Dict[str, dict]: Per call name, the number of calls, attempts, retries and failures
+                and the mean and maximum latency in milliseconds, retries included.
+        """
+        return {name: stats.as_dict() for name, stats in sorted(self._stats.items())}
@@ -9,7 +9,9 @@ import schedule
 
 # Project
 from pedro.brain.modules.user_data_manager import UserDataManager
+from pedro.brain.modules.leader_election import LeaderElection
 from pedro.brain.modules.datetime_manager import DatetimeManager
+from pedro.brain.modules.outbound_scheduler import Priority
 from pedro.brain.modules.telegram import Telegram
 from pedro.data_structures.daily_flags import DailyFlags
 
@@ -32,13 +34,30 @@ def call_async_function(func):
 
 
 class Scheduler:
-    def __init__(self, user_opinions: UserDataManager, telegram: Telegram, daily_flags: DailyFlags | None = None):
+    def __init__(
+            self,
+            user_opinions: UserDataManager,
+            telegram: Telegram,
+            daily_flags: DailyFlags | None = None,
+            leader: LeaderElection | None = None,
+    ):
         self.user_opinions = user_opinions
         self.datetime_manager = DatetimeManager()
         self.telegram = telegram
         self.daily_flags = daily_flags
+        self.leader = leader
         self.running = False
 
+    def _leader_only(self, job):
+        async def run_if_leader():
+            if self.leader and not self.leader.is_leader:
+                logging.info(f"Skipping scheduled task {job.__name__}, not the leader")
+                return
+
+            await job()
+
+        return run_if_leader
+
     async def _run_process_historical_messages(self):
         logging.info(f"Running scheduled task: process_historical_messages at {self.datetime_manager.now()}")
         await self.user_opinions.get_opinion_by_historical_messages()
@@ -52,7 +71,8 @@ class Scheduler:
             document=json.dumps(db_content, indent=4).encode("utf-8"),
             chat_id=8375482,
             caption="Daily DB Backup",
-            file_name="database.json"
+            file_name="database.json",
+            priority=Priority.BACKGROUND
         )
 
     async def _reset_daily_flags(self):
@@ -75,6 +95,12 @@ class Scheduler:
             await asyncio.sleep(1)
 
     def start(self):
+        """
+        Schedule the periodic jobs and start running them.
+
+        Jobs acting on shared data, the opinion updates and the database backup, only run
+        while this instance is the leader. Jobs resetting this process' daily flags always run.
+        """
         if self.running:
             logging.warning("Scheduler is already running")
             return
@@ -82,19 +108,19 @@ class Scheduler:
         schedule.every().day.at(
             _convert_hour_if_needed("15:00")).do(
                 call_async_function,
-                self._run_process_historical_messages
+                self._leader_only(self._run_process_historical_messages)
         )
 
         schedule.every().day.at(
             _convert_hour_if_needed("22:00")).do(
                 call_async_function,
-                self._run_process_historical_messages
+                self._leader_only(self._run_process_historical_messages)
         )
 
         schedule.every().day.at(
             _convert_hour_if_needed("21:00")).do(
                 call_async_function,
-                self._run_database_backup
+                self._leader_only(self._run_database_backup)
         )
 
         schedule.every().day.at(
@@ -0,0 +1,297 @@
+"""
+Shard supervisor module for running the bot on several cores.
+
+A single process handles every chat in one event loop, so CPU-bound work like
+update parsing, HTML extraction and TinyDB (de)serialization is limited to one
+core. The supervisor runs N worker processes, each a regular TelegramBot owning
+the chats whose id falls in its partition, and is the only process talking to
+Telegram for updates: it polls (or receives the webhook), and forwards every
+update to its worker over a local HTTP connection, in order per worker.
+"""
+
+# Internal
+import asyncio
+import json
+import logging
+import multiprocessing
+import secrets
+import typing as T
+from collections import deque
+
+# Project
+from pedro.data_structures.api_response import ApiResponse
+from pedro.data_structures.bot_config import BotConfig
+from pedro.data_structures.shard_config import ShardConfig
+from pedro.brain.modules.http_client import HttpClient
+from pedro.brain.modules.retry_policy import RetryPolicy, is_retryable_status
+from pedro.brain.modules.telegram import Telegram
+from pedro.brain.modules.webhook import WebhookServer
+from pedro.utils.update_decoder import encode_update
+
+
+def shard_for(chat_id: int, shards: int) -> int:
+    """
+    Get the shard owning a chat.
+
+    Args:
+        chat_id (int): The chat id, negative for groups.
+        shards (int): Number of shards.
+
+    Returns:
+        int: The shard index, stable across restarts.
+    """
+    return chat_id % shards
+
+
+def run_shard_worker(bot_config_file: str, secrets_file: str, debug_mode: bool, shard: dict) -> None:
+    """
+    Entry point of a worker process.
+
+    Args:
+        bot_config_file (str): Path to the bot configuration file.
+        secrets_file (str): Path to the secrets file.
+        debug_mode (bool): Enable debug mode.
+        shard (dict): Keyword arguments of the worker's ShardConfig.
+    """
+    from pedro.main import TelegramBot
+
+    logging.basicConfig(level=logging.INFO, format=f"[shard {shard['index']}] %(levelname)s:%(name)s:%(message)s")
+
+    bot = TelegramBot(
+        bot_config_file=bot_config_file,
+        secrets_file=secrets_file,
+        debug_mode=debug_mode,
+        shard=ShardConfig(**shard),
+    )
+
+    try:
+        asyncio.run(bot.run())
+    except KeyboardInterrupt:
+        pass
+
+
+class ShardSupervisor:
+    """
+    Ingress process routing Telegram updates to chat-sharded worker processes.
+
+    Updates are partitioned by chat id with `shard_for`, so every chat is always handled
+    by the same worker and keeps its order. Each worker has a bounded queue and one
+    sender. Routing never waits for a worker: updates for a worker whose queue is full
+    spill into its overflow, in order, and move to the queue as it drains, so a dead
+    worker holds back no other. Workers that exit are restarted,
+    and updates sent while a worker is down are retried until it is back.
+
+    An update is acknowledged once its worker accepted it, which journals it on the
+    worker's side, so neither a supervisor nor a worker crash loses it. An update no
+    worker accepted stays unacknowledged and is forwarded again after a restart.
+    """
+    def __init__(
+            self,
+            bot_config_file: str,
+            secrets_file: str,
+            shards: int,
+            base_port: int = 8600,
+            debug_mode: bool = False,
+            queue_size: int = 500,
+            restart_delay: float = 5.0,
+    ):
+        """
+        Initialize the supervisor.
+
+        Args:
+            bot_config_file (str): Path to the bot configuration file, shared with the workers.
+            secrets_file (str): Path to the secrets file, shared with the workers.
+            shards (int): Number of worker processes.
+            base_port (int, optional): Local port of the first worker, the others use the next ones.
+                Defaults to 8600.
+            debug_mode (bool, optional): Enable debug mode in the workers. Defaults to False.
+            queue_size (int, optional): Updates queued per worker before they spill into its overflow.
+                Defaults to 500.
+            restart_delay (float, optional): Seconds before a worker that exited is started again.
+                Defaults to 5.
+        """
+        self.bot_config_file = bot_config_file
+        self.secrets_file = secrets_file
+        self.shards = shards
+        self.debug_mode = debug_mode
+        self.restart_delay = restart_delay
+
+        self._secret = secrets.token_hex(16)
+        self._shard_configs = [
+            ShardConfig(index=index, count=shards, port=base_port + index, secret=self._secret)
+            for index in range(shards)
+        ]
+        self._queues: T.List[asyncio.Queue] = []
+        self._overflows: T.List[T.Deque] = [deque() for _ in range(shards)]
+        self._queue_size = queue_size
+        self._processes: T.List[T.Optional[multiprocessing.Process]] = [None] * shards
+        self._restarting: T.Set[int] = set()
+        self._context = multiprocessing.get_context("spawn")
+        self._forward_policy = RetryPolicy(max_attempts=100, base_delay=0.2, max_delay=5.0, deadline=300.0)
+
+        self.config: T.Optional[BotConfig] = None
+        self.http_client: T.Optional[HttpClient] = None
+        self.telegram: T.Optional[Telegram] = None
+        self.webhook: T.Optional[WebhookServer] = None
+
+    def _load_config(self) -> BotConfig:
+        with open(self.bot_config_file, encoding='utf8') as config_file:
+            bot_config = json.loads(config_file.read())
+
+        with open(self.secrets_file, encoding='utf8') as secret_file:
+            bot_config.update(json.loads(secret_file.read()))
+
+        return BotConfig(**bot_config)
+
+    def _start_worker(self, index: int) -> None:
+        shard = self._shard_configs[index]
+
+        process = self._context.Process(
+            target=run_shard_worker,
+            args=(self.bot_config_file, self.secrets_file, self.debug_mode, {
+                "index": shard.index,
+                "count": shard.count,
+                "port": shard.port,
+                "secret": shard.secret,
+                "host": shard.host,
+                "path": shard.path,
+            }),
+            name=f"pedro-shard-{index}",
+            daemon=True,
+        )
+        process.start()
+        self._processes[index] = process
+
+        logging.info(f"Started shard {index} (pid {process.pid}) on port {shard.port}")
+
+    async def _restart_worker(self, index: int) -> None:
+        try:
+            await asyncio.sleep(self.restart_delay)
+            self._start_worker(index)
+        except Exception as exc:
+            logging.exception(exc)
+        finally:
+            self._restarting.discard(index)
+
+    async def _watch_workers(self) -> None:
+        while True:
+            await asyncio.sleep(1)
+
+            for index, process in enumerate(self._processes):
+                if index not in self._restarting and (process is None or not process.is_alive()):
+                    logging.error(f"Shard {index} exited with code {process and process.exitcode}, restarting")
+                    self._processes[index] = None
+
+                    # Every worker waits its own delay, so workers crashing together come back together
+                    self._restarting.add(index)
+                    asyncio.create_task(self._restart_worker(index))
+
+    async def _post_update(self, url: str, body: bytes) -> ApiResponse:
+        async with self.http_client.session.post(
+                url,
+                data=body,
+                headers={"Content-Type": "application/json", "X-Telegram-Bot-Api-Secret-Token": self._secret},
+        ) as resp:
+            return ApiResponse(status=resp.status)
+
+    async def _forward_updates(self, index: int) -> None:
+        """
+        Send the updates queued for a worker one at a time, in order.
+
+        Args:
+            index (int): The worker's shard index.
+        """
+        shard = self._shard_configs[index]
+        url = f"http://{shard.host}:{shard.port}{shard.path}"
+        queue = self._queues[index]
+
+        while True:
+            update = await queue.get()
+
+            try:
+                response = await self._forward_policy.run(
+                    f"shard{index}", lambda: self._post_update(url, encode_update(update))
+                )
+
+                if response.ok:
+                    self.telegram.ack_update(update)
+                elif is_retryable_status(response.status):
+                    logging.error(f"Update {update.update_id} kept for the next run, shard {index} unavailable")
+                else:
+                    # Sending it again would be rejected the same way
+                    logging.error(f"Shard {index} rejected update {update.update_id}: {response.status}")
+                    self.telegram.ack_update(update)
+            except Exception as exc:
+                logging.error(f"Update {update.update_id} kept for the next run, shard {index} unreachable: {exc!r}")
+            finally:
+                queue.task_done()
+
+                overflow = self._overflows[index]
+                while overflow and not queue.full():
+                    queue.put_nowait(overflow.popleft())
+
+    async def _route_updates(self) -> None:
+        async for update in self.telegram.get_new_message():
+            message = update.message or update.edited_message
+            chat_id = message.chat.id if message and message.chat else 0
+
+            index = shard_for(chat_id, self.shards)
+            queue, overflow = self._queues[index], self._overflows[index]
+
+            # Behind updates already spilled, even once the queue has room, to keep the order
+            if overflow or queue.full():
+                if not overflow:
+                    logging.warning(f"Shard {index} is behind, spilling its updates until it catches up")
+
+                # Only a reference, the update is held until acknowledged anyway
+                overflow.append(update)
+            else:
+                queue.put_nowait(update)
+
+    async def run(self) -> None:
+        """
+        Start the workers and route updates to them until cancelled.
+        """
+        self.config = self._load_config()
+        self.http_client = HttpClient(limit_per_host=2, total_timeout=30)
+        self.telegram = Telegram(
+            self.config.secrets.bot_token,
+            polling=not self.config.webhook.enabled,
+            http_client=self.http_client,
+            api_url=self.config.telegram_api_url,
+        )
+
+        self._queues = [asyncio.Queue(maxsize=self._queue_size) for _ in range(self.shards)]
+
+        for index in range(self.shards):
+            self._start_worker(index)
+
+        tasks = [self._route_updates(), self._watch_workers()]
+        tasks.extend(self._forward_updates(index) for index in range(self.shards))
+
+        if self.config.webhook.enabled:
+            self.webhook = WebhookServer(
+                telegram=self.telegram,
+                host=self.config.webhook.host,
+                port=self.config.webhook.port,
+                path=self.config.webhook.path,
+                secret_token=self.config.webhook.secret_token,
+            )
+
+            if self.config.webhook.public_url:
+                await self.telegram.set_webhook(
+                    url=self.config.webhook.public_url,
+                    secret_token=self.config.webhook.secret_token,
+                    drop_pending_updates=not self.telegram.has_stored_offset
+                )
+
+            tasks.append(self.webhook.run())
+
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for process in self._processes:
+                if process is not None and process.is_alive():
+                    process.terminate()
+
+            await self.http_client.close()
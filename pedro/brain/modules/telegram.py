@@ -8,10 +8,12 @@ Telegram-specific actions.
 
 # Internal
 import asyncio
+import functools
 import logging
 import typing as T
 import json
-import sys
+import time
+import os
 import random
 
 # External
@@ -19,9 +21,19 @@ import aiohttp
 
 
 # Project
-from pedro.data_structures.telegram_message import Message, MessagesResults, MessageReceived
-from pedro.data_structures.max_size_list import MaxSizeList
+from pedro.data_structures.telegram_message import Message, MessageReceived
 from pedro.data_structures.images import MessageImage, MessageDocument
+from pedro.data_structures.downloaded_file import DownloadedFile
+from pedro.data_structures.bounded_set import BoundedSet
+from pedro.data_structures.api_response import ApiResponse
+from pedro.brain.modules.outbound_scheduler import OutboundScheduler, Priority
+from pedro.brain.modules.file_cache import FileCache
+from pedro.brain.modules.http_client import HttpClient, get_http_client
+from pedro.brain.modules.chat_action_manager import ChatActionManager
+from pedro.brain.modules.media_registry import MediaRegistry
+from pedro.brain.modules.retry_policy import RetryPolicy, RetryableStatus, is_retryable_status
+from pedro.utils.update_decoder import decode_update, decode_updates, encode_update
+from pedro.utils.text_utils import split_message
 
 
 class Telegram:
@@ -36,70 +48,380 @@ class Telegram:
         self,
         token: str,
         semaphore: int = 3,
-        polling_rate: int = 0.5
+        global_rate: float = 30.0,
+        polling_rate: int = 0.5,
+        polling_timeout: int = 30,
+        allowed_updates: T.Sequence[str] = ("message",),
+        polling: bool = True,
+        offset_file: T.Optional[str] = "database/telegram_offset.json",
+        file_cache: T.Optional[FileCache] = None,
+        file_path_ttl: float = 55 * 60,
+        max_download_mb: int = 20,
+        http_client: T.Optional[HttpClient] = None,
+        api_url: str = "https://api.telegram.org",
+        media_registry: T.Optional[MediaRegistry] = None,
+        retry_policy: T.Optional[RetryPolicy] = None,
     ):
         """
         Initialize the Telegram client.
 
         Args:
             token (str): The Telegram Bot API token.
-            semaphore (int, optional): Maximum number of concurrent API requests. Defaults to 3.
-            polling_rate (int, optional): Rate at which to poll for new messages in seconds. Defaults to 0.5.
+            semaphore (int, optional): Maximum number of concurrent outbound API requests, which are also
+                rate limited per chat and globally by the outbound scheduler. Defaults to 3.
+            global_rate (float, optional): Messages per second this client may send across all chats, a share
+                of Telegram's bot-wide limit when several processes send for the same bot. Defaults to 30.
+            polling_rate (int, optional): Rate at which to poll for new messages in seconds when long polling
+                is disabled, also used as a pause after a failed poll. Defaults to 0.5.
+            polling_timeout (int, optional): Server-side long polling timeout in seconds. Telegram holds each
+                getUpdates request open until an update arrives or the timeout expires. 0 falls back to
+                short polling. Defaults to 30.
+            allowed_updates (Sequence[str], optional): Update types requested from Telegram. Only request
+                types the bot handles, anything else is still fetched, journaled and decoded for nothing.
+                Defaults to ("message",).
+            polling (bool, optional): Whether to start the getUpdates polling task. Disabled when updates
+                are delivered through a webhook. Defaults to True.
+            offset_file (Optional[str], optional): File where the last acknowledged update_id is persisted,
+                so a restart resumes right after it. Updates received but not yet acknowledged are
+                journaled next to it, in `<offset_file>.pending`, and handed out again after a restart.
+                None disables persistence. Defaults to "database/telegram_offset.json".
+            file_cache (Optional[FileCache], optional): Cache of downloaded files keyed by file_unique_id.
+                Defaults to a memory-only FileCache.
+            file_path_ttl (float, optional): Seconds a getFile answer is reused. Telegram guarantees
+                download links for at least one hour. Defaults to 55 minutes.
+            max_download_mb (int, optional): Largest file downloaded when no smaller limit is given,
+                matching the Bot API getFile limit. Defaults to 20.
+            http_client (Optional[HttpClient], optional): HTTP client used for every call. Defaults to the
+                client shared by the bot.
+            api_url (str, optional): Base URL of the Bot API server, e.g. a local Bot API server or the fake
+                one in benchmarks/. Defaults to "https://api.telegram.org".
+            media_registry (Optional[MediaRegistry], optional): Registry of uploaded media file_ids.
+                Defaults to one persisted to "database/media_registry.json".
+            retry_policy (Optional[RetryPolicy], optional): Retry policy every Bot API call goes through.
+                Defaults to a RetryPolicy with its default settings.
         """
-        self._api_route = f"https://api.telegram.org/bot{token}"
-        self._semaphore = asyncio.Semaphore(semaphore)
+        self._api_url = api_url.rstrip("/")
+        self._api_route = f"{self._api_url}/bot{token}"
+        self._file_route = f"{self._api_url}/file/bot{token}"
+        self._outbound = OutboundScheduler(concurrency=semaphore, global_rate=global_rate)
         self._polling_rate = polling_rate
+        self._polling_timeout = polling_timeout
+        self._allowed_updates = list(allowed_updates)
 
-        self._last_id = 0
-        self._messages = MessagesResults()
-        self._interacted_updates = MaxSizeList(50)
+        self._offset_file = offset_file
+        self._pending_file = f"{offset_file}.pending" if offset_file else None
+        self._acked_id = self._load_offset()
+        self.has_stored_offset = self._acked_id > 0
 
-        self._session = aiohttp.ClientSession()
+        self._last_id = self._acked_id
+        self._seen_updates = BoundedSet(1000)
+        self._updates: asyncio.Queue[MessageReceived] = asyncio.Queue()
+        self._unacked: T.Dict[int, MessageReceived] = {}
+        self._journal_lines = 0
 
-        asyncio.create_task(self._message_polling())
+        pending, self._last_id = self._load_pending()
+
+        for update in pending:
+            self.push_update(update)
+
+        self._file_cache = file_cache or FileCache()
+        self._file_path_ttl = file_path_ttl
+        self._max_download_bytes = max_download_mb * 1024 * 1024
+        self._file_urls: T.Dict[str, T.Tuple[str, float]] = {}
+        self._downloads: T.Dict[str, asyncio.Future] = {}
+
+        self._http = http_client or get_http_client()
+
+        self.chat_actions = ChatActionManager(send=self.send_action)
+        self._media_registry = media_registry or MediaRegistry()
+        self.retry_policy = retry_policy or RetryPolicy()
+
+        if polling:
+            asyncio.create_task(self._message_polling())
+
+    def _load_offset(self) -> int:
+        """
+        Load the last acknowledged update_id from the offset file.
+
+        Returns:
+            int: The stored update_id, or 0 if nothing was stored yet.
+        """
+        if not self._offset_file or not os.path.exists(self._offset_file):
+            return 0
+
+        try:
+            with open(self._offset_file, encoding='utf8') as offset_file:
+                return int(json.load(offset_file)["update_id"])
+        except Exception as exc:
+            logging.exception(exc)
+            return 0
+
+    def _save_offset(self) -> None:
+        """
+        Atomically persist the last acknowledged update_id to the offset file.
+        """
+        if not self._offset_file:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self._offset_file) or ".", exist_ok=True)
+
+            temp_file = f"{self._offset_file}.tmp"
+            with open(temp_file, 'w', encoding='utf8') as offset_file:
+                json.dump({"update_id": self._acked_id}, offset_file)
+
+            os.replace(temp_file, self._offset_file)
+        except Exception as exc:
+            logging.exception(exc)
+
+    def _load_pending(self) -> T.Tuple[T.List[MessageReceived], int]:
+        """
+        Read the updates a previous run received but never finished handling.
+
+        The journal holds one line per received update, one `{"acked": update_id}` line per
+        finished one and, once compacted, a `{"last_id": update_id}` line with the newest
+        update received. It is emptied here and refilled as the updates are pushed again.
+
+        Returns:
+            Tuple[List[MessageReceived], int]: The unfinished updates, oldest first, and the newest
+                update_id received, so polling resumes after it.
+        """
+        last_id = self._acked_id
+
+        if not self._pending_file or not os.path.exists(self._pending_file):
+            return [], last_id
+
+        pending: T.Dict[int, MessageReceived] = {}
+
+        try:
+            with open(self._pending_file, encoding='utf8') as pending_file:
+                for line in pending_file:
+                    try:
+                        entry = json.loads(line)
+
+                        if "acked" in entry:
+                            pending.pop(entry["acked"], None)
+                        elif "last_id" in entry:
+                            last_id = max(last_id, entry["last_id"])
+                        else:
+                            update = decode_update(line)
+                            pending[update.update_id] = update
+                            last_id = max(last_id, update.update_id)
+                    except ValueError:
+                        # A line cut short by a crash
+                        continue
+
+            os.remove(self._pending_file)
+        except Exception as exc:
+            logging.exception(exc)
+
+        if pending:
+            logging.info(f"Resuming {len(pending)} updates left unfinished by the last run")
+
+        return [pending[update_id] for update_id in sorted(pending)], last_id
+
+    def _journal(self, lines: T.Iterable[bytes], rewrite: bool = False) -> None:
+        if not self._pending_file:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self._pending_file) or ".", exist_ok=True)
+
+            with open(self._pending_file, 'wb' if rewrite else 'ab') as pending_file:
+                if rewrite:
+                    self._journal_lines = 0
+
+                for line in lines:
+                    pending_file.write(line + b"\n")
+                    self._journal_lines += 1
+        except Exception as exc:
+            logging.exception(exc)
+
+    def push_update(self, update: MessageReceived) -> None:
+        """
+        Hand a received update to the consumers of `get_new_message`.
+
+        Updates already acknowledged before a restart, or seen recently, are dropped,
+        so neither a retried webhook delivery nor an overlapping poll is handled twice.
+        Every other update is journaled until it is acknowledged.
+
+        Args:
+            update (MessageReceived): The update received from Telegram.
+        """
+        if update.update_id is not None:
+            if update.update_id in self._seen_updates or update.update_id <= self._acked_id:
+                return
+
+            self._seen_updates.add(update.update_id)
+            self._last_id = max(self._last_id, update.update_id)
+            self._unacked[update.update_id] = update
+            self._journal([encode_update(update)])
+
+        self._updates.put_nowait(update)
+
+    def ack_update(self, update: MessageReceived) -> None:
+        """
+        Mark an update as completely handled.
+
+        Updates finish out of order, e.g. when chats are handled in parallel or album parts
+        wait for the rest of their album. The stored offset only moves up to the newest
+        update below which every update finished, so a restart never skips an unfinished one.
+
+        Args:
+            update (MessageReceived): The update that was handled, or that failed.
+        """
+        if self._unacked.pop(update.update_id, None) is None:
+            return
+
+        if not self._unacked:
+            self._journal([], rewrite=True)
+        elif self._journal_lines > 2 * len(self._unacked) + 100:
+            self._journal(
+                [json.dumps({"last_id": self._last_id}).encode()]
+                + [encode_update(pending) for pending in self._unacked.values()],
+                rewrite=True
+            )
+        else:
+            self._journal([json.dumps({"acked": update.update_id}).encode()])
+
+        acked_id = min(self._unacked) - 1 if self._unacked else self._last_id
+
+        if acked_id > self._acked_id:
+            self._acked_id = acked_id
+            self._save_offset()
 
     async def get_new_message(self) -> T.AsyncGenerator[MessageReceived, None]:
         """
         Get new messages from Telegram.
 
+        Waits on the internal update queue, so consumers are only woken up when the
+        poller or the webhook delivers something. Consumers call `ack_update` once an
+        update is completely handled; until then it is handed out again after a restart.
+
         Yields:
-            MessageReceived: New messages that haven't been processed yet.
+            MessageReceived: New messages, in the order Telegram sent them.
 
         Returns:
             AsyncGenerator[MessageReceived, None]: An async generator of new messages.
         """
-        if self._messages.result:
-            for message in self._messages.result:
-                message: MessageReceived
-
-                if message.update_id not in self._interacted_updates:
-                    yield message
+        while True:
+            update = await self._updates.get()
 
-                    self._interacted_updates.append(message.update_id)
+            try:
+                yield update
+            finally:
+                self._updates.task_done()
 
     async def _message_polling(self) -> None:
         """
         Internal method to continuously poll for new messages from Telegram.
 
-        This method runs as a background task and updates the internal message store
-        with new messages from the Telegram API.
+        This method runs as a background task and pushes new messages from the Telegram
+        API to the internal update queue. Each getUpdates call requests only
+        updates after the last one received and, when long polling is enabled, is held
+        open by Telegram until a new update arrives or the polling timeout expires.
+
+        A new poll is only made once every queued update was taken by a consumer. getUpdates
+        confirms (and Telegram discards) everything below the requested offset, which is
+        safe since unfinished updates are journaled.
+        When no offset was stored yet, the pending backlog is skipped instead of answered.
+        Consecutive failed polls back off following the retry policy.
         """
+        request_timeout = aiohttp.ClientTimeout(total=self._polling_timeout + 10)
+        skip_backlog = not self.has_stored_offset
+        failures = 0
+
         while True:
             try:
-                await asyncio.sleep(self._polling_rate)
+                await self._updates.join()
 
-                polling_url = f"{self._api_route}/getUpdates?offset={self._last_id}"
+                if not self._polling_timeout:
+                    await asyncio.sleep(self._polling_rate)
 
-                async with self._session.get(polling_url) as request:
+                params = {
+                    "offset": -1 if skip_backlog else self._last_id + 1,
+                    "timeout": 0 if skip_backlog else self._polling_timeout,
+                    "allowed_updates": json.dumps(self._allowed_updates),
+                }
+
+                async with self._http.session.get(
+                        f"{self._api_route}/getUpdates",
+                        params=params,
+                        timeout=request_timeout
+                ) as request:
                     if 200 <= request.status < 300:
-                        response = json.loads((await request.text()).replace('"from":{"', '"from_":{"'))
-                        if 'ok' in response and response['ok']:
-                            self._messages = MessagesResults(**response)
-                            if self._messages.result:
-                                self._last_id = self._messages.result[-1].update_id
+                        failures = 0
+                        response = decode_updates(await request.read())
+                        if response.ok:
+                            updates = response.result
+
+                            if skip_backlog:
+                                skip_backlog = False
+
+                                if updates:
+                                    self._last_id = self._acked_id = updates[-1].update_id
+                                    self._save_offset()
+                                    logging.info(f"Skipped pending updates up to {self._acked_id}")
+                                continue
+
+                            for update in updates:
+                                self.push_update(update)
+                    else:
+                        failures += 1
+                        logging.warning(f"getUpdates failed: {request.status}")
+                        await asyncio.sleep(max(self._polling_rate, self.retry_policy.backoff(failures)))
             except Exception as exc:
+                failures += 1
                 logging.exception(exc)
-                await asyncio.sleep(15)
+                await asyncio.sleep(max(self._polling_rate, self.retry_policy.backoff(failures)))
+
+    async def set_webhook(
+            self,
+            url: str,
+            secret_token: str = "",
+            max_connections: int = 1,
+            drop_pending_updates: bool = False
+    ) -> bool:
+        """
+        Register a webhook URL so Telegram pushes updates instead of being polled.
+
+        Args:
+            url (str): Public HTTPS URL Telegram should deliver updates to.
+            secret_token (str, optional): Token sent back by Telegram in the
+                X-Telegram-Bot-Api-Secret-Token header. Defaults to "".
+            max_connections (int, optional): Maximum simultaneous webhook connections. Defaults to 1, which
+                makes Telegram deliver updates one at a time and in order.
+            drop_pending_updates (bool, optional): Discard updates Telegram queued while the bot was
+                offline. Defaults to False.
+
+        Returns:
+            bool: True if Telegram accepted the webhook.
+        """
+        payload = {
+            "url": url,
+            "allowed_updates": self._allowed_updates,
+            "max_connections": max_connections,
+            "drop_pending_updates": drop_pending_updates,
+        }
+        if secret_token:
+            payload["secret_token"] = secret_token
+
+        response = await self.retry_policy.run(
+            "setWebhook", functools.partial(self._request, "setWebhook", json_data=payload)
+        )
+
+        return response.ok
+
+    async def delete_webhook(self) -> bool:
+        """
+        Remove the registered webhook, required before getUpdates can be used again.
+
+        Returns:
+            bool: True if Telegram removed the webhook.
+        """
+        response = await self.retry_policy.run("deleteWebhook", functools.partial(self._request, "deleteWebhook"))
+
+        return response.ok
 
     async def image_downloader(
             self,
@@ -121,29 +443,82 @@ class Telegram:
             document = await self.document_downloader(message)
 
             if document and document.mime_type in ["image/jpeg", "image/png"]:
-                return MessageImage(
-                    url=document.url,
-                    bytes=document.bytes,
-                    from_doc=True
-                )
+                return self._message_image(document.url, document.file, document.mime_type, from_doc=True)
             else:
                 return None
 
-        async with self._session.get(
-                f"{self._api_route}/getFile?file_id={message.photo[-1].file_id}") as request:
-            if 200 <= request.status < 300:
-                response = json.loads(await request.text())
-                if 'ok' in response and response['ok']:
-                    file_path = response['result']['file_path']
-                    url = f"{self._api_route.replace('.org/bot', '.org/file/bot')}/{file_path}"
-                    async with self._session.get(url) as download_request:
-                        if 200 <= download_request.status < 300:
-                            return MessageImage(
-                                url=url,
-                                bytes=await download_request.read()
-                            )
-                        else:
-                            logging.critical(f"Image download failed: {download_request.status}")
+        photo = message.photo[-1]
+        downloaded = await self._download_file(photo.file_id, photo.file_unique_id, self._max_download_bytes)
+
+        if downloaded:
+            url, file = downloaded
+            return self._message_image(url, file)
+
+    async def images_downloader(
+            self,
+            message: Message,
+    ) -> T.List[MessageImage]:
+        """
+        Download every image of a message, all photos of an album at once.
+
+        Args:
+            message (Message): The Telegram message containing the images.
+
+        Returns:
+            List[MessageImage]: The downloaded images, in album order. Images that failed to
+                download are left out.
+        """
+        if not message.album:
+            image = await self.image_downloader(message)
+            return [image] if image else []
+
+        downloads = await asyncio.gather(
+            *(self._download_file(photo.file_id, photo.file_unique_id, self._max_download_bytes)
+              for photo in message.album),
+            return_exceptions=True,
+        )
+
+        images = []
+        for downloaded in downloads:
+            if isinstance(downloaded, Exception):
+                logging.exception(downloaded)
+            elif downloaded:
+                image = self._message_image(*downloaded)
+
+                if image:
+                    images.append(image)
+
+        return images
+
+    @staticmethod
+    def _message_image(
+            url: T.Optional[str],
+            file: DownloadedFile,
+            mime_type: str = "image/jpeg",
+            from_doc: bool = False,
+    ) -> T.Optional[MessageImage]:
+        """
+        Wrap a downloaded image, inlining it when its download URL is no longer known.
+
+        Args:
+            url (Optional[str]): The download URL, None for a cached file whose URL expired.
+            file (DownloadedFile): The image contents.
+            mime_type (str, optional): MIME type of the image. Defaults to "image/jpeg".
+            from_doc (bool, optional): Whether the image was sent as a document. Defaults to False.
+
+        Returns:
+            Optional[MessageImage]: The image, or None if it has no URL and is too big to inline.
+        """
+        image = MessageImage(url=url or "", file=file, from_doc=from_doc)
+
+        if not url:
+            # Sent inline rather than asking getFile again for a file already in the cache
+            image.url = image.data_url(mime_type)
+
+            if image.url is None:
+                return None
+
+        return image
 
     async def document_downloader(
             self,
@@ -154,7 +529,8 @@ class Telegram:
         Download a document from a Telegram message.
 
         This method downloads a document from a message if it exists and is within
-        the specified size limit.
+        the specified size limit. The limit is checked against the declared size and
+        enforced again while the file is streamed.
 
         Args:
             message (Message): The Telegram message containing the document.
@@ -164,111 +540,454 @@ class Telegram:
             MessageDocument or None: The downloaded document data or None if download failed
                                     or document exceeds size limit.
         """
-        if not message.document or message.document.file_size > limit_mb * 1024 * 1024:
+        max_bytes = limit_mb * 1024 * 1024
+
+        if not message.document or (message.document.file_size or 0) > max_bytes:
             return None
 
-        async with self._session.get(
-                f"{self._api_route}/getFile?file_id={message.document.file_id}") as request:
-            if 200 <= request.status < 300:
-                response = json.loads(await request.text())
-                if 'ok' in response and response['ok']:
-                    file_path = response['result']['file_path']
-                    url = f"{self._api_route.replace('.org/bot', '.org/file/bot')}/{file_path}"
-                    async with self._session.get(url) as download_request:
-                        if 200 <= download_request.status < 300:
-                            return MessageDocument(
-                                url=url,
-                                bytes=await download_request.read(),
-                                file_name=message.document.file_name or "document",
-                                mime_type=message.document.mime_type or "application/octet-stream"
-                            )
-                        else:
-                            logging.critical(f"Document download failed: {download_request.status}")
+        downloaded = await self._download_file(
+            message.document.file_id,
+            message.document.file_unique_id,
+            max_bytes
+        )
+
+        if downloaded:
+            url, file = downloaded
+            return MessageDocument(
+                url=url or "",
+                file=file,
+                file_name=message.document.file_name or "document",
+                mime_type=message.document.mime_type or "application/octet-stream"
+            )
+
+    def _cached_file_url(self, key: str) -> T.Optional[str]:
+        cached = self._file_urls.get(key)
+
+        return cached[0] if cached and cached[1] > time.monotonic() else None
 
-    async def send_photo(self, image: bytes, chat_id: int, caption=None, reply_to=None, sleep_time=0, max_retries=5) -> None:
+    async def _get_file_url(self, file_id: str, key: str) -> T.Optional[str]:
+        """
+        Resolve the download URL of a file, reusing recent getFile answers.
+
+        Args:
+            file_id (str): The file_id of the file.
+            key (str): The content key the URL is remembered under, so other file_ids of the
+                same content reuse it.
+
+        Returns:
+            Optional[str]: The download URL, or None if Telegram did not return one.
+        """
+        url = self._cached_file_url(key)
+        if url:
+            return url
+
+        response = await self.retry_policy.run(
+            "getFile", functools.partial(self._request, "getFile", json_data={"file_id": file_id})
+        )
+
+        if response.ok and response.result and response.result.get("file_path"):
+            url = f"{self._file_route}/{response.result['file_path']}"
+
+            if len(self._file_urls) > 1000:
+                now = time.monotonic()
+                self._file_urls = {
+                    key: value for key, value in self._file_urls.items() if value[1] > now
+                }
+
+            self._file_urls[key] = (url, time.monotonic() + self._file_path_ttl)
+
+            return url
+
+        logging.critical(f"getFile failed: {response.status}")
+
+        return None
+
+    async def _download_file(
+            self,
+            file_id: str,
+            file_unique_id: T.Optional[str],
+            max_bytes: int,
+    ) -> T.Optional[T.Tuple[T.Optional[str], DownloadedFile]]:
+        """
+        Download a file through the file cache.
+
+        The cache is looked up by content key first, so getFile is only called on a miss.
+        A hit returns the download URL remembered with the entry, or None as URL once it
+        expired, e.g. after a restart. On a miss the body is streamed in chunks into a spooled temporary file and the download
+        is abandoned as soon as it grows past `max_bytes`. Concurrent downloads of the
+        same file share a single request, and waiters get None if that request fails.
+
+        Args:
+            file_id (str): The file_id used to fetch the file.
+            file_unique_id (Optional[str]): The content key of the file in the cache.
+            max_bytes (int): Largest accepted file size.
+
+        Returns:
+            Optional[Tuple[Optional[str], DownloadedFile]]: The download URL, if still known, and a handle
+                to the file contents, or None if the download failed or exceeded the size limit.
+        """
+        key = file_unique_id or file_id
+
+        pending = self._downloads.get(key)
+        if pending:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._downloads[key] = future
+
+        try:
+            result = None
+            file = self._file_cache.get(key)
+
+            if file is not None:
+                result = (self._cached_file_url(key), file)
+            else:
+                url = await self._get_file_url(file_id, key)
+
+                if url:
+                    try:
+                        file = await self.retry_policy.run(
+                            "downloadFile", functools.partial(self._stream_download, url, max_bytes)
+                        )
+                    except RetryableStatus:
+                        file = None
+
+                    if file is not None:
+                        self._file_cache.put(key, file)
+                        result = (url, file)
+
+            future.set_result(result)
+
+            return result
+        finally:
+            # Also on failure or cancellation, so the waiters sharing this download get None
+            if not future.done():
+                future.set_result(None)
+
+            del self._downloads[key]
+
+    async def _stream_download(self, url: str, max_bytes: int) -> T.Optional[DownloadedFile]:
+        """
+        Stream a file into a spooled temporary file, enforcing a size cap while reading.
+
+        Args:
+            url (str): The download URL.
+            max_bytes (int): Largest accepted file size.
+
+        Returns:
+            Optional[DownloadedFile]: The downloaded file, or None if the download failed or was too big.
+
+        Raises:
+            RetryableStatus: If the server answered with a status worth retrying.
+        """
+        async with self._http.session.get(url) as download_request:
+            if is_retryable_status(download_request.status):
+                raise RetryableStatus(download_request.status)
+
+            if not 200 <= download_request.status < 300:
+                logging.critical(f"File download failed: {download_request.status}")
+                return None
+
+            if (download_request.content_length or 0) > max_bytes:
+                logging.warning(f"File download skipped, {download_request.content_length} bytes is over the limit")
+                return None
+
+            file = DownloadedFile()
+
+            try:
+                async for chunk in download_request.content.iter_chunked(64 * 1024):
+                    file.write(chunk)
+
+                    if file.size > max_bytes:
+                        logging.warning(f"File download aborted after {file.size} bytes, over the limit")
+                        file.close()
+                        return None
+            except Exception:
+                file.close()
+                raise
+
+            return file
+
+    async def _request(
+            self,
+            api_method: str,
+            json_data: T.Optional[dict] = None,
+            form_data: T.Optional[T.Callable[[], aiohttp.FormData]] = None,
+            api_route: T.Optional[str] = None,
+    ) -> ApiResponse:
+        """
+        Perform a single Bot API call.
+
+        Args:
+            api_method (str): The Bot API method name, e.g. "sendMessage".
+            json_data (Optional[dict], optional): JSON body of the call. Defaults to None.
+            form_data (Optional[Callable[[], aiohttp.FormData]], optional): Factory building a multipart
+                body, used for uploads. Defaults to None.
+            api_route (Optional[str], optional): Alternative bot route, e.g. for another bot token.
+                Defaults to None.
+
+        Returns:
+            ApiResponse: The HTTP status and the decoded Telegram answer.
+        """
+        async with self._http.session.post(
+                f"{api_route or self._api_route}/{api_method}",
+                json=json_data,
+                data=form_data() if form_data else None
+        ) as resp:
+            logging.info(f"{api_method} - {resp.status}")
+
+            try:
+                payload = json.loads(await resp.text())
+            except ValueError:
+                payload = {}
+
+            return ApiResponse(status=resp.status, payload=payload if isinstance(payload, dict) else {})
+
+    def _submit(
+            self,
+            chat_id: T.Optional[int],
+            api_method: str,
+            json_data: T.Optional[dict] = None,
+            form_data: T.Optional[T.Callable[[], aiohttp.FormData]] = None,
+            api_route: T.Optional[str] = None,
+            limited: bool = True,
+            priority: Priority = Priority.REPLY,
+            max_attempts: T.Optional[int] = None,
+            deadline: T.Optional[float] = None,
+    ) -> T.Awaitable[ApiResponse]:
+        """
+        Queue a Bot API call in the outbound scheduler, under the retry policy.
+
+        Every retry of a failed call is queued again, so it respects the rate limits
+        like any other call. 429 answers are only retried by the scheduler.
+
+        Args:
+            chat_id (Optional[int]): The chat the call is addressed to.
+            api_method (str): The Bot API method name.
+            json_data (Optional[dict], optional): JSON body of the call. Defaults to None.
+            form_data (Optional[Callable[[], aiohttp.FormData]], optional): Factory building a multipart
+                body. Defaults to None.
+            api_route (Optional[str], optional): Alternative bot route. Defaults to None.
+            limited (bool, optional): Whether the call counts against the message rate limits. Defaults to True.
+            priority (Priority, optional): Outbound traffic class of the call. Defaults to Priority.REPLY.
+            max_attempts (Optional[int], optional): Overrides the retry policy's maximum attempts. Defaults to None.
+            deadline (Optional[float], optional): Overrides the retry policy's deadline. Defaults to None.
+
+        Returns:
+            Awaitable[ApiResponse]: Resolves with the ApiResponse of the last attempt once the call was
+                delivered, dropped or out of retries.
+        """
+        return self.retry_policy.run(
+            api_method,
+            functools.partial(
+                self._outbound.submit,
+                chat_id=chat_id,
+                request=functools.partial(
+                    self._request, api_method, json_data=json_data, form_data=form_data, api_route=api_route
+                ),
+                limited=limited,
+                priority=priority,
+            ),
+            max_attempts=max_attempts,
+            deadline=deadline,
+            retry_rate_limited=False,
+        )
+
+    async def _send_media(
+            self,
+            api_method: str,
+            kind: str,
+            media: T.Union[bytes, str],
+            chat_id: int,
+            fields: T.Dict[str, T.Any],
+            file_name: T.Optional[str] = None,
+            priority: Priority = Priority.REPLY,
+            max_attempts: T.Optional[int] = None,
+    ) -> ApiResponse:
+        """
+        Send media, reusing the file_id of an earlier upload of the same local file.
+
+        The first upload of a local file registers the file_id Telegram returns for it in the
+        media registry. Later sends reference that file_id instead of uploading again, and
+        fall back to uploading if Telegram no longer accepts it. Media passed as bytes is
+        generated on the fly, e.g. backups, so it is uploaded every time and never registered.
+
+        Args:
+            api_method (str): The Bot API method name, e.g. "sendVideo".
+            kind (str): The media field of the method, e.g. "video".
+            media (Union[bytes, str]): The media content, or the path of a local file.
+            chat_id (int): The ID of the chat to send the media to.
+            fields (Dict[str, Any]): Other fields of the call, None values are left out.
+            file_name (Optional[str], optional): File name of the upload. Defaults to None.
+            priority (Priority, optional): Outbound traffic class. Defaults to Priority.REPLY.
+            max_attempts (Optional[int], optional): Overrides the retry policy's maximum attempts. Defaults to None.
+
+        Returns:
+            ApiResponse: The answer of the last call made.
+        """
+        fields = {key: value for key, value in fields.items() if value is not None}
+
+        digest = self._media_registry.digest_path(media) if isinstance(media, str) else None
+        file_id = self._media_registry.get(kind, digest) if digest else None
+
+        if file_id:
+            response = await self._submit(
+                chat_id,
+                api_method,
+                json_data={"chat_id": chat_id, kind: file_id, **fields},
+                priority=priority,
+                max_attempts=max_attempts
+            )
+
+            if response.status != 400:
+                return response
+
+            logging.warning(f"Stored {kind} file_id rejected, uploading it again")
+            self._media_registry.forget(kind, digest)
+
+        if isinstance(media, str):
+            with open(media, "rb") as media_file:
+                media = media_file.read()
+
+        def build_form_data() -> aiohttp.FormData:
+            form_data = aiohttp.FormData()
+            form_data.add_field("chat_id", str(chat_id))
+
+            if file_name:
+                form_data.add_field(kind, media, filename=file_name)
+            else:
+                form_data.add_field(kind, media)
+
+            for key, value in fields.items():
+                form_data.add_field(key, str(value).lower() if isinstance(value, bool) else str(value))
+
+            return form_data
+
+        response = await self._submit(
+            chat_id, api_method, form_data=build_form_data, priority=priority, max_attempts=max_attempts
+        )
+
+        if digest and response.ok and isinstance(response.result, dict):
+            uploaded = response.result.get(kind)
+
+            if isinstance(uploaded, list) and uploaded:
+                uploaded = uploaded[-1]
+
+            if isinstance(uploaded, dict) and uploaded.get("file_id"):
+                self._media_registry.set(kind, digest, uploaded["file_id"])
+
+        return response
+
+    async def send_photo(
+            self,
+            image: T.Union[bytes, str],
+            chat_id: int,
+            caption=None,
+            reply_to=None,
+            sleep_time=0,
+            max_retries=5,
+            priority: Priority = Priority.REPLY
+    ) -> T.Optional[dict]:
         """
         Send a photo to a Telegram chat.
 
         Args:
-            image (bytes): The image data to send.
+            image (Union[bytes, str]): The image data to send, or the path of a local image.
             chat_id (int): The ID of the chat to send the photo to.
             caption (str, optional): Caption for the photo. Defaults to None.
             reply_to (int, optional): Message ID to reply to. Defaults to None.
             sleep_time (int, optional): Time to sleep before sending in seconds. Defaults to 0.
-            max_retries (int, optional): Maximum number of retry attempts. Defaults to 5.
+            max_retries (int, optional): Maximum number of attempts. Defaults to 5.
+            priority (Priority, optional): Outbound traffic class. Defaults to Priority.REPLY.
+
+        Returns:
+            Optional[dict]: The sent message, or None if it could not be delivered.
         """
         await asyncio.sleep(sleep_time)
 
-        for _ in range(max_retries):
-            async with self._semaphore:
-                async with self._session.post(
-                        url=f"{self._api_route}/sendPhoto".replace('\n', ''),
-                        data=aiohttp.FormData(
-                            (
-                                    ("chat_id", str(chat_id)),
-                                    ("photo", image),
-                                    ("reply_to_message_id", str(reply_to) if reply_to else ''),
-                                    ('allow_sending_without_reply', 'true'),
-                                    ("caption", caption if caption else '')
-                            )
-                        )
-                ) as resp:
-                    logging.info(f"{sys._getframe().f_code.co_name} - {resp.status}")
-                    if 200 <= resp.status < 300:
-                        break
-            await asyncio.sleep(10)
-
-    async def send_video(self, video: bytes, chat_id: int, reply_to=None, sleep_time=0) -> None:
+        response = await self._send_media(
+            "sendPhoto",
+            "photo",
+            image,
+            chat_id,
+            fields={
+                "reply_to_message_id": reply_to,
+                "allow_sending_without_reply": True,
+                "caption": caption,
+            },
+            priority=priority,
+            max_attempts=max_retries
+        )
+
+        return response.result if response.ok else None
+
+    async def send_video(
+            self,
+            video: T.Union[bytes, str],
+            chat_id: int,
+            reply_to=None,
+            sleep_time=0,
+            priority: Priority = Priority.REPLY
+    ) -> T.Optional[dict]:
         """
         Send a video to a Telegram chat.
 
         Args:
-            video (bytes): The video data to send.
+            video (Union[bytes, str]): The video data to send, or the path of a local video.
             chat_id (int): The ID of the chat to send the video to.
             reply_to (int, optional): Message ID to reply to. Defaults to None.
             sleep_time (int, optional): Time to sleep before sending in seconds. Defaults to 0.
+            priority (Priority, optional): Outbound traffic class. Defaults to Priority.REPLY.
+
+        Returns:
+            Optional[dict]: The sent message, or None if it could not be delivered.
         """
         await asyncio.sleep(sleep_time)
 
-        async with self._semaphore:
-            async with self._session.post(
-                    url=f"{self._api_route}/sendVideo".replace('\n', ''),
-                    data=aiohttp.FormData(
-                        (
-                                ("chat_id", str(chat_id)),
-                                ("video", video),
-                                ("reply_to_message_id", str(reply_to) if reply_to else ''),
-                                ('allow_sending_without_reply', 'true'),
-                        )
-                    )
-            ) as resp:
-                logging.info(f"{sys._getframe().f_code.co_name} - {resp.status}")
+        response = await self._send_media(
+            "sendVideo",
+            "video",
+            video,
+            chat_id,
+            fields={"reply_to_message_id": reply_to, "allow_sending_without_reply": True},
+            priority=priority
+        )
+
+        return response.result if response.ok else None
 
-    async def send_voice(self, audio: bytes, chat_id: int, reply_to=None, sleep_time=0) -> None:
+    async def send_voice(
+            self,
+            audio: T.Union[bytes, str],
+            chat_id: int,
+            reply_to=None,
+            sleep_time=0,
+            priority: Priority = Priority.REPLY
+    ) -> T.Optional[dict]:
         """
         Send a voice message to a Telegram chat.
 
         Args:
-            audio (bytes): The audio data to send as voice message.
+            audio (Union[bytes, str]): The audio data to send as voice message, or the path of a local file.
             chat_id (int): The ID of the chat to send the voice message to.
             reply_to (int, optional): Message ID to reply to. Defaults to None.
             sleep_time (int, optional): Time to sleep before sending in seconds. Defaults to 0.
+            priority (Priority, optional): Outbound traffic class. Defaults to Priority.REPLY.
+
+        Returns:
+            Optional[dict]: The sent message, or None if it could not be delivered.
         """
         await asyncio.sleep(sleep_time)
 
-        async with self._semaphore:
-            async with self._session.post(
-                    url=f"{self._api_route}/sendVoice".replace('\n', ''),
-                    data=aiohttp.FormData(
-                        (
-                                ("chat_id", str(chat_id)),
-                                ("voice", audio),
-                                ("reply_to_message_id", str(reply_to) if reply_to else ''),
-                                ('allow_sending_without_reply', 'true'),
-                        )
-                    )
-            ) as resp:
-                logging.info(f"{sys._getframe().f_code.co_name} - {resp.status}")
+        response = await self._send_media(
+            "sendVoice",
+            "voice",
+            audio,
+            chat_id,
+            fields={"reply_to_message_id": reply_to, "allow_sending_without_reply": True},
+            priority=priority
+        )
+
+        return response.result if response.ok else None
 
     async def send_action(
             self,
@@ -289,56 +1008,62 @@ class Telegram:
             repeats (bool, optional): Whether to repeat the action continuously. Defaults to False.
         """
         while True:
-            async with self._semaphore:
-                async with self._session.post(
-                        url=f"{self._api_route}/sendChatAction".replace('\n', ''),
-                        data=aiohttp.FormData(
-                            (
-                                ("chat_id", str(chat_id)),
-                                ('action', action),
-                            )
-                        )
-                ) as resp:
-                    logging.info(f"{sys._getframe().f_code.co_name} - {resp.status}")
+            await self._submit(
+                chat_id,
+                "sendChatAction",
+                json_data={"chat_id": chat_id, "action": action},
+                limited=False,
+                priority=Priority.REACTION,
+                deadline=5
+            )
 
             if not repeats:
                 break
 
             await asyncio.sleep(round(5 + (random.random() * 2)))
 
-    async def send_document(self, document: bytes, chat_id: int, caption=None, reply_to=None, sleep_time=0, file_name=None) -> None:
+    async def send_document(
+            self,
+            document: T.Union[bytes, str],
+            chat_id: int,
+            caption=None,
+            reply_to=None,
+            sleep_time=0,
+            file_name=None,
+            priority: Priority = Priority.REPLY
+    ) -> T.Optional[dict]:
         """
         Send a document to a Telegram chat.
 
         Args:
-            document (bytes): The document data to send.
+            document (Union[bytes, str]): The document data to send, or the path of a local file.
             chat_id (int): The ID of the chat to send the document to.
             caption (str, optional): Caption for the document. Defaults to None.
             reply_to (int, optional): Message ID to reply to. Defaults to None.
             sleep_time (int, optional): Time to sleep before sending in seconds. Defaults to 0.
             file_name (str, optional): Name and extension for the document file. Defaults to None.
+            priority (Priority, optional): Outbound traffic class. Defaults to Priority.REPLY.
+
+        Returns:
+            Optional[dict]: The sent message, or None if it could not be delivered.
         """
         await asyncio.sleep(sleep_time)
 
-        form_data = aiohttp.FormData()
-        form_data.add_field("chat_id", str(chat_id))
-
-        # Add document with filename if provided
-        if file_name:
-            form_data.add_field("document", document, filename=file_name)
-        else:
-            form_data.add_field("document", document)
-
-        form_data.add_field("caption", caption if caption else '')
-        form_data.add_field("reply_to_message_id", str(reply_to) if reply_to else '')
-        form_data.add_field('allow_sending_without_reply', 'true')
-
-        async with self._semaphore:
-            async with self._session.post(
-                    url=f"{self._api_route}/sendDocument".replace('\n', ''),
-                    data=form_data
-            ) as resp:
-                logging.info(f"{sys._getframe().f_code.co_name} - {resp.status}")
+        response = await self._send_media(
+            "sendDocument",
+            "document",
+            document,
+            chat_id,
+            fields={
+                "caption": caption,
+                "reply_to_message_id": reply_to,
+                "allow_sending_without_reply": True,
+            },
+            file_name=file_name,
+            priority=priority
+        )
+
+        return response.result if response.ok else None
 
     async def forward_message(
             self,
@@ -362,24 +1087,19 @@ class Telegram:
             int: HTTP status code of the request.
         """
         await asyncio.sleep(sleep_time)
-        url = self._api_route
-        if replace_token:
-            url = f"https://api.telegram.org/bot{replace_token}"
-
-        async with self._semaphore:
-            async with self._session.post(
-                    url=f"{url}/forwardMessage".replace('\n', ''),
-                    data=aiohttp.FormData(
-                        (
-                            ("chat_id", str(target_chat_id)),
-                            ("from_chat_id", str(from_chat_id)),
-                            ("message_id", str(message_id)),
-                        )
-                    )
-            ) as resp:
-                logging.info(f"{sys._getframe().f_code.co_name} - {resp.status}")
 
-                return resp.status
+        response = await self._submit(
+            target_chat_id,
+            "forwardMessage",
+            json_data={
+                "chat_id": target_chat_id,
+                "from_chat_id": from_chat_id,
+                "message_id": message_id,
+            },
+            api_route=f"{self._api_url}/bot{replace_token}" if replace_token else None
+        )
+
+        return response.status
 
     async def send_message(
             self,
@@ -390,13 +1110,20 @@ class Telegram:
             parse_mode: str = "Markdown",
             disable_notification=False,
             disable_web_page_preview=False,
-            max_retries=7
-    ) -> None:
+            max_retries=7,
+            priority: Priority = Priority.REPLY
+    ) -> T.Optional[dict]:
         """
         Send a text message to a Telegram chat.
 
-        This method attempts to send a message with the specified parse mode,
-        falling back to other parse modes if the initial attempt fails.
+        Texts over Telegram's 4096 character limit are split on paragraph, sentence and
+        Markdown-safe boundaries. Each part is only queued once the previous one was
+        delivered, retries included, so parts always arrive in order; a part that could not
+        be delivered stops the ones after it. Only the first part replies to `reply_to`.
+
+        Each part falls back to other parse modes when Telegram rejects the formatting,
+        inside its own queued call so later parts stay behind it. Rate limit answers and
+        transient failures are retried by the retry policy with the same parse mode.
 
         Args:
             message_text (str): The text message to send.
@@ -406,31 +1133,129 @@ class Telegram:
             parse_mode (str, optional): Message formatting mode. Defaults to "Markdown".
             disable_notification (bool, optional): Whether to send the message silently. Defaults to False.
             disable_web_page_preview (bool, optional): Whether to disable link previews. Defaults to False.
-            max_retries (int, optional): Maximum number of retry attempts. Defaults to 7.
-        """
-        fallback_parse_modes = ["", "HTML", "MarkdownV2", "Markdown"]
+            max_retries (int, optional): Maximum number of attempts per part. Defaults to 7.
+            priority (Priority, optional): Outbound traffic class. Background messages may be dropped
+                under load. Defaults to Priority.REPLY.
 
+        Returns:
+            Optional[dict]: The first sent message, or None if it could not be delivered.
+        """
         await asyncio.sleep(sleep_time)
 
-        for i in range(max_retries):
-            async with self._semaphore:
-                async with self._session.post(
-                        f"{self._api_route}/sendMessage".replace('\n', ''),
-                        json={
+        def submit_part(part: str, part_reply_to: T.Optional[int]) -> T.Awaitable[ApiResponse]:
+            return self.retry_policy.run(
+                "sendMessage",
+                functools.partial(
+                    self._outbound.submit,
+                    chat_id=chat_id,
+                    request=functools.partial(
+                        self._send_text,
+                        {
                             "chat_id": chat_id,
-                            'reply_to_message_id': reply_to,
+                            'reply_to_message_id': part_reply_to,
                             'allow_sending_without_reply': True,
-                            'text': message_text,
+                            'text': part,
                             'disable_notification': disable_notification,
                             'disable_web_page_preview': disable_web_page_preview,
-                            'parse_mode': parse_mode
-                        }
-                ) as resp:
-                    logging.info(f"{sys._getframe().f_code.co_name} - {resp.status}")
+                        },
+                        parse_mode,
+                    ),
+                    priority=priority,
+                ),
+                max_attempts=max_retries,
+                retry_rate_limited=False,
+            )
+
+        parts = split_message(message_text)
+        first = None
+
+        for index, part in enumerate(parts):
+            try:
+                response = await submit_part(part, reply_to if index == 0 else None)
+            except Exception as exc:
+                logging.exception(exc)
+                response = None
 
-                    if 200 <= resp.status < 300:
-                        break
-                    parse_mode = fallback_parse_modes.pop() if len(fallback_parse_modes) else ""
+            if index == 0:
+                first = response
+
+            if not response or not response.ok:
+                if index + 1 < len(parts):
+                    logging.warning(f"Part {index + 1} of {len(parts)} not delivered to {chat_id}, dropping the rest")
+                break
+
+        return first.result if first and first.ok else None
+
+    async def _send_text(self, json_data: dict, parse_mode: str) -> ApiResponse:
+        """
+        Perform a sendMessage call, trying other parse modes while Telegram rejects the formatting.
+
+        Args:
+            json_data (dict): The sendMessage body, without parse_mode.
+            parse_mode (str): The preferred parse mode.
+
+        Returns:
+            ApiResponse: The answer of the last attempt.
+        """
+        fallback_parse_modes = [mode for mode in ["", "HTML", "MarkdownV2", "Markdown"] if mode != parse_mode]
+
+        while True:
+            response = await self._request("sendMessage", json_data={**json_data, "parse_mode": parse_mode})
+
+            if response.status != 400 or not fallback_parse_modes:
+                return response
+
+            parse_mode = fallback_parse_modes.pop()
+
+    async def edit_message_text(
+            self,
+            message_text: str,
+            chat_id: int,
+            message_id: int,
+            parse_mode: str = "Markdown",
+            disable_web_page_preview=False,
+            max_retries=3,
+    ) -> T.Optional[dict]:
+        """
+        Replace the text of a message sent by the bot.
+
+        Like send_message, falls back to other parse modes when Telegram rejects the formatting.
+
+        Args:
+            message_text (str): The new text of the message.
+            chat_id (int): The ID of the chat containing the message.
+            message_id (int): The ID of the message to edit.
+            parse_mode (str, optional): Message formatting mode. Defaults to "Markdown".
+            disable_web_page_preview (bool, optional): Whether to disable link previews. Defaults to False.
+            max_retries (int, optional): Maximum number of attempts of each parse mode. Defaults to 3.
+
+        Returns:
+            Optional[dict]: The edited message, or None if it was not edited.
+        """
+        fallback_parse_modes = ["", "HTML"]
+
+        while True:
+            response = await self._submit(
+                chat_id,
+                "editMessageText",
+                json_data={
+                    "chat_id": chat_id,
+                    "message_id": message_id,
+                    "text": message_text,
+                    "parse_mode": parse_mode,
+                    "disable_web_page_preview": disable_web_page_preview,
+                },
+                max_attempts=max_retries
+            )
+
+            if response.ok:
+                return response.result
+
+            if response.status != 400 or "message is not modified" in response.description \
+                    or not fallback_parse_modes:
+                return None
+
+            parse_mode = fallback_parse_modes.pop()
 
     async def leave_chat(self, chat_id: int, sleep_time=0) -> None:
         """
@@ -442,11 +1267,7 @@ class Telegram:
         """
         await asyncio.sleep(sleep_time)
 
-        async with self._session.post(
-                f"{self._api_route}/leaveChat".replace('\n', ''),
-                json={"chat_id": chat_id}
-        ) as resp:
-            logging.info(f"{sys._getframe().f_code.co_name} - {resp.status}")
+        await self._submit(chat_id, "leaveChat", json_data={"chat_id": chat_id}, limited=False)
 
     async def delete_message(self, chat_id: int, message_id: int) -> None:
         """
@@ -456,14 +1277,15 @@ class Telegram:
             chat_id (int): The ID of the chat containing the message.
             message_id (int): The ID of the message to delete.
         """
-        async with self._session.post(
-                f"{self._api_route}/deleteMessage".replace('\n', ''),
-                json={
-                    "chat_id": chat_id,
-                    "message_id": message_id
-                }
-        ) as resp:
-            logging.info(f"{sys._getframe().f_code.co_name} - {resp.status}")
+        await self._submit(
+            chat_id,
+            "deleteMessage",
+            json_data={
+                "chat_id": chat_id,
+                "message_id": message_id
+            },
+            limited=False
+        )
 
     async def set_chat_title(self, chat_id: int, title: str) -> None:
         """
@@ -473,14 +1295,15 @@ class Telegram:
             chat_id (int): The ID of the chat to rename.
             title (str): The new title for the chat.
         """
-        async with self._session.post(
-                f"{self._api_route}/setChatTitle".replace('\n', ''),
-                json={
-                    "chat_id": chat_id,
-                    "title": title
-                }
-        ) as resp:
-            logging.info(f"{sys._getframe().f_code.co_name} - {resp.status}")
+        await self._submit(
+            chat_id,
+            "setChatTitle",
+            json_data={
+                "chat_id": chat_id,
+                "title": title
+            },
+            priority=Priority.REACTION
+        )
 
     async def set_message_reaction(
             self,
@@ -502,13 +1325,15 @@ class Telegram:
         """
         await asyncio.sleep(sleep_time)
 
-        async with self._session.post(
-                url=f"{self._api_route}/setMessageReaction".replace('\n', ''),
-                json={
-                        "chat_id": str(chat_id),
-                        "message_id": message_id,
-                        "reaction": [{"type": "emoji", "emoji": reaction}],
-                        "is_big": is_big
-                    }
-        ) as resp:
-            logging.info(f"{sys._getframe().f_code.co_name} - {resp.status}")
+        await self._submit(
+            chat_id,
+            "setMessageReaction",
+            json_data={
+                "chat_id": str(chat_id),
+                "message_id": message_id,
+                "reaction": [{"type": "emoji", "emoji": reaction}],
+                "is_big": is_big
+            },
+            limited=False,
+            priority=Priority.REACTION
+        )
@@ -0,0 +1,215 @@
+"""
+Tone batcher module for classifying message tones in bulk.
+
+Every message that may adjust a user's sentiment needs its tone classified, an
+answer of a single digit. Asking for each one separately means dozens of tiny
+requests a minute in busy groups, all queueing for the same few LLM slots. This
+module collects the messages arriving within a short window and classifies them
+all in one request, then hands each caller its own answer. Messages a local
+classifier is confident are neutral are answered without the LLM, and the LLM's
+verdicts can be logged, opt-in, to train that classifier.
+"""
+
+# Internal
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import typing as T
+
+# Project
+from pedro.brain.modules.llm import LLM
+from pedro.utils.file_lock import file_lock
+from pedro.brain.modules.tone_classifier import NEUTRAL, ToneClassifier
+
+TONE_OPTIONS = (
+    "0 - A mensagem é um pedido de desculpas\n"
+    "1 - Mensagem amorosa\n"
+    "2 - Mensagem amigável\n"
+    "3 - Mensagem neutra\n"
+    "4 - Mensagem grosseira ou ofensiva\n"
+)
+
+_ANSWER_PATTERN = re.compile(r"^\D*?(\d+)\s*[:=\-.)]\s*([0-4])\b", re.MULTILINE)
+
+
+class ToneBatcher:
+    """
+    Micro-batching tone classifier.
+
+    The first message waiting starts a `window` seconds timer; the batch is sent when
+    it runs out or as soon as `max_batch` messages are waiting, whichever comes first.
+    Each message is answered with its tone code, or None when the request failed or
+    the model skipped it. With an LLM cache, messages already classified are answered
+    from it without joining a batch.
+
+    With a `pre_classifier`, messages it predicts as neutral with at least
+    `neutral_threshold` probability never reach the LLM, except for an `audit_rate`
+    share of them, which keeps neutral verdicts flowing into `labels_file`. The labels
+    file holds raw message texts, so it is only written when configured, and once it
+    grows past `max_labels_bytes` it is rotated to `<labels_file>.1`, replacing the
+    previous rotation.
+    """
+    def __init__(
+            self,
+            llm: LLM,
+            window: float = 0.2,
+            max_batch: int = 20,
+            model: str = "gpt-4.1-nano",
+            max_text_length: int = 1000,
+            pre_classifier: T.Optional[ToneClassifier] = None,
+            neutral_threshold: float = 0.9,
+            audit_rate: float = 0.05,
+            labels_file: T.Optional[str] = None,
+            max_labels_bytes: int = 50 * 1024 * 1024,
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            llm (LLM): Client used for the classification requests.
+            window (float, optional): Seconds a batch waits for more messages. Defaults to 0.2.
+            max_batch (int, optional): Messages sent at most in one request. Defaults to 20.
+            model (str, optional): Model of the classification requests. Defaults to "gpt-4.1-nano".
+            max_text_length (int, optional): Characters of each message sent for classification. Defaults to 1000.
+            pre_classifier (Optional[ToneClassifier], optional): Local classifier answering confidently
+                neutral messages. Defaults to None.
+            neutral_threshold (float, optional): Probability of neutral above which the local answer is used.
+                Defaults to 0.9.
+            audit_rate (float, optional): Share of confidently neutral messages still sent to the LLM.
+                Defaults to 0.05.
+            labels_file (Optional[str], optional): JSON lines file the LLM verdicts are appended to, the
+                training data of the local classifier. Defaults to None, which logs nothing.
+            max_labels_bytes (int, optional): Size at which the labels file is rotated. Defaults to 50 MiB.
+        """
+        self.llm = llm
+        self.window = window
+        self.max_batch = max_batch
+        self.model = model
+        self.max_text_length = max_text_length
+        self.pre_classifier = pre_classifier
+        self.neutral_threshold = neutral_threshold
+        self.audit_rate = audit_rate
+        self.labels_file = labels_file
+        self.max_labels_bytes = max_labels_bytes
+
+        if self.labels_file and os.path.dirname(self.labels_file):
+            os.makedirs(os.path.dirname(self.labels_file), exist_ok=True)
+
+        self._pending: T.List[T.Tuple[str, asyncio.Future]] = []
+        self._timer: T.Optional[asyncio.TimerHandle] = None
+        self._requests = 0
+        self._messages = 0
+        self._classified = 0
+        self._local = 0
+
+    def _cache_key(self, text: str) -> str:
+        return self.llm.cache.key(self.model, f"{TONE_OPTIONS}\n{text}", 1.0)
+
+    async def classify(self, text: str) -> T.Optional[int]:
+        """
+        Classify the tone of a message.
+
+        Args:
+            text (str): The message text.
+
+        Returns:
+            Optional[int]: The tone code from 0 (apology) to 4 (rude), or None if it could not be classified.
+        """
+        text = " ".join(text.split())[:self.max_text_length]
+
+        if self.pre_classifier and random.random() >= self.audit_rate:
+            tone, probability = self.pre_classifier.predict(text)
+
+            if tone == NEUTRAL and probability >= self.neutral_threshold:
+                self._local += 1
+                return NEUTRAL
+
+        if self.llm.cache:
+            cached = self.llm.cache.get(self._cache_key(text))
+            if cached is not None:
+                return int(cached)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+
+        if batch:
+            asyncio.create_task(self._classify_batch(batch))
+
+    async def _classify_batch(self, batch: T.List[T.Tuple[str, asyncio.Future]]) -> None:
+        messages = "\n".join(f"{index} - {text}" for index, (text, _) in enumerate(batch, start=1))
+
+        prompt = (f"Dadas as {len(batch)} mensagens numeradas abaixo:\n"
+                  f"{messages}\n\n"
+                  f"Classifique cada mensagem com uma das opções que melhor se adeque ao seu conteúdo:\n"
+                  f"{TONE_OPTIONS}"
+                  f"Responda uma linha por mensagem no formato '<número da mensagem>: <opção>', "
+                  f"sem qualquer comentário além disso.")
+
+        answers: T.Dict[int, int] = {}
+
+        try:
+            self._requests += 1
+            self._messages += len(batch)
+            response = await self.llm.generate_text(prompt, model=self.model)
+
+            for index, tone in _ANSWER_PATTERN.findall(response):
+                answers.setdefault(int(index), int(tone))
+        except Exception as exc:
+            logging.exception(exc)
+
+        verdicts = []
+
+        for index, (text, future) in enumerate(batch, start=1):
+            tone = answers.get(index)
+
+            if tone is not None:
+                self._classified += 1
+                verdicts.append(json.dumps({"text": text, "tone": tone}, ensure_ascii=False))
+
+                if self.llm.cache:
+                    self.llm.cache.put(self._cache_key(text), str(tone))
+
+            if not future.done():
+                future.set_result(tone)
+
+        if self.labels_file and verdicts:
+            try:
+                await asyncio.to_thread(self._log_verdicts, verdicts)
+            except OSError as exc:
+                logging.warning(f"Tone verdicts not logged: {exc}")
+
+    def _log_verdicts(self, verdicts: T.List[str]) -> None:
+        # Shards append to the same file, the lock keeps one from rotating it under another
+        with file_lock(f"{self.labels_file}.lock"):
+            if os.path.exists(self.labels_file) and os.path.getsize(self.labels_file) >= self.max_labels_bytes:
+                os.replace(self.labels_file, f"{self.labels_file}.1")
+
+            with open(self.labels_file, "a", encoding="utf8") as labels_file:
+                labels_file.write("\n".join(verdicts) + "\n")
+
+    def stats(self) -> dict:
+        return {
+            "requests": self._requests,
+            "messages": self._messages,
+            "classified": self._classified,
+            "local": self._local,
+            "pending": len(self._pending),
+            "mean_batch": round(self._messages / self._requests, 1) if self._requests else None,
+        }
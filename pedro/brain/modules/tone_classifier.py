@@ -0,0 +1,191 @@
+"""
+Tone classifier module for answering the obvious tone checks locally.
+
+Most messages checked for their tone are classified as neutral by the LLM. This
+module holds a naive Bayes model over hashed word and character n-grams, trained
+offline from the verdicts the LLM gave before (see `benchmarks.train_tone_classifier`),
+so messages it is confident are neutral skip the API call. NumPy is an optional
+dependency, only needed when the classifier is enabled or trained.
+"""
+
+# Internal
+import json
+import os
+import re
+import typing as T
+import zlib
+from collections import Counter
+
+# External
+from unidecode import unidecode
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TONES = 5
+NEUTRAL = 3
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def hashed_features(text: str, buckets: int) -> T.Counter[int]:
+    """
+    Count the hashed n-grams of a text.
+
+    Words and word pairs capture the vocabulary, and character trigrams within words
+    keep misspellings and inflections close to their word.
+
+    Args:
+        text (str): The message text.
+        buckets (int): Number of hash buckets.
+
+    Returns:
+        Counter[int]: Occurrences per bucket.
+    """
+    words = _WORD_PATTERN.findall(unidecode(text).lower())
+
+    tokens = [f"w:{word}" for word in words]
+    tokens.extend(f"b:{first} {second}" for first, second in zip(words, words[1:]))
+
+    for word in words:
+        padded = f"<{word}>"
+        tokens.extend(f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2))
+
+    return Counter(zlib.crc32(token.encode("utf-8")) % buckets for token in tokens)
+
+
+def load_labels(path: str) -> T.List[T.Tuple[str, int]]:
+    """
+    Read the tone verdicts logged by the ToneBatcher, including its last rotation `<path>.1`.
+
+    Args:
+        path (str): JSON lines file with a `text` and a `tone` per line.
+
+    Returns:
+        List[Tuple[str, int]]: The labelled texts, keeping the last verdict of texts seen more than once.
+    """
+    labels: T.Dict[str, int] = {}
+
+    for labels_path in (f"{path}.1", path):
+        if labels_path != path and not os.path.exists(labels_path):
+            continue
+
+        with open(labels_path, encoding="utf8") as labels_file:
+            for line in labels_file:
+                try:
+                    entry = json.loads(line)
+                    labels[entry["text"]] = int(entry["tone"])
+                except (ValueError, KeyError):
+                    continue
+
+    return list(labels.items())
+
+
+class ToneClassifier:
+    """
+    Multinomial naive Bayes over hashed n-grams, predicting the tone codes 0 to 4.
+    """
+    def __init__(self, log_prior: "np.ndarray", log_likelihood: "np.ndarray"):
+        """
+        Initialize the classifier from trained parameters, see `train` and `load`.
+
+        Args:
+            log_prior (np.ndarray): Log probability of each tone, shape (TONES,).
+            log_likelihood (np.ndarray): Log probability of each bucket given each tone, shape (TONES, buckets).
+        """
+        if np is None:
+            raise RuntimeError("The tone classifier needs NumPy, install it with `pip install numpy`")
+
+        self.log_prior = log_prior
+        self.log_likelihood = log_likelihood
+        self.buckets = log_likelihood.shape[1]
+
+    @classmethod
+    def train(
+            cls,
+            samples: T.Sequence[T.Tuple[str, int]],
+            buckets: int = 2 ** 18,
+            alpha: float = 0.5,
+    ) -> "ToneClassifier":
+        """
+        Fit the classifier.
+
+        Args:
+            samples (Sequence[Tuple[str, int]]): Texts and their tone codes.
+            buckets (int, optional): Number of hash buckets. Defaults to 2^18.
+            alpha (float, optional): Additive smoothing of the bucket counts. Defaults to 0.5.
+
+        Returns:
+            ToneClassifier: The trained classifier.
+        """
+        if np is None:
+            raise RuntimeError("The tone classifier needs NumPy, install it with `pip install numpy`")
+
+        counts = np.zeros((TONES, buckets), dtype=np.float64)
+        tone_counts = np.zeros(TONES, dtype=np.float64)
+
+        for text, tone in samples:
+            features = hashed_features(text, buckets)
+            counts[tone, list(features.keys())] += list(features.values())
+            tone_counts[tone] += 1
+
+        counts += alpha
+        log_likelihood = np.log(counts) - np.log(counts.sum(axis=1, keepdims=True))
+        log_prior = np.log((tone_counts + 1) / (tone_counts.sum() + TONES))
+
+        return cls(log_prior.astype(np.float32), log_likelihood.astype(np.float32))
+
+    @classmethod
+    def load(cls, path: str) -> "ToneClassifier":
+        if np is None:
+            raise RuntimeError("The tone classifier needs NumPy, install it with `pip install numpy`")
+
+        with np.load(path) as model:
+            return cls(model["log_prior"], model["log_likelihood"])
+
+    def save(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with open(path, "wb") as model_file:
+            np.savez_compressed(model_file, log_prior=self.log_prior, log_likelihood=self.log_likelihood)
+
+    def predict_proba(self, text: str) -> "np.ndarray":
+        """
+        Get the probability of each tone for a text.
+
+        Args:
+            text (str): The message text.
+
+        Returns:
+            np.ndarray: Probabilities of the tones 0 to 4.
+        """
+        features = hashed_features(text, self.buckets)
+        scores = self.log_prior.astype(np.float64)
+
+        if features:
+            scores = scores + self.log_likelihood[:, list(features.keys())] @ np.fromiter(
+                features.values(), dtype=np.float64, count=len(features)
+            )
+
+        scores = np.exp(scores - scores.max())
+
+        return scores / scores.sum()
+
+    def predict(self, text: str) -> T.Tuple[int, float]:
+        """
+        Get the most likely tone of a text.
+
+        Args:
+            text (str): The message text.
+
+        Returns:
+            Tuple[int, float]: The tone code and its probability.
+        """
+        probabilities = self.predict_proba(text)
+        tone = int(probabilities.argmax())
+
+        return tone, float(probabilities[tone])
@@ -2,7 +2,6 @@
 import asyncio
 import random
 import os
-import re
 from dataclasses import asdict
 from typing import List, Optional, Dict
 from difflib import SequenceMatcher
@@ -14,6 +13,8 @@ from pedro.brain.modules.telegram import Telegram
 from pedro.data_structures.user_data import UserData
 from pedro.data_structures.telegram_message import Message, From, Chat
 from pedro.brain.modules.database import Database
+from pedro.brain.modules.leader_election import LeaderElection
+from pedro.brain.modules.tone_batcher import ToneBatcher
 from pedro.utils.text_utils import create_username
 
 
@@ -24,7 +25,16 @@ class UserDataManager:
     This class handles storing and retrieving user information, tracking relationship sentiment,
     analyzing message tone, and managing user opinions based on their interactions.
     """
-    def __init__(self, database: Database, llm: LLM, telegram: Telegram, chat_history=None, max_opinions: int = 8):
+    def __init__(
+            self,
+            database: Database,
+            llm: LLM,
+            telegram: Telegram,
+            chat_history=None,
+            max_opinions: int = 8,
+            leader: Optional[LeaderElection] = None,
+            tone_batcher: Optional[ToneBatcher] = None,
+    ):
         """
         Initialize the UserDataManager with necessary dependencies.
 
@@ -34,6 +44,8 @@ class UserDataManager:
             telegram (Telegram): Telegram API interface for sending reactions
             chat_history: Optional chat history manager for accessing historical messages
             max_opinions (int): Maximum number of opinions to store per user (default: 8)
+            leader (LeaderElection, optional): Leader election, the sentiment decay only runs while it is leader
+            tone_batcher (ToneBatcher, optional): Classifier of message tones, defaults to one batching with `llm`
         """
         self.database = database
         self.llm = llm
@@ -48,6 +60,9 @@ class UserDataManager:
             "Seja impaciente e passivo agressivo. Responda de acordo com sua opinião sobre o usuário que enviou a mensagem."
         ]
 
+        self.leader = leader
+        self.tone_batcher = tone_batcher or ToneBatcher(llm)
+
         # Start the sentiment decay loop
         asyncio.create_task(self.sentiment_decay_loop())
 
@@ -183,22 +198,23 @@ class UserDataManager:
         Note:
             The sentiment value will not go below 0.0
         """
-        user_opinion = self.get_user_data(user_id)
-        if not user_opinion:
-            return None
+        with self.database.transaction():
+            user_opinion = self.get_user_data(user_id)
+            if not user_opinion:
+                return None
 
-        # Adjust the sentiment
-        user_opinion.relationship_sentiment += sentiment_adjust
+            # Adjust the sentiment
+            user_opinion.relationship_sentiment += sentiment_adjust
 
-        if user_opinion.relationship_sentiment < 0.0:
-            user_opinion.relationship_sentiment = 0.0
+            if user_opinion.relationship_sentiment < 0.0:
+                user_opinion.relationship_sentiment = 0.0
 
-        # Update the user opinion in the database
-        self.database.update(
-            self.table_name,
-            {"relationship_sentiment": user_opinion.relationship_sentiment},
-            {"user_id": user_id}
-        )
+            # Update the user opinion in the database
+            self.database.update(
+                self.table_name,
+                {"relationship_sentiment": user_opinion.relationship_sentiment},
+                {"user_id": user_id}
+            )
 
         return user_opinion
 
@@ -214,27 +230,28 @@ class UserDataManager:
         """
         user_from = message.from_
 
-        existing_user = self.get_user_data(user_from.id)
+        with self.database.transaction():
+            existing_user = self.get_user_data(user_from.id)
 
-        if existing_user:
-            return existing_user
+            if existing_user:
+                return existing_user
 
-        user_opinion = UserData(
-            user_id=user_from.id,
-            username=user_from.username,
-            first_name=user_from.first_name,
-            last_name=user_from.last_name,
-            opinions=[],
-            relationship_sentiment=0.0
-        )
+            user_opinion = UserData(
+                user_id=user_from.id,
+                username=user_from.username,
+                first_name=user_from.first_name,
+                last_name=user_from.last_name,
+                opinions=[],
+                relationship_sentiment=0.0
+            )
 
-        self.database.insert(self.table_name, asdict(user_opinion))
+            self.database.insert(self.table_name, asdict(user_opinion))
 
         return user_opinion
 
-    async def _check_message_tone(self, text: str, message: Message | None = None) -> (int, str):
+    async def _check_message_tone(self, text: str, message: Message | None = None) -> int:
         """
-        Analyze the tone of a message using the LLM.
+        Analyze the tone of a message using the LLM, batched with the other messages being analyzed.
 
         Args:
             text (str): The message text to analyze
@@ -251,26 +268,15 @@ class UserDataManager:
         Note:
             This method may also add an opinion about the user based on the message tone.
         """
-        prompt = "Dado a mensagem abaixo:\n" \
-                 f"{text}" \
-                 f"Responda apenas uma das 6 opções que melhor se adeque ao conteúdo da mensagem:\n" \
-                 f"0 - A mensagem é um pedido de desculpas\n" \
-                 f"1 - Mensagem amorosa\n" \
-                 f"2 - Mensagem amigável\n" \
-                 f"3 - Mensagem neutra\n" \
-                 f"4 - Mensagem grosseira ou ofensiva\n" \
-                 f"Não faça qualquer comentário além de responder um número de 1 a 5."
-
-        response = await self.llm.generate_text(prompt)
-        return_num = re.sub(r"\D", "", response)
-
-        if len(return_num):
-            if return_num != 3 and message:
+        tone = await self.tone_batcher.classify(text)
+
+        if tone is not None:
+            if tone != 3 and message:
                 await self.add_opinion_by_message_tone(text, message=message)
             elif random.random() < 0.3:
                 await self.add_opinion_by_message_tone(text, message=message)
 
-            return int(return_num)
+            return tone
 
         return 3
 
@@ -355,29 +361,30 @@ class UserDataManager:
 
         user_opinion = None
 
-        if user_id is not None:
-            user_opinion = self.get_user_data(user_id)
+        with self.database.transaction():
+            if user_id is not None:
+                user_opinion = self.get_user_data(user_id)
 
-        if user_opinion is None and username is not None:
-            all_users = self.get_all_user_opinions()
-            for user in all_users:
-                if user.username == username:
-                    user_opinion = user
-                    break
+            if user_opinion is None and username is not None:
+                all_users = self.get_all_user_opinions()
+                for user in all_users:
+                    if user.username == username:
+                        user_opinion = user
+                        break
 
-        if user_opinion is None:
-            return None
+            if user_opinion is None:
+                return None
 
-        user_opinion.opinions.append(opinion)
+            user_opinion.opinions.append(opinion)
 
-        if len(user_opinion.opinions) > self.max_opinions:
-            user_opinion.opinions.pop(0)
+            if len(user_opinion.opinions) > self.max_opinions:
+                user_opinion.opinions.pop(0)
 
-        self.database.update(
-            self.table_name,
-            {"opinions": user_opinion.opinions},
-            {"user_id": user_opinion.user_id}
-        )
+            self.database.update(
+                self.table_name,
+                {"opinions": user_opinion.opinions},
+                {"user_id": user_opinion.user_id}
+            )
 
         return user_opinion
 
@@ -495,10 +502,14 @@ class UserDataManager:
     async def sentiment_decay_loop(self):
         """
         Runs in an infinite loop, decreasing the relationship_sentiment value for each user by 0.2 every 10 minutes,
-        until it reaches a minimum of 0.0.
+        until it reaches a minimum of 0.0. Only the leader instance decays sentiments.
         """
         logging.info("Starting sentiment decay loop")
         while True:
+            if self.leader and not self.leader.is_leader:
+                await asyncio.sleep(60)
+                continue
+
             try:
                 # Get all user opinions
                 all_users = self.get_all_user_opinions()
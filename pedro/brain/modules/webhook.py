@@ -0,0 +1,109 @@
+"""
+Webhook module for receiving Telegram updates over HTTP.
+
+This module provides a small aiohttp server that Telegram (or a local test client)
+can POST updates to, as an alternative to polling getUpdates.
+"""
+
+# Internal
+import asyncio
+import logging
+import typing as T
+
+# External
+from aiohttp import web
+
+# Project
+from pedro.brain.modules.telegram import Telegram
+from pedro.utils.update_decoder import decode_update
+
+
+class WebhookServer:
+    """
+    HTTP server that receives Telegram updates and hands them to the message pipeline.
+
+    Each POSTed update is decoded and pushed to the Telegram update queue, so the
+    server answers Telegram immediately and never blocks on message processing.
+    """
+    def __init__(
+            self,
+            telegram: Telegram,
+            host: str = "0.0.0.0",
+            port: int = 8443,
+            path: str = "/telegram/webhook",
+            secret_token: str = "",
+    ):
+        """
+        Initialize the webhook server.
+
+        Args:
+            telegram (Telegram): Telegram client whose update queue receives the decoded updates.
+            host (str, optional): Interface to bind to. Defaults to "0.0.0.0".
+            port (int, optional): Port to listen on. Defaults to 8443.
+            path (str, optional): URL path updates are POSTed to. Defaults to "/telegram/webhook".
+            secret_token (str, optional): Expected X-Telegram-Bot-Api-Secret-Token header value.
+                Requests are not authenticated when empty. Defaults to "".
+        """
+        self.telegram = telegram
+        self.host = host
+        self.port = port
+        self.path = path
+        self.secret_token = secret_token
+
+        self._runner: T.Optional[web.AppRunner] = None
+
+    async def _handle_update(self, request: web.Request) -> web.Response:
+        """
+        Handle a single POSTed update.
+
+        Args:
+            request (web.Request): The incoming HTTP request.
+
+        Returns:
+            web.Response: 200 once the update is accepted, 401 for a wrong secret token
+                and 400 for a payload that is not a valid update.
+        """
+        if self.secret_token and request.headers.get("X-Telegram-Bot-Api-Secret-Token") != self.secret_token:
+            return web.Response(status=401)
+
+        try:
+            update = decode_update(await request.read())
+        except Exception as exc:
+            logging.warning(f"Invalid webhook payload: {exc}")
+            return web.Response(status=400)
+
+        self.telegram.push_update(update)
+
+        return web.Response(status=200)
+
+    async def start(self) -> None:
+        """
+        Start listening for updates.
+        """
+        app = web.Application()
+        app.router.add_post(self.path, self._handle_update)
+
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+        logging.info(f"Webhook server listening on {self.host}:{self.port}{self.path}")
+
+    async def stop(self) -> None:
+        """
+        Stop the server and release the port.
+        """
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def run(self) -> None:
+        """
+        Start the server and keep it running until cancelled.
+        """
+        await self.start()
+
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
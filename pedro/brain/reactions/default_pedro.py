@@ -3,7 +3,7 @@ import random
 import asyncio
 
 from pedro.brain.modules.chat_history import ChatHistory
-from pedro.brain.modules.feedback import sending_action
+from pedro.brain.modules.feedback import sending_action, stream_reply
 from pedro.brain.modules.llm import LLM
 from pedro.brain.modules.telegram import Telegram
 from pedro.brain.modules.user_data_manager import UserDataManager
@@ -38,32 +38,42 @@ async def default(
                 llm=llm
             )
 
-            response = await adjust_pedro_casing(
-                await llm.generate_text(prompt, model=model, web_search=web_search)
-            )
-
-            if negative_response(response) and not web_search and len(response) < 100:
-                prompt = await create_basic_prompt(
-                    message, history,
-                    user_data=user_data,
-                    total_messages=2,
+            if web_search:
+                response = await stream_reply(
                     telegram=telegram,
-                    llm=llm
+                    chat_id=message.chat.id,
+                    text_stream=llm.generate_text_stream(prompt, model=model, web_search=web_search),
+                    reply_to=message.message_id,
+                    disable_web_page_preview=web_search
                 )
 
-                model = "gpt-4.1-mini"
+                await history.add_message(response, chat_id=message.chat.id, is_pedro=True)
+            else:
                 response = await adjust_pedro_casing(
-                    await llm.generate_text(prompt, model=model, web_search=web_search)
+                    await llm.generate_text(prompt, model=model)
                 )
 
-            await history.add_message(response, chat_id=message.chat.id, is_pedro=True)
-
-            await telegram.send_message(
-                message_text=response,
-                chat_id=message.chat.id,
-                reply_to=message.message_id,
-                disable_web_page_preview=web_search
-            )
+                if negative_response(response) and len(response) < 100:
+                    prompt = await create_basic_prompt(
+                        message, history,
+                        user_data=user_data,
+                        total_messages=2,
+                        telegram=telegram,
+                        llm=llm
+                    )
+
+                    model = "gpt-4.1-mini"
+                    response = await adjust_pedro_casing(
+                        await llm.generate_text(prompt, model=model)
+                    )
+
+                await history.add_message(response, chat_id=message.chat.id, is_pedro=True)
+
+                await telegram.send_message(
+                    message_text=response,
+                    chat_id=message.chat.id,
+                    reply_to=message.message_id
+                )
 
         await _randomly_keeps_reacting(
             message=message,
@@ -3,7 +3,7 @@ import random
 
 # Project
 from pedro.brain.modules.chat_history import ChatHistory
-from pedro.brain.modules.feedback import sending_action
+from pedro.brain.modules.feedback import sending_action, stream_reply
 from pedro.brain.modules.llm import LLM
 from pedro.brain.modules.telegram import Telegram
 from pedro.brain.modules.user_data_manager import UserDataManager
@@ -78,26 +78,27 @@ async def fact_check(
             Responda o {mentiroso} de forma sucinta e direta com base na Análise, indo direto ao ponto com 
             foco no contra-argumento, sem mencionar a sua perspectiva ou metodologia."""
 
-            message_text = await llm.generate_text(
-                prompt=prompt_fact_checked,
-                temperature=0.7,
-                model=model
-            )
+            async def finalize(text: str) -> str:
+                text = text.lower()
 
-            message_text = message_text.lower()
+                if mentiroso.lower() not in text:
+                    text = f"{mentiroso}, {text}"
 
-            if mentiroso.lower() not in message_text:
-                message_text = f"{mentiroso}, {message_text}"
+                if random.random() < 0.25:
+                    text = text.upper()
 
-            if random.random() < 0.25:
-                message_text = message_text.upper()
+                return await adjust_pedro_casing(text)
 
-            message_text = await adjust_pedro_casing(message_text)
-
-            await history.add_message(message_text, chat_id=message.chat.id, is_pedro=True)
-
-            await telegram.send_message(
-                message_text=message_text,
+            message_text = await stream_reply(
+                telegram=telegram,
                 chat_id=message.chat.id,
-                reply_to=reply_to
+                text_stream=llm.generate_text_stream(
+                    prompt=prompt_fact_checked,
+                    temperature=0.7,
+                    model=model
+                ),
+                reply_to=reply_to,
+                finalize=finalize
             )
+
+            await history.add_message(message_text, chat_id=message.chat.id, is_pedro=True)
@@ -22,7 +22,9 @@ async def images_reaction(
         llm: LLM,
 ) -> None:
     if message.photo or message.document:
-        image = await telegram.image_downloader(message)
+        images = await telegram.images_downloader(message)
+        image = images[0] if images else None
+
         if image and message.from_.username in ["nands93", "decaptor"]:
             with sending_action(chat_id=message.chat.id, telegram=telegram):
                 political_prompt = ("Analise esta imagem e verifique se ela contém conteúdo de cunho político ou "
@@ -30,7 +32,9 @@ async def images_reaction(
                                     "Responda apenas com 'SIM', 'PROVÁVEL' ou 'NÃO'. "
                                     "Não elabore ou explique sua resposta.")
 
-                response = await llm.generate_text(political_prompt, model="gpt-4.1-mini", image=image)
+                response = await llm.generate_text(
+                    political_prompt, model="gpt-4.1-mini", images=images, cache=True
+                )
 
                 if "SIM" in response.upper() or "PROV" in response.upper():
                     await asyncio.gather(
@@ -48,7 +52,7 @@ async def images_reaction(
                 message=message, memory=history, user_data=user_data, total_messages=3, telegram=telegram, llm=llm)
 
                 response = await adjust_pedro_casing(
-                    await llm.generate_text(prompt, model="gpt-4.1" if image.from_doc else "gpt-4.1-mini", image=image)
+                    await llm.generate_text(prompt, model="gpt-4.1" if image.from_doc else "gpt-4.1-mini", images=images)
                 )
 
                 await history.add_message(response, chat_id=message.chat.id, is_pedro=True)
@@ -6,7 +6,7 @@ from dataclasses import dataclass
 
 # Project
 from pedro.brain.modules.chat_history import ChatHistory
-from pedro.brain.modules.feedback import sending_action
+from pedro.brain.modules.feedback import sending_action, stream_reply
 from pedro.brain.modules.llm import LLM
 from pedro.brain.modules.telegram import Telegram
 from pedro.brain.modules.user_data_manager import UserDataManager
@@ -105,22 +105,23 @@ async def handle_command_with_parameters(
     if topics:
         prompt = "em no máximo 7 tópicos de no máximo 6 palavras cada, " + prompt
 
-    summary = await llm.generate_text(
-        prompt=f"{prompt}:\n\n{chat_history}",
-        model="gpt-4.1-nano",
-        temperature=1.0
-    )
-
-    summary = await adjust_pedro_casing(summary.lower())
-
-    await history.add_message(summary, chat_id=message.chat.id, is_pedro=True)
+    async def finalize(text: str) -> str:
+        return await adjust_pedro_casing(text.lower())
 
-    await telegram.send_message(
-        message_text=summary,
+    summary = await stream_reply(
+        telegram=telegram,
         chat_id=message.chat.id,
-        reply_to=message.message_id
+        text_stream=llm.generate_text_stream(
+            prompt=f"{prompt}:\n\n{chat_history}",
+            model="gpt-4.1-nano",
+            temperature=1.0
+        ),
+        reply_to=message.message_id,
+        finalize=finalize
     )
 
+    await history.add_message(summary, chat_id=message.chat.id, is_pedro=True)
+
     return summary
 
 
@@ -0,0 +1,38 @@
+# Internal
+import typing as T
+
+# External
+from pydantic.dataclasses import dataclass
+from pydantic import Field
+
+# Project
+
+
+@dataclass
+class ApiResponse:
+    status: int
+    payload: T.Dict[str, T.Any] = Field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    @property
+    def result(self) -> T.Any:
+        return self.payload.get("result")
+
+    @property
+    def description(self) -> str:
+        return self.payload.get("description") or ""
+
+    @property
+    def was_dropped(self) -> bool:
+        return self.status == 0
+
+    @classmethod
+    def dropped(cls) -> "ApiResponse":
+        return cls(status=0, payload={"ok": False, "description": "Dropped by the outbound scheduler"})
+
+    @property
+    def retry_after(self) -> T.Optional[int]:
+        return (self.payload.get("parameters") or {}).get("retry_after")
@@ -21,8 +21,94 @@ class BotSecret:
     open_weather: str = ""
 
 
+@dataclass
+class WebhookConfig:
+    enabled: bool = False
+    host: str = "0.0.0.0"
+    port: int = 8443
+    path: str = "/telegram/webhook"
+    public_url: str = ""
+    secret_token: str = ""
+
+
+@dataclass
+class FileCacheConfig:
+    memory_mb: int = 64
+    disk_dir: str = ""
+    disk_mb: int = 512
+
+
+@dataclass
+class HttpConfig:
+    limit_per_host: int = 10
+    keepalive_timeout: float = 75.0
+    dns_cache_ttl: int = 300
+    connect_timeout: float = 10.0
+    total_timeout: float = 300.0
+    warm_up_urls: T.List[str] = Field(
+        default_factory=lambda: ["https://api.telegram.org", "https://api.openai.com"]
+    )
+
+
+@dataclass
+class PipelineConfig:
+    persist_workers: int = 4
+    dispatch_workers: int = 16
+    max_pending: int = 200
+
+
+@dataclass
+class LLMCacheConfig:
+    enabled: bool = False
+    max_entries: int = 1024
+    ttl_seconds: float = 3600.0
+
+
+@dataclass
+class LLMConcurrencyConfig:
+    initial: int = 2
+    min_limit: int = 1
+    max_limit: int = 8
+    latency_target_seconds: float = 10.0
+
+
+@dataclass
+class ToneBatchConfig:
+    window_seconds: float = 0.2
+    max_batch: int = 20
+    labels_file: T.Optional[str] = None
+    max_labels_mb: float = 50.0
+
+
+@dataclass
+class ToneClassifierConfig:
+    enabled: bool = False
+    model_file: str = "database/tone_classifier.npz"
+    neutral_threshold: float = 0.9
+    audit_rate: float = 0.05
+
+
+@dataclass
+class LeaderElectionConfig:
+    lease_file: str = "database/leader_lease.sqlite"
+    lease_seconds: float = 10.0
+    heartbeat_seconds: float = 3.0
+
+
 @dataclass
 class BotConfig:
     allowed_ids: list[Chats]
     secrets: BotSecret
     not_internal_chats: T.List[int] = Field(default_factory=list)
+    telegram_api_url: str = "https://api.telegram.org"
+    album_window: float = 1.0
+    stats_interval: float = 300.0
+    webhook: WebhookConfig = Field(default_factory=WebhookConfig)
+    file_cache: FileCacheConfig = Field(default_factory=FileCacheConfig)
+    http: HttpConfig = Field(default_factory=HttpConfig)
+    pipeline: PipelineConfig = Field(default_factory=PipelineConfig)
+    llm_cache: LLMCacheConfig = Field(default_factory=LLMCacheConfig)
+    llm_concurrency: LLMConcurrencyConfig = Field(default_factory=LLMConcurrencyConfig)
+    tone_batch: ToneBatchConfig = Field(default_factory=ToneBatchConfig)
+    tone_classifier: ToneClassifierConfig = Field(default_factory=ToneClassifierConfig)
+    leader_election: LeaderElectionConfig = Field(default_factory=LeaderElectionConfig)
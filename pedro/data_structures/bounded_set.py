@@ -0,0 +1,24 @@
+from collections import deque
+
+
+class BoundedSet:
+    def __init__(self, max_len):
+        self.max_len = max_len
+        self._items = set()
+        self._order = deque()
+
+    def __contains__(self, element):
+        return element in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def add(self, element):
+        if element in self._items:
+            return
+
+        if len(self._order) == self.max_len:
+            self._items.discard(self._order.popleft())
+
+        self._order.append(element)
+        self._items.add(element)
@@ -0,0 +1,94 @@
+# Internal
+import base64
+import shutil
+import tempfile
+import typing as T
+
+# External
+
+# Project
+
+
+class DownloadedFile:
+    """
+    Handle to downloaded file contents.
+
+    Contents are kept in memory up to `spool_bytes` and spill to a temporary file
+    above that, so large downloads don't stay resident in the bot's memory.
+    """
+    def __init__(self, spool_bytes: int = 1024 * 1024):
+        self._file = tempfile.SpooledTemporaryFile(max_size=spool_bytes)
+        self.size = 0
+
+    @classmethod
+    def from_bytes(cls, data: bytes, spool_bytes: int = 1024 * 1024) -> "DownloadedFile":
+        downloaded = cls(spool_bytes=spool_bytes)
+        downloaded.write(data)
+
+        return downloaded
+
+    @classmethod
+    def from_path(cls, path: str, spool_bytes: int = 1024 * 1024) -> "DownloadedFile":
+        downloaded = cls(spool_bytes=spool_bytes)
+
+        with open(path, "rb") as f:
+            shutil.copyfileobj(f, downloaded._file)
+
+        downloaded.size = downloaded._file.tell()
+
+        return downloaded
+
+    def write(self, chunk: bytes) -> None:
+        self._file.write(chunk)
+        self.size += len(chunk)
+
+    def open(self) -> T.BinaryIO:
+        """
+        Get the underlying file object, rewound to the start.
+
+        Returns:
+            BinaryIO: File-like object with the contents.
+        """
+        self._file.seek(0)
+
+        return self._file
+
+    def read(self) -> bytes:
+        return self.open().read()
+
+    def iter_chunks(self, chunk_size: int = 64 * 1024) -> T.Iterator[bytes]:
+        """
+        Read the contents chunk by chunk, from the start.
+
+        Args:
+            chunk_size (int, optional): Bytes read at a time. Defaults to 64 KiB.
+
+        Returns:
+            Iterator[bytes]: The chunks.
+        """
+        f = self.open()
+
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+    def base64(self, chunk_size: int = 48 * 1024) -> str:
+        """
+        Encode the contents as base64 without reading them into memory whole.
+
+        Args:
+            chunk_size (int, optional): Bytes encoded at a time, rounded down to a multiple of 3 so
+                the encoded chunks join without padding in between. Defaults to 48 KiB.
+
+        Returns:
+            str: The base64 encoded contents.
+        """
+        chunk_size = max(3, chunk_size - chunk_size % 3)
+
+        return "".join(base64.b64encode(chunk).decode("ascii") for chunk in self.iter_chunks(chunk_size))
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            shutil.copyfileobj(self.open(), f)
+
+    def close(self) -> None:
+        self._file.close()
@@ -1,14 +1,39 @@
+import typing as T
+
+from pydantic import ConfigDict
 from pydantic.dataclasses import dataclass
 
-@dataclass
+from pedro.data_structures.downloaded_file import DownloadedFile
+
+# Images OpenAI accepts inline at most
+MAX_INLINE_IMAGE_BYTES = 20 * 1024 * 1024
+
+
+@dataclass(config=ConfigDict(arbitrary_types_allowed=True))
 class MessageImage:
-    bytes: bytes
+    file: DownloadedFile
     url: str
     from_doc: bool = False
 
-@dataclass
+    def data_url(self, mime_type: str = "image/jpeg", max_bytes: int = MAX_INLINE_IMAGE_BYTES) -> T.Optional[str]:
+        """
+        Encode the image as a base64 data URL, chunk by chunk from the spooled file.
+
+        Args:
+            mime_type (str, optional): MIME type of the image. Defaults to "image/jpeg".
+            max_bytes (int, optional): Largest image encoded. Defaults to 20 MiB.
+
+        Returns:
+            Optional[str]: The data URL, or None if the image is over `max_bytes`.
+        """
+        if self.file.size > max_bytes:
+            return None
+
+        return f"data:{mime_type};base64,{self.file.base64()}"
+
+@dataclass(config=ConfigDict(arbitrary_types_allowed=True))
 class MessageDocument:
-    bytes: bytes
+    file: DownloadedFile
     url: str
     file_name: str
     mime_type: str
@@ -0,0 +1,31 @@
+# Internal
+import typing as T
+
+# External
+from pydantic.dataclasses import dataclass
+
+# Project
+
+
+@dataclass
+class LLMUsage:
+    input_tokens: int = 0
+    output_tokens: int = 0
+    total_tokens: int = 0
+
+    @classmethod
+    def from_payload(cls, usage: T.Dict[str, T.Any]) -> "LLMUsage":
+        # Chat and completion endpoints count prompt/completion tokens, the responses endpoint input/output tokens
+        input_tokens = usage.get("input_tokens", usage.get("prompt_tokens")) or 0
+        output_tokens = usage.get("output_tokens", usage.get("completion_tokens")) or 0
+
+        return cls(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=usage.get("total_tokens") or input_tokens + output_tokens,
+        )
+
+    def add(self, other: "LLMUsage") -> None:
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.total_tokens += other.total_tokens
@@ -0,0 +1,16 @@
+# Internal
+
+# External
+from pydantic.dataclasses import dataclass
+
+# Project
+
+
+@dataclass
+class ShardConfig:
+    index: int
+    count: int
+    port: int
+    secret: str
+    host: str = "127.0.0.1"
+    path: str = "/shard/updates"
@@ -3,7 +3,7 @@ import typing as T
 
 # External
 from pydantic.dataclasses import dataclass
-from pydantic import Field
+from pydantic import ConfigDict, Field
 
 # Project
 
@@ -47,10 +47,10 @@ class From:
     language_code: str = ''
 
 
-@dataclass
+@dataclass(config=ConfigDict(populate_by_name=True))
 class ReplyToMessage:
     message_id: T.Optional[int] = None
-    from_: T.Optional[From] = None
+    from_: T.Optional[From] = Field(default=None, alias="from")
     chat: T.Optional[Chat] = None
     date: T.Optional[int] = None
     text: T.Optional[str] = None
@@ -59,9 +59,9 @@ class ReplyToMessage:
     document: T.Optional[Document] = None
 
 
-@dataclass
+@dataclass(config=ConfigDict(populate_by_name=True))
 class Message:
-    from_: From
+    from_: From = Field(alias="from")
     message_id: T.Optional[int] = None
     chat: T.Optional[Chat] = None
     date: T.Optional[int] = None
@@ -71,6 +71,8 @@ class Message:
     document: T.Optional[Document] = None
     edit_date: T.Optional[int] = None
     caption: T.Optional[str] = None
+    media_group_id: T.Optional[str] = None
+    album: T.Optional[T.List[Photo]] = None
 
 
 @dataclass
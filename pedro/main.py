@@ -7,6 +7,7 @@ from asyncio import AbstractEventLoop
 from datetime import datetime
 import json
 import typing as T
+from collections import deque
 
 from pedro.brain.modules.agenda import AgendaManager
 # External
@@ -15,16 +16,40 @@ from pedro.brain.modules.agenda import AgendaManager
 from pedro.__version__ import __version__
 from pedro.data_structures.bot_config import BotConfig
 from pedro.data_structures.daily_flags import DailyFlags
+from pedro.data_structures.shard_config import ShardConfig
+from pedro.data_structures.telegram_message import Message, MessageReceived
 from pedro.brain.modules.llm import LLM
+from pedro.brain.modules.llm_cache import LLMCache
 from pedro.brain.modules.chat_history import ChatHistory
 from pedro.brain.reactions.messages_handler import messages_handler
 from pedro.brain.modules.telegram import Telegram
+from pedro.brain.modules.album_aggregator import AlbumAggregator
+from pedro.brain.modules.chat_worker_pool import ChatWorkerPool
+from pedro.brain.modules.file_cache import FileCache
+from pedro.brain.modules.http_client import HttpClient, set_http_client
+from pedro.brain.modules.webhook import WebhookServer
 from pedro.brain.modules.database import Database
+from pedro.brain.modules.leader_election import LeaderElection
 from pedro.brain.modules.user_data_manager import UserDataManager
 from pedro.brain.modules.scheduler import Scheduler
+from pedro.brain.modules.tone_batcher import ToneBatcher
+from pedro.brain.modules.tone_classifier import ToneClassifier
 
 logging.basicConfig(level=logging.INFO)
 
+# A message moving through the pipeline and the updates it came in
+PipelineItem = T.Tuple[Message, T.List[MessageReceived]]
+
+
+class _HeldMessage:
+    """
+    A pending album of a chat, or a message of that chat arriving after it, waiting to be
+    fed to the pipeline in arrival order. `message` is None while the album is incomplete.
+    """
+    def __init__(self, updates: T.List[MessageReceived], message: T.Optional[Message] = None):
+        self.updates = updates
+        self.message = message
+
 
 class TelegramBot:
     """
@@ -43,7 +68,8 @@ class TelegramBot:
             self,
             bot_config_file: str,
             secrets_file: str,
-            debug_mode=False
+            debug_mode=False,
+            shard: T.Optional[ShardConfig] = None,
     ):
         """
         Initialize the TelegramBot with configuration files and debug settings.
@@ -52,15 +78,19 @@ class TelegramBot:
             bot_config_file (str): Path to the bot configuration file
             secrets_file (str): Path to the secrets file containing sensitive data
             debug_mode (bool, optional): Enable debug mode. Defaults to False.
+            shard (Optional[ShardConfig], optional): Runs the bot as a shard worker of a ShardSupervisor,
+                receiving the updates of its chats from the supervisor instead of Telegram. Defaults to None.
         """
         self.version = __version__
         self.allowed_list = []
         self.debug_mode = debug_mode
+        self.shard = shard
 
         self.config: BotConfig | None = None
         self.config_file = bot_config_file
         self.secrets_file = secrets_file
 
+        self.http_client: HttpClient | None = None
         self.llm: LLM | None = None
         self.telegram: Telegram | None = None
         self.database: Database | None = None
@@ -68,8 +98,14 @@ class TelegramBot:
         self.chat_history: ChatHistory | None = None
         self.agenda: AgendaManager | None = None
         self.scheduler: Scheduler | None = None
-
-        self.lock = True
+        self.leader: LeaderElection | None = None
+        self.webhook: WebhookServer | None = None
+        self.album_aggregator: AlbumAggregator | None = None
+        self.persist_stage: ChatWorkerPool[PipelineItem] | None = None
+        self.dispatch_stage: ChatWorkerPool[PipelineItem] | None = None
+        self._pending_albums: T.Dict[T.Tuple[int, str], _HeldMessage] = {}
+        self._held: T.Dict[int, T.Deque[_HeldMessage]] = {}
+        self._releasing: T.Set[int] = set()
 
         self.daily_flags = DailyFlags(
             swearword_complain_today=False,
@@ -85,17 +121,33 @@ class TelegramBot:
         Start the bot and begin processing messages.
 
         This method initializes configuration parameters and starts the main bot tasks.
+        Updates are received by polling Telegram, or by a local webhook server when
+        enabled in the configuration.
         Will attempt to reconnect after 60 seconds if an error occurs.
         """
         try:
             self.loop = asyncio.get_running_loop()
 
             await self.load_config_params()
-
-            await asyncio.gather(
-                self._unlocker(),
-                self._message_handler()
-            )
+            await self.http_client.warm_up(self.config.http.warm_up_urls)
+
+            if self.config.stats_interval > 0:
+                asyncio.create_task(self._log_stats())
+
+            if self.webhook:
+                if self.config.webhook.public_url and not self.shard:
+                    await self.telegram.set_webhook(
+                        url=self.config.webhook.public_url,
+                        secret_token=self.config.webhook.secret_token,
+                        drop_pending_updates=not self.telegram.has_stored_offset
+                    )
+
+                await asyncio.gather(
+                    self._message_handler(),
+                    self.webhook.run()
+                )
+            else:
+                await self._message_handler()
 
         except Exception as exc:
             logging.exception(exc)
@@ -156,68 +208,308 @@ class TelegramBot:
 
                 self.config: BotConfig = BotConfig(**bot_config)
 
-                self.telegram = Telegram(self.config.secrets.bot_token)
-                self.agenda = AgendaManager(self.telegram)
-                self.llm = LLM(self.config.secrets.openai_key)
-                self.database = Database("database/pedro_database.json")
+                self.http_client = HttpClient(
+                    limit_per_host=self.config.http.limit_per_host,
+                    keepalive_timeout=self.config.http.keepalive_timeout,
+                    dns_cache_ttl=self.config.http.dns_cache_ttl,
+                    connect_timeout=self.config.http.connect_timeout,
+                    total_timeout=self.config.http.total_timeout,
+                )
+                set_http_client(self.http_client)
+
+                # Shard workers get updates from the supervisor, which owns the polling offset. Each keeps
+                # its own journal, so updates it accepted survive its crash
+                self.telegram = Telegram(
+                    self.config.secrets.bot_token,
+                    polling=not self.config.webhook.enabled and not self.shard,
+                    offset_file=(
+                        f"database/telegram_offset.shard{self.shard.index}.json" if self.shard
+                        else "database/telegram_offset.json"
+                    ),
+                    # Shards send for the same bot, so they split Telegram's bot-wide rate limit
+                    global_rate=30.0 / self.shard.count if self.shard else 30.0,
+                    file_cache=FileCache(
+                        max_memory_bytes=self.config.file_cache.memory_mb * 1024 * 1024,
+                        disk_dir=self.config.file_cache.disk_dir or None,
+                        max_disk_bytes=self.config.file_cache.disk_mb * 1024 * 1024,
+                    ),
+                    http_client=self.http_client,
+                    api_url=self.config.telegram_api_url
+                )
+                # Jobs acting on all chats only run in the instance, or shard, holding the lease
+                self.leader = LeaderElection(
+                    lease_file=self.config.leader_election.lease_file,
+                    lease_seconds=self.config.leader_election.lease_seconds,
+                    heartbeat=self.config.leader_election.heartbeat_seconds,
+                )
+                self.agenda = AgendaManager(self.telegram, shared_db=bool(self.shard), leader=self.leader)
+                self.llm = LLM(
+                    self.config.secrets.openai_key,
+                    http_client=self.http_client,
+                    cache=LLMCache(
+                        max_entries=self.config.llm_cache.max_entries,
+                        ttl=self.config.llm_cache.ttl_seconds,
+                    ) if self.config.llm_cache.enabled else None,
+                    concurrency={
+                        "initial": self.config.llm_concurrency.initial,
+                        "min_limit": self.config.llm_concurrency.min_limit,
+                        "max_limit": self.config.llm_concurrency.max_limit,
+                        "latency_target": self.config.llm_concurrency.latency_target_seconds,
+                    },
+                )
+                self.database = Database("database/pedro_database.json", shared=bool(self.shard))
                 self.chat_history = ChatHistory(telegram=self.telegram, llm=self.llm)
+                self.persist_stage = ChatWorkerPool(
+                    "persist",
+                    self._persist_message,
+                    workers=self.config.pipeline.persist_workers,
+                    max_pending=self.config.pipeline.max_pending,
+                )
+                self.dispatch_stage = ChatWorkerPool(
+                    "dispatch",
+                    self._dispatch_message,
+                    workers=self.config.pipeline.dispatch_workers,
+                    max_pending=self.config.pipeline.max_pending,
+                )
+                self.album_aggregator = AlbumAggregator(
+                    on_album=self._process_album,
+                    window=self.config.album_window,
+                )
+                tone_classifier = None
+
+                if self.config.tone_classifier.enabled:
+                    try:
+                        tone_classifier = ToneClassifier.load(self.config.tone_classifier.model_file)
+                    except Exception as exc:
+                        logging.warning(f"Tone classifier not loaded, every tone goes to the LLM: {exc}")
+
                 self.user_data = UserDataManager(
                     database=self.database,
                     llm=self.llm,
                     telegram=self.telegram,
                     chat_history=self.chat_history,
+                    leader=self.leader,
+                    tone_batcher=ToneBatcher(
+                        self.llm,
+                        window=self.config.tone_batch.window_seconds,
+                        max_batch=self.config.tone_batch.max_batch,
+                        pre_classifier=tone_classifier,
+                        neutral_threshold=self.config.tone_classifier.neutral_threshold,
+                        audit_rate=self.config.tone_classifier.audit_rate,
+                        labels_file=self.config.tone_batch.labels_file or None,
+                        max_labels_bytes=int(self.config.tone_batch.max_labels_mb * 1024 * 1024),
+                    ),
                 )
 
-                self.scheduler = Scheduler(self.user_data, self.telegram, self.daily_flags)
+                self.scheduler = Scheduler(self.user_data, self.telegram, self.daily_flags, leader=self.leader)
                 self.scheduler.start()
 
                 self.allowed_list = [value.id for value in self.config.allowed_ids]
 
+                if self.shard:
+                    self.webhook = WebhookServer(
+                        telegram=self.telegram,
+                        host=self.shard.host,
+                        port=self.shard.port,
+                        path=self.shard.path,
+                        secret_token=self.shard.secret,
+                    )
+                elif self.config.webhook.enabled:
+                    self.webhook = WebhookServer(
+                        telegram=self.telegram,
+                        host=self.config.webhook.host,
+                        port=self.config.webhook.port,
+                        path=self.config.webhook.path,
+                        secret_token=self.config.webhook.secret_token,
+                    )
+
         logging.info('Loading finished')
 
-    async def _message_handler(self) -> None:
+    def stats(self) -> dict:
         """
-        Main message processing loop that handles incoming Telegram messages.
+        Collect the runtime counters of the bot's modules.
 
-        Continuously monitors for new messages, adds them to chat history and 
-        processes them through the message handler if the bot is unlocked.
+        Returns:
+            dict: LLM concurrency limits and queues, token usage, LLM cache, tone batching,
+                Bot API retries and the pipeline stages.
+        """
+        return {
+            "llm_concurrency": self.llm.concurrency_stats(),
+            "llm_usage": self.llm.usage_stats(),
+            "llm_cache": self.llm.cache.stats() if self.llm.cache else None,
+            "tone_batch": self.user_data.tone_batcher.stats(),
+            "telegram_retries": self.telegram.retry_policy.stats(),
+            "pipeline": [self.persist_stage.stats(), self.dispatch_stage.stats()],
+        }
+
+    async def _log_stats(self) -> None:
+        """
+        Log the runtime counters every `stats_interval` seconds, as one JSON line.
         """
         while True:
+            await asyncio.sleep(self.config.stats_interval)
+
             try:
-                await asyncio.sleep(0.01)
-
-                async for message in self.telegram.get_new_message():
-                    message = message.message
-
-                    if message and message.chat:
-                        await self.chat_history.add_message(message, chat_id=message.chat.id)
-                        self.user_data.add_user_if_not_exists(message)
-
-                        if not self.lock:
-                            self.loop.create_task(
-                                messages_handler(
-                                    message=message,
-                                    telegram=self.telegram,
-                                    history=self.chat_history,
-                                    user_data=self.user_data,
-                                    allowed_list=self.allowed_list,
-                                    agenda=self.agenda,
-                                    llm=self.llm,
-                                    daily_flags=self.daily_flags,
-                                    config=self.config,
-                                )
-                            )
+                logging.info(f"stats {json.dumps(self.stats(), default=str)}")
+            except Exception as exc:
+                logging.exception(exc)
+
+    async def _message_handler(self) -> None:
+        """
+        Main message processing loop that handles incoming Telegram messages.
 
+        Waits for new messages delivered by the poller or the webhook and passes them
+        to `_process_update`. A failing update is logged and acknowledged, so it is
+        neither retried forever nor holding back the stored offset.
+        """
+        async for update in self.telegram.get_new_message():
+            try:
+                await self._process_update(update)
             except Exception as exc:
                 logging.exception(exc)
-                await asyncio.sleep(15)
+                self.telegram.ack_update(update)
+
+    def _ack(self, updates: T.List[MessageReceived]) -> None:
+        for update in updates:
+            self.telegram.ack_update(update)
+
+    async def _process_update(self, update: MessageReceived) -> None:
+        """
+        Process a single Telegram update.
+
+        Photos of an album are held by the album aggregator and handled together once
+        the album is complete. Messages of a chat arriving while one of its albums is
+        pending wait behind it, every other message is handled right away. An update is
+        acknowledged once its message left the pipeline, so a restart before that hands
+        it out again.
+
+        Args:
+            update (MessageReceived): The update received from Telegram.
+        """
+        message = update.message
 
-    async def _unlocker(self) -> None:
+        if message and message.chat:
+            chat_id = message.chat.id
+
+            if self.album_aggregator.is_album_part(message):
+                album = self._pending_albums.get((chat_id, message.media_group_id))
+
+                if album is None:
+                    album = self._pending_albums[(chat_id, message.media_group_id)] = _HeldMessage([])
+                    self._held.setdefault(chat_id, deque()).append(album)
+
+                album.updates.append(update)
+                self.album_aggregator.add(message)
+            elif chat_id in self._held:
+                self._held[chat_id].append(_HeldMessage([update], message))
+            else:
+                await self._process_message(message, [update])
+        else:
+            self.telegram.ack_update(update)
+
+    async def _process_album(self, message: Message) -> None:
+        """
+        Feed a merged album into the processing pipeline, together with the updates of its parts,
+        then the messages of its chat that were waiting for it.
+
+        Args:
+            message (Message): The first part of the album, carrying every photo.
+        """
+        album = self._pending_albums.pop((message.chat.id, message.media_group_id), None)
+
+        if album is None:
+            album = _HeldMessage([])
+            self._held.setdefault(message.chat.id, deque()).append(album)
+
+        album.message = message
+        await self._release_held(message.chat.id)
+
+    async def _release_held(self, chat_id: int) -> None:
         """
-        Unlocks the bot after a short delay to avoid reacting with messages sent before the initialization.
+        Feed the waiting messages of a chat into the pipeline, up to its first incomplete album.
+
+        Args:
+            chat_id (int): The chat to release.
+        """
+        # The release already running for the chat picks up whatever became ready meanwhile
+        if chat_id in self._releasing:
+            return
+
+        self._releasing.add(chat_id)
+        held = self._held.get(chat_id)
 
-        Waits 3 seconds before unlocking the bot to accept and process messages.
+        try:
+            while held and held[0].message is not None:
+                item = held.popleft()
+
+                try:
+                    await self._process_message(item.message, item.updates)
+                except Exception as exc:
+                    logging.exception(exc)
+                    self._ack(item.updates)
+        finally:
+            self._releasing.discard(chat_id)
+
+            if held is not None and not held:
+                del self._held[chat_id]
+
+    async def _process_message(self, message: Message, updates: T.List[MessageReceived]) -> None:
         """
-        await asyncio.sleep(3)
+        Feed a single message, or a merged album, into the processing pipeline.
+
+        Messages go through two stages, each with a bounded queue per chat: persist stores
+        them in the chat history, which may describe images, and dispatch runs the reactions.
+        Within a chat both stages keep the arrival order, different chats run in parallel.
+        This waits while the persist stage is full, which holds back the next poll.
+
+        Args:
+            message (Message): The message to process.
+            updates (List[MessageReceived]): The updates the message came in, acknowledged once
+                it was dispatched or failed.
+        """
+        await self.persist_stage.put(message.chat.id, (message, updates))
+
+    async def _persist_message(self, item: PipelineItem) -> None:
+        """
+        Persist stage: add the message to chat history and user data, then hand it to dispatch.
+
+        Args:
+            item (PipelineItem): The message to persist and its updates.
+        """
+        message, updates = item
+
+        try:
+            await self.chat_history.add_message(message, chat_id=message.chat.id)
+            self.user_data.add_user_if_not_exists(message)
+        except Exception:
+            self._ack(updates)
+            raise
+
+        await self.dispatch_stage.put(message.chat.id, item)
+
+    async def _dispatch_message(self, item: PipelineItem) -> None:
+        """
+        Dispatch stage: process the message through the message handler, then acknowledge its updates.
+
+        Args:
+            item (PipelineItem): The message to react to and its updates.
+        """
+        message, updates = item
+
+        try:
+            await messages_handler(
+                message=message,
+                telegram=self.telegram,
+                history=self.chat_history,
+                user_data=self.user_data,
+                allowed_list=self.allowed_list,
+                agenda=self.agenda,
+                llm=self.llm,
+                daily_flags=self.daily_flags,
+                config=self.config,
+            )
+        except Exception:
+            self._ack(updates)
+            raise
 
-        self.lock = False
+        self._ack(updates)
@@ -5,11 +5,12 @@ from pedro.brain.constants.constants import POLITICAL_OPINIONS, POLITICAL_WORDS
 from pedro.brain.modules.chat_history import ChatHistory
 from pedro.brain.modules.datetime_manager import DatetimeManager
 from pedro.brain.modules.llm import LLM
+from pedro.brain.modules.outbound_scheduler import Priority
 from pedro.brain.modules.telegram import Telegram
 from pedro.brain.modules.user_data_manager import UserDataManager
 from pedro.data_structures.daily_flags import DailyFlags
 from pedro.data_structures.telegram_message import Message, ReplyToMessage
-from pedro.utils.text_utils import create_username
+from pedro.utils.text_utils import create_username, split_message
 import logging
 
 logger = logging.getLogger(__name__)
@@ -27,7 +28,12 @@ async def send_telegram_log(
             chat_name = message.chat.title if hasattr(message.chat, 'title') and message.chat.title else str(message.chat.id)
             user_name = create_username(message.from_.first_name, message.from_.username) if message.from_ else "Unknown"
             log_message = f"Prompt gerado para chat: {chat_name}\nUsuário: {user_name}"
-            await telegram.send_message(message_text=log_message, chat_id=log_chat_id, parse_mode="HTML")
+            await telegram.send_message(
+                message_text=log_message,
+                chat_id=log_chat_id,
+                parse_mode="HTML",
+                priority=Priority.BACKGROUND
+            )
             logger.info(f"Prompt sent to log chat {log_chat_id}")
         except Exception as e:
             logger.error(f"Failed to send prompt to log chat: {e}")
@@ -35,31 +41,23 @@ async def send_telegram_log(
     # Maximum message length
     max_message_length = 1500
 
-    # If message is shorter than the maximum length, send it directly
-    if len(message_text) <= max_message_length:
-        await telegram.send_message(
-            message_text=message_text,
-            chat_id=log_chat_id,
-            parse_mode=parse_mode,
-        )
-        return
+    chunks = split_message(message_text, max_message_length)
 
-    # Split message into chunks of maximum length
-    chunks = []
-    for i in range(0, len(message_text), max_message_length):
-        chunks.append(message_text[i:i + max_message_length])
-
-    # Send each chunk sequentially
+    # One chunk after the other, so a retried chunk can't fall behind the next ones
     for i, chunk in enumerate(chunks):
-        # Add a prefix to indicate this is part of a multi-part message
-        prefix = f"[Parte {i+1}/{len(chunks)}]\n" if len(chunks) > 1 else ""
-
-        await telegram.send_message(
-            message_text=prefix + chunk,
+        sent = await telegram.send_message(
+            # Add a prefix to indicate this is part of a multi-part message
+            message_text=(f"[Parte {i+1}/{len(chunks)}]\n" if len(chunks) > 1 else "") + chunk,
             chat_id=log_chat_id,
             parse_mode=parse_mode,
+            priority=Priority.BACKGROUND,
         )
 
+        if sent is None:
+            # Dropped under load or failed, the rest would be a log with a hole in it
+            logger.warning(f"Log chunk {i + 1}/{len(chunks)} not delivered, skipping the remaining ones")
+            break
+
 
 async def process_reply_message(llm: LLM, telegram: Telegram, message: Message) -> str:
     if not message.reply_to_message:
@@ -239,7 +237,7 @@ async def get_photo_description(
         if extra_prompt:
             prompt = "Sobre a imagem: " + extra_prompt
         caption = f'Legenda: {temp_message.caption}: ' if temp_message.caption else ""
-        description = await llm.generate_text(prompt=prompt, image=image, model="gpt-4.1-mini")
+        description = await llm.generate_text(prompt=prompt, image=image, model="gpt-4.1-mini", cache=True)
 
         return f"[[{caption}IMAGEM ANEXADA: {description} ]]"
     except Exception as e:
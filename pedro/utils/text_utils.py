@@ -6,9 +6,8 @@ import math
 import random
 import re
 
-import aiohttp
-
 # Project
+from pedro.brain.modules.http_client import get_http_client
 from pedro.brain.constants.constants import DATE_FULL_FORMAT, HOUR_FORMAT, DATE_FORMAT, DAYS_OF_WEEK
 from pedro.data_structures.chat_log import ChatLog
 
@@ -61,6 +60,73 @@ def list_crop(l: list, max_size: int) -> list:
     return new_list
 
 
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+_SPLIT_PATTERNS = [
+    re.compile(r"\n\s*\n"),
+    re.compile(r"\n"),
+    re.compile(r"[.!?…]+[\"')\]]*\s"),
+    re.compile(r"\s"),
+]
+
+
+def _markdown_is_balanced(text: str) -> bool:
+    text = re.sub(r"```.*?(```|$)", "", text, flags=re.DOTALL)
+    return all(text.count(marker) % 2 == 0 for marker in ("`", "*", "_"))
+
+
+def _find_split(text: str, limit: int) -> int:
+    window = text[:limit]
+    fallback = None
+
+    for pattern in _SPLIT_PATTERNS:
+        cuts = [match.end() for match in pattern.finditer(window) if match.end() >= limit // 2]
+
+        for cut in reversed(cuts):
+            if _markdown_is_balanced(window[:cut]):
+                return cut
+
+        if cuts and fallback is None:
+            fallback = cuts[-1]
+
+    return fallback or limit
+
+
+def split_message(text: str, max_length: int = TELEGRAM_MESSAGE_LIMIT) -> list[str]:
+    """
+    Split a text into parts Telegram accepts as single messages.
+
+    Cuts at the last paragraph, line, sentence or word boundary of each part, in that
+    order of preference, avoiding boundaries that leave a Markdown marker open. A code
+    block crossing a cut is closed at the end of the part and reopened in the next one.
+
+    Args:
+        text (str): The text to split.
+        max_length (int, optional): Maximum length of a part. Defaults to 4096, Telegram's limit.
+
+    Returns:
+        list[str]: The parts, in order. A text within the limit is returned as the only part.
+    """
+    fence = "```"
+    parts = []
+
+    while len(text) > max_length:
+        cut = _find_split(text, max_length - len(fence) - 1)
+        part, text = text[:cut].rstrip(), text[cut:].lstrip()
+
+        if part.count(fence) % 2:
+            part = f"{part}\n{fence}"
+            text = f"{fence}\n{text}"
+
+        if part:
+            parts.append(part)
+
+    if text.strip() or not parts:
+        parts.append(text)
+
+    return parts
+
+
 async def adjust_pedro_casing(
         original_message: str,
         clean_prompts: dict | None = None
@@ -169,14 +235,13 @@ async def get_roletas_from_pavuna(
         min_chars=0,
 ) -> list[str]:
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get("https://keyo.me/bot/roleta.json") as roleta:
-                return [
-                        value["text"] for _, value in json.loads(
-                            await roleta.content.read()
-                        ).items()
-                        if value['text'] is not None and len(value['text']) > min_chars
-                    ]
+        async with get_http_client().session.get("https://keyo.me/bot/roleta.json") as roleta:
+            return [
+                    value["text"] for _, value in json.loads(
+                        await roleta.content.read()
+                    ).items()
+                    if value['text'] is not None and len(value['text']) > min_chars
+                ]
     except Exception as exc:
         logging.exception(exc)
 
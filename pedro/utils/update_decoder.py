@@ -0,0 +1,55 @@
+# Internal
+import typing as T
+
+# External
+from pydantic import TypeAdapter
+
+# Project
+from pedro.data_structures.telegram_message import MessagesResults, MessageReceived
+
+# Built once, validators are compiled on creation
+_RESULTS_ADAPTER = TypeAdapter(MessagesResults)
+_UPDATE_ADAPTER = TypeAdapter(MessageReceived)
+
+
+def decode_updates(payload: T.Union[str, bytes]) -> MessagesResults:
+    """
+    Decode a getUpdates response body.
+
+    The raw body is parsed and validated in a single pass by pydantic-core, with the
+    `from` key mapped through the field alias, so no intermediate dict or rewritten
+    copy of the payload is built.
+
+    Args:
+        payload (Union[str, bytes]): The raw response body.
+
+    Returns:
+        MessagesResults: The decoded response.
+    """
+    return _RESULTS_ADAPTER.validate_json(payload)
+
+
+def decode_update(payload: T.Union[str, bytes]) -> MessageReceived:
+    """
+    Decode a single update, as POSTed to the webhook.
+
+    Args:
+        payload (Union[str, bytes]): The raw update body.
+
+    Returns:
+        MessageReceived: The decoded update.
+    """
+    return _UPDATE_ADAPTER.validate_json(payload)
+
+
+def encode_update(update: MessageReceived) -> bytes:
+    """
+    Encode an update back into the JSON Telegram sends, `from` keys included.
+
+    Args:
+        update (MessageReceived): The update to encode.
+
+    Returns:
+        bytes: The JSON body, accepted by `decode_update`.
+    """
+    return _UPDATE_ADAPTER.dump_json(update, by_alias=True, exclude_none=True)
@@ -3,6 +3,7 @@ from bs4 import BeautifulSoup
 import logging
 import aiohttp
 
+from pedro.brain.modules.http_client import get_http_client
 from pedro.data_structures.telegram_message import Message
 
 
@@ -122,14 +123,15 @@ async def check_and_update_with_url_contents(message: Message) -> Message:
             return text.replace(url_detector, url_content)
         return text
 
-    async with aiohttp.ClientSession() as session:
-        if message.text:
-            message.text = await _process_text_with_url(message.text, session)
+    session = get_http_client().session
 
-        if message.reply_to_message and message.reply_to_message.text:
-            message.reply_to_message.text = await _process_text_with_url(message.reply_to_message.text, session)
+    if message.text:
+        message.text = await _process_text_with_url(message.text, session)
 
-        if message.caption:
-            message.caption = await _process_text_with_url(message.caption, session)
+    if message.reply_to_message and message.reply_to_message.text:
+        message.reply_to_message.text = await _process_text_with_url(message.reply_to_message.text, session)
+
+    if message.caption:
+        message.caption = await _process_text_with_url(message.caption, session)
 
     return message
@@ -3,13 +3,13 @@ import logging
 import typing as T
 from typing import Any, Coroutine
 
-import aiohttp
 from asyncio import wait_for
 from datetime import datetime
 
 from geopy.geocoders import Nominatim
 
 from pedro.brain.constants.constants import DAYS_OF_WEEK
+from pedro.brain.modules.http_client import get_http_client
 from pedro.data_structures.bot_config import BotConfig
 
 
@@ -63,43 +63,42 @@ async def get_forecast(config: BotConfig, place: T.Optional[str], days: T.Option
         app_id = config.secrets.open_weather
         forecast_lines = [f"🌎 {location_str}"]
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"https://api.openweathermap.org/data/3.0/onecall?"
-                                   f"cnt={days}&units=metric&lat={lat}&lon={lon}&lang=pt&appid={app_id}") as req:
-                resp = json.loads(await req.text())
+        async with get_http_client().session.get(f"https://api.openweathermap.org/data/3.0/onecall?"
+                                                 f"cnt={days}&units=metric&lat={lat}&lon={lon}&lang=pt&appid={app_id}") as req:
+            resp = json.loads(await req.text())
 
-                if 'daily' in resp and isinstance(resp['daily'], list):
-                    for i, day_data in enumerate(resp['daily'][:int(days)]):
-                        # Get date in DD/MM format
-                        date_obj = datetime.fromtimestamp(day_data['dt'])
-                        date_str = date_obj.strftime("%d/%m")
+            if 'daily' in resp and isinstance(resp['daily'], list):
+                for i, day_data in enumerate(resp['daily'][:int(days)]):
+                    # Get date in DD/MM format
+                    date_obj = datetime.fromtimestamp(day_data['dt'])
+                    date_str = date_obj.strftime("%d/%m")
 
-                        # Get min and max temperatures
-                        min_temp = round(day_data['temp']['min'])
-                        max_temp = round(day_data['temp']['max'])
+                    # Get min and max temperatures
+                    min_temp = round(day_data['temp']['min'])
+                    max_temp = round(day_data['temp']['max'])
 
-                        # Get weather condition and corresponding icon
-                        weather_main = day_data['weather'][0]['main'].lower()
-                        weather_icon = weather_icons.get(weather_main, '☁')
+                    # Get weather condition and corresponding icon
+                    weather_main = day_data['weather'][0]['main'].lower()
+                    weather_icon = weather_icons.get(weather_main, '☁')
 
-                        high_temp_icon = " 🔥" if max_temp > 31 else ""
-                        ultra_high_temp_icon = "🔥" if max_temp > 35 else ""
+                    high_temp_icon = " 🔥" if max_temp > 31 else ""
+                    ultra_high_temp_icon = "🔥" if max_temp > 35 else ""
 
-                        # Get thermal sensation
-                        feels_like = round(day_data['feels_like']['day'])
+                    # Get thermal sensation
+                    feels_like = round(day_data['feels_like']['day'])
 
-                        # Get day of week
-                        day_of_week = DAYS_OF_WEEK[date_obj.weekday()]
+                    # Get day of week
+                    day_of_week = DAYS_OF_WEEK[date_obj.weekday()]
 
-                        # Format the forecast line
-                        forecast_line = (
-                            f"{date_str} ⬇{min_temp}º ⬆{max_temp}º {weather_icon}{high_temp_icon}{ultra_high_temp_icon} "
-                            f"{day_of_week} 🌡️{feels_like}º"
-                        )
+                    # Format the forecast line
+                    forecast_line = (
+                        f"{date_str} ⬇{min_temp}º ⬆{max_temp}º {weather_icon}{high_temp_icon}{ultra_high_temp_icon} "
+                        f"{day_of_week} 🌡️{feels_like}º"
+                    )
 
-                        forecast_lines.append(forecast_line)
+                    forecast_lines.append(forecast_line)
 
-                return "\n".join(forecast_lines)
+            return "\n".join(forecast_lines)
 
     except Exception as exc:
         logging.exception(exc)
@@ -1,13 +1,29 @@
+import argparse
 import asyncio
 
 from pedro.main import TelegramBot
+from pedro.brain.modules.shard_supervisor import ShardSupervisor
 
 if __name__ == '__main__':
-    decaptor = TelegramBot(
-        bot_config_file='bot_configs.json',
-        secrets_file='secrets.json',
-        debug_mode=True,
-    )
+    parser = argparse.ArgumentParser(description="Pedro Leblon Bot")
+    parser.add_argument("--shards", type=int, default=1, help="Worker processes, each owning a share of the chats")
+    parser.add_argument("--shard-base-port", type=int, default=8600, help="Local port of the first shard worker")
+    args = parser.parse_args()
+
+    if args.shards > 1:
+        decaptor = ShardSupervisor(
+            bot_config_file='bot_configs.json',
+            secrets_file='secrets.json',
+            shards=args.shards,
+            base_port=args.shard_base_port,
+            debug_mode=True,
+        )
+    else:
+        decaptor = TelegramBot(
+            bot_config_file='bot_configs.json',
+            secrets_file='secrets.json',
+            debug_mode=True,
+        )
 
     asyncio.run(
         decaptor.run()